@@ -0,0 +1,280 @@
+"""
+Benchmark TX -> kanal -> RX lanca.
+
+Mjeri vrijeme generisanja paketa (Transmitter80211a.generate_frame), modela
+kanala (Channel_Model.apply) i svake faze prijemnika za različite dužine
+paketa i modulacije. Faze se mjere unutar samog run_rx (parametar timings),
+pa benchmark uvijek prati stvarni redoslijed i parametre prijemnika.
+Rezultat je JSON (sortirani ključevi) koji se može direktno porediti između
+dva commita.
+
+Pokretanje:
+    python -m benchmarks.benchmark_chain --output bench.json
+    python -m benchmarks.benchmark_chain --quick
+    python -m benchmarks.benchmark_chain --compare stari.json --output novi.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import scipy
+
+from tx.OFDM_TX_802_11 import Transmitter80211a
+from channel.Channel_Model import Channel_Model
+from channel.channel_settings import ChannelSettings
+from channel.channel_mode import ChannelMode
+from rx.prijemnik import DECODE_STAGES, run_rx
+
+SYMBOL_COUNTS = (1, 10, 100, 1000, 4000)
+BITS_PER_SYMBOL = (1, 2, 4, 6)
+PERCENTILES = (50, 90, 99)
+
+RX_STAGES = ("iq_preprocessing",) + DECODE_STAGES
+
+
+def summarize(times, num_samples):
+    """
+    Statistika jednog niza mjerenja.
+
+    Parametri
+    times : sekvenca float
+        Trajanja pojedinačnih poziva u sekundama
+    num_samples : int
+        Broj obrađenih uzoraka po pozivu (za propusnost)
+
+    Povratna vrijednost
+    dict
+        mean_ms, min_ms, max_ms, p50_ms, p90_ms, p99_ms i samples_per_sec
+        (računato iz medijana)
+    """
+    t = np.asarray(times, dtype=float)
+    stats = {
+        "mean_ms": float(np.mean(t) * 1e3),
+        "min_ms": float(np.min(t) * 1e3),
+        "max_ms": float(np.max(t) * 1e3),
+    }
+    for p in PERCENTILES:
+        stats[f"p{p}_ms"] = float(np.percentile(t, p) * 1e3)
+    median = float(np.median(t))
+    stats["samples_per_sec"] = float(num_samples / median) if median > 0 else None
+    return stats
+
+
+def _timed(timings, name, fn, /, *args, **kwargs):
+    """Poziva fn i dodaje trajanje poziva u timings[name]."""
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    timings.setdefault(name, []).append(time.perf_counter() - t0)
+    return result
+
+
+def benchmark_case(num_symbols, bits_per_symbol, repeats=5, seed=0, up_factor=2, snr_db=30,
+                   number_of_taps=4, filter_method="auto", channel_method="ls"):
+    """
+    Benchmark jednog paketa (dužina i modulacija) kroz cijeli lanac.
+
+    Parametri
+    num_symbols : int
+        Broj OFDM payload simbola
+    bits_per_symbol : int
+        Modulacija (1=BPSK, 2=QPSK, 4=16-QAM, 6=64-QAM)
+    repeats : int, opcionalno
+        Broj mjerenja po fazi (prije mjerenja ide jedan poziv za zagrijavanje)
+    seed : int, opcionalno
+        Sjeme za bite i kanal
+    up_factor : int, opcionalno
+        Faktor upsamplovanja predajnika
+    snr_db : float, opcionalno
+        SNR kanala u dB
+    number_of_taps : int, opcionalno
+        Broj tapova multipath kanala
+    filter_method : str, opcionalno
+        Filtriranje kanala: 'auto', 'direct' (lfilter) ili 'fft' (overlap-save)
+    channel_method : str, opcionalno
+        Procjena kanala u prijemniku ('ls', 'dft', 'mmse')
+
+    Povratna vrijednost
+    dict
+        Parametri slučaja, broj uzoraka i statistika po fazi
+        (vidi summarize); 'run_rx' je cijeli prijemnik, a faze iz RX_STAGES
+        su izmjerene unutar tog istog poziva.
+    """
+    fs = 20e6 * up_factor
+    tx = Transmitter80211a(num_ofdm_symbols=num_symbols, bits_per_symbol=bits_per_symbol,
+                           up_factor=up_factor, seed=seed, plot=False)
+    settings = ChannelSettings(sample_rate=fs, number_of_taps=number_of_taps, delay_spread=50e-9, snr_db=snr_db)
+    channel = Channel_Model(settings, ChannelMode(multipath=1, thermal_noise=1), filter_method=filter_method)
+
+    tx_signal, _ = tx.generate_frame()
+    rx_signal, _ = channel.apply(tx_signal, sd=seed)
+    rx_signal = np.ravel(rx_signal)
+
+    timings = {}
+    for i in range(repeats + 1):
+        stage_timings = {} if i == 0 else timings
+        _timed(stage_timings, "generate_frame", tx.generate_frame)
+        _timed(stage_timings, "channel_apply", channel.apply, tx_signal, sd=seed)
+        _timed(stage_timings, "run_rx", run_rx, rx_signal, tx_signal, fs_in=fs,
+               channel_method=channel_method, timings=stage_timings)
+
+    num_samples = len(tx_signal)
+    rx_samples = len(rx_signal) // up_factor
+    per_stage_samples = {name: rx_samples for name in RX_STAGES}
+    per_stage_samples["iq_preprocessing"] = len(rx_signal)
+    per_stage_samples["run_rx"] = len(rx_signal)
+
+    return {
+        "num_symbols": int(num_symbols),
+        "bits_per_symbol": int(bits_per_symbol),
+        "number_of_taps": int(number_of_taps),
+        "filter_method": filter_method,
+        "channel_method": channel_method,
+        "num_samples": int(num_samples),
+        "stages": {
+            name: summarize(t, per_stage_samples.get(name, num_samples))
+            for name, t in timings.items()
+        },
+    }
+
+
+def _git_commit():
+    """Trenutni git commit (ili None ako git nije dostupan)."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(symbol_counts=SYMBOL_COUNTS, bits_per_symbol=BITS_PER_SYMBOL, repeats=5, seed=0,
+                   number_of_taps=4, filter_method="auto", channel_method="ls"):
+    """
+    Benchmark za sve kombinacije dužine paketa i modulacije.
+
+    Povratna vrijednost
+    dict
+        'meta' (verzije, platforma, commit, parametri) i 'results'
+        (lista rezultata benchmark_case)
+    """
+    results = [
+        benchmark_case(n, bps, repeats=repeats, seed=seed,
+                       number_of_taps=number_of_taps, filter_method=filter_method,
+                       channel_method=channel_method)
+        for n in symbol_counts
+        for bps in bits_per_symbol
+    ]
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "repeats": int(repeats),
+        "seed": int(seed),
+        "number_of_taps": int(number_of_taps),
+        "filter_method": filter_method,
+        "channel_method": channel_method,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare_results(baseline, current, metric="p50_ms", threshold=1.2):
+    """
+    Poređenje dva JSON rezultata benchmarka.
+
+    Parametri
+    baseline, current : dict
+        Rezultati run_benchmarks (npr. učitani iz JSON fajlova)
+    metric : str, opcionalno
+        Metrika koja se poredi (default medijan u ms)
+    threshold : float, opcionalno
+        Omjer current/baseline iznad kojeg se faza smatra regresijom
+
+    Povratna vrijednost
+    list[dict]
+        Za svaku zajedničku kombinaciju slučaja (num_symbols, bits_per_symbol,
+        number_of_taps, filter_method, channel_method) i faze: parametri,
+        baseline, current, ratio i regression (bool)
+    """
+    fields = ("num_symbols", "bits_per_symbol", "number_of_taps", "filter_method", "channel_method")
+    # Rezultati prvih verzija benchmarka nemaju parametre kanala; tada je
+    # kanal uvijek imao 4 tapa, filtriran lfilterom, uz LS procjenu u prijemniku
+    legacy = {"number_of_taps": 4, "filter_method": "direct", "channel_method": "ls"}
+
+    def index(data):
+        return {
+            (r["num_symbols"], r["bits_per_symbol"],
+             *(r.get(field, default) for field, default in legacy.items()), name): stats[metric]
+            for r in data["results"]
+            for name, stats in r["stages"].items()
+        }
+
+    old, new = index(baseline), index(current)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] > 0 else float("inf")
+        row = dict(zip(fields, key[:-1]))
+        row.update({
+            "stage": key[-1],
+            "baseline": old[key],
+            "current": new[key],
+            "ratio": ratio,
+            "regression": ratio > threshold,
+        })
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark 802.11a TX/kanal/RX lanca")
+    parser.add_argument("--symbols", type=int, nargs="+", default=list(SYMBOL_COUNTS),
+                        help="dužine paketa u OFDM simbolima")
+    parser.add_argument("--bps", type=int, nargs="+", default=list(BITS_PER_SYMBOL),
+                        help="bita po simbolu (1, 2, 4, 6)")
+    parser.add_argument("--repeats", type=int, default=5, help="broj mjerenja po fazi")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--taps", type=int, default=4, help="broj tapova multipath kanala")
+    parser.add_argument("--filter-method", choices=["auto", "direct", "fft"], default="auto",
+                        help="filtriranje kanala (lfilter ili overlap-save FFT)")
+    parser.add_argument("--channel-method", choices=["ls", "dft", "mmse"], default="ls",
+                        help="procjena kanala u prijemniku")
+    parser.add_argument("--quick", action="store_true", help="samo 10 i 100 simbola, QPSK, 3 mjerenja")
+    parser.add_argument("--output", help="JSON fajl za rezultate (default: stdout)")
+    parser.add_argument("--compare", help="JSON fajl sa baseline rezultatima za poređenje")
+    parser.add_argument("--threshold", type=float, default=1.2, help="prag regresije (omjer p50)")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.symbols, args.bps, args.repeats = [10, 100], [2], 3
+
+    data = run_benchmarks(args.symbols, args.bps, repeats=args.repeats, seed=args.seed,
+                          number_of_taps=args.taps, filter_method=args.filter_method,
+                          channel_method=args.channel_method)
+    text = json.dumps(data, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, data, threshold=args.threshold)
+        for row in rows:
+            flag = "REGRESIJA" if row["regression"] else ""
+            print(f"{row['num_symbols']:>5} sim  bps={row['bits_per_symbol']}  taps={row['number_of_taps']}"
+                  f"  {row['filter_method']}/{row['channel_method']}  {row['stage']:<32}"
+                  f"{row['baseline']:>10.3f} -> {row['current']:>10.3f} ms  x{row['ratio']:.2f} {flag}",
+                  file=sys.stderr)
+        return 1 if any(row["regression"] for row in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
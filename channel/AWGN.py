@@ -1,15 +1,90 @@
 import numpy as np
 
-def Generate_AWGN(Input, SNR, sd=0):
+#Dozvoljeni izlazni tipovi šuma i odgovarajući realni tip za izvlačenje
+_REAL_DTYPE = {np.dtype(np.complex128): np.float64, np.dtype(np.complex64): np.float32}
+
+
+def _complex_noise(rng, shape, std, dtype):
+    """
+    Kompleksni Gaussov šum varijanse std**2 (po std**2/2 na I i Q osi).
+
+    Realni i imaginarni dio se izvlače jednim pozivom generatora u (..., 2)
+    niz koji se zatim samo reinterpretira kao kompleksan (bez kopije).
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _REAL_DTYPE:
+        raise ValueError("dtype mora biti complex128 ili complex64")
+    noise = rng.standard_normal(tuple(shape) + (2,), dtype=_REAL_DTYPE[dtype])
+    noise = noise.view(dtype)[..., 0]
+    noise *= np.asarray(std / np.sqrt(2), dtype=_REAL_DTYPE[dtype])
+    return noise
+
+
+def Generate_AWGN(Input, SNR, sd=0, signal_power=None, dtype=np.complex128):
+    """
+    Kompleksni AWGN za zadani SNR (u dB) u odnosu na snagu ulaznog signala.
+
+    Parametri
+    Input : np.ndarray
+        Ulazni signal (realan ili kompleksan)
+    SNR : float
+        Željeni odnos signal/šum u dB
+    sd : int, np.random.Generator ili None, opcionalno
+        Sjeme; koristi se np.random.default_rng(sd), pa se globalni RNG ne dira
+    signal_power : float ili None, opcionalno
+        Poznata srednja snaga signala; ako je zadana, snaga se ne mjeri
+        (npr. nakon normalizacije u Channel_Model.apply)
+    dtype : complex128 ili complex64, opcionalno
+        Tip izlaznog šuma; complex64 prepolovljuje memorijski saobraćaj
+
+    Povratna vrijednost
+    Noise : np.ndarray
+        Šum istog oblika kao Input (za 1-D ulaz 1-D niz, bez (1, L) dimenzije)
+
+    Izuzeci
+    TypeError
+        Ako Input nije numpy niz
+    ValueError
+        Ako je Input prazan, sadrži NaN (kada se snaga mjeri) ili dtype
+        nije podržan
+    """
+    if not isinstance(Input, np.ndarray):
+        raise TypeError("Input mora biti numpy niz")
+    if Input.size == 0:
+        raise ValueError("Input je prazan")
+
+    if signal_power is None:
+        # Snaga bez konjugovane kopije: vdot konjuguje prvi argument u letu.
+        # NaN u ulazu daje NaN snagu, pa nije potreban poseban prolaz
+        signal_power = np.vdot(Input, Input).real / Input.size
+        if np.isnan(signal_power):
+            raise ValueError("Input contains NaN")
+
+    rng = np.random.default_rng(sd)
+    NoisePower = signal_power / (10 ** (SNR / 10))
+    return _complex_noise(rng, Input.shape, np.sqrt(NoisePower), dtype)
+
+
+def Generate_AWGN_batch(Input, SNR, sd=None, dtype=np.complex128):
+    """
+    AWGN za (R, L) niz paketa, jednim vektorskim izvlačenjem.
+
+    Snaga signala se računa posebno za svaki red (paket), kao u Generate_AWGN,
+    pa svaki paket dobija šum za isti zadani SNR.
+
+    sd: sjeme (int), np.random.Generator ili None.
+    dtype: complex128 ili complex64 (tip izlaznog šuma).
+    """
     x = np.asarray(Input)
-    if np.isnan(x).any():
+    if x.ndim != 2:
+        raise ValueError("Input mora biti 2-D niz oblika (R, L)")
+
+    # Snaga po redu iz pogleda na I i Q dio (bez |x|**2 međurezultata)
+    MeanSquare = (np.einsum("ij,ij->i", x.real, x.real) +
+                  np.einsum("ij,ij->i", x.imag, x.imag))[:, None] / x.shape[1]
+    if np.isnan(MeanSquare).any():
         raise ValueError("Input contains NaN")
-    
-    np.random.seed(sd) 
-    MeanSquare = (1 / len(Input)) * (Input @ Input.conj().T)
-    # Total signal power
-    NoisePower = MeanSquare / (10 ** (SNR / 10))  
-    STDNoise = np.sqrt(NoisePower) 
-    l = 1  
-    Noise = STDNoise * (0.70711 * np.random.randn(l, len(Input)) + 1j * 0.70711 * np.random.randn(l, len(Input)))
-    return Noise
\ No newline at end of file
+
+    rng = np.random.default_rng(sd)
+    NoisePower = MeanSquare / (10 ** (SNR / 10))
+    return _complex_noise(rng, x.shape, np.sqrt(NoisePower), dtype)
@@ -1,7 +1,10 @@
 import numpy as np
 from .Multipath import GetMultipathFilter
-from .AWGN import Generate_AWGN
-import scipy.signal as sc
+from .AWGN import Generate_AWGN, Generate_AWGN_batch
+from .Doppler import GetTimeVaryingFilter, DOPPLER_BLOCK_SIZE
+from .convolution import fir_filter, block_fir_filter, METHODS
+from .impairments import apply_impairments
+import scipy.fft as sp_fft
 
 
 class Channel_Model:
@@ -15,25 +18,57 @@ class Channel_Model:
     - SNR_dB
     """
 
-    def __init__(self, settings, mode):
+    def __init__(self, settings, mode, rng=None, filter_method="auto"):
         """
         settings: objekt sa poljima:
             - NumberOfTaps
             - DelaySpread
             - SampleRate
             - SNR_dB
+            - Seed (opcionalno)
+            - MaxDoppler, NumberOfSinusoids (opcionalno, za Doppler)
+            - CFO_Hz, SFO_ppm, PhaseNoiseLinewidth, IQGain_dB, IQPhase_deg
+              (opcionalno, za Impairments)
 
         mode: objekt klase ChannelMode s poljima:
             - Multipath (0/1)
             - ThermalNoise (0/1)
+            - Doppler (0/1, opcionalno)
+            - Impairments (0/1, opcionalno)
+
+        rng: np.random.Generator ili sjeme; ako nije zadan koristi se
+            settings.Seed. Iz sjemena (ili None) svaki model pravi svoj
+            generator, pa više modela može raditi paralelno (i u nitima) bez
+            dijeljenog stanja. Zadani Generator se koristi direktno, bez
+            kopije: isti Generator ne smije koristiti više modela u različitim
+            nitima.
+
+        filter_method: 'auto' (default), 'direct' (lfilter) ili 'fft'
+            (overlap-save); vidi channel.convolution.fir_filter. Rezultat je
+            isti do numeričke tačnosti, razlikuje se samo brzina.
         """
+        if filter_method not in METHODS:
+            raise ValueError("filter_method mora biti 'auto', 'direct' ili 'fft'")
         self.settings = settings
         self.mode = mode
+        self.filter_method = filter_method
+        if rng is None:
+            rng = getattr(settings, "Seed", None)
+        self.rng = np.random.default_rng(rng)
 
-    def apply(self, tx_samples):
+    def apply(self, tx_samples, sd=None):
         """
         Primjenjuje model kanala na ulazne uzorke.
+
+        sd: sjeme ili np.random.Generator za ovaj poziv (tapovi i šum). Ako je
+            None, koristi se generator modela (self.rng), pa uzastopni pozivi
+            daju nove, nezavisne realizacije kanala i šuma.
+
+        Povratna vrijednost: (rx, fir_taps). Uz Doppler = 1 fir_taps su
+        trajektorije tapova oblika (ceil(L / DOPPLER_BLOCK_SIZE), N), red b
+        važi za uzorke [b*DOPPLER_BLOCK_SIZE, (b+1)*DOPPLER_BLOCK_SIZE).
         """
+        rng = self.rng if sd is None else np.random.default_rng(sd)
 
         # 1. Mode parametri
         multipath_select = self.mode.Multipath
@@ -45,20 +80,109 @@ class Channel_Model:
         sample_rate = self.settings.SampleRate
         snr_db = self.settings.SNR_dB
 
-        # 3. Multipath FIR filter
-        fir_taps = GetMultipathFilter(sample_rate, delay_spread, N)
-
-        # Uključivanje multipath fadinga
-        if multipath_select == 1:
-            tx_samples = sc.lfilter(fir_taps, 1, tx_samples)
+        # 3. Multipath FIR filter (bez multipatha kanal je jedinični tap)
+        if multipath_select == 1 and self._doppler():
+            fir_taps = GetTimeVaryingFilter(sample_rate, delay_spread, N, self.settings.MaxDoppler,
+                                            np.shape(tx_samples)[-1], rng,
+                                            self.settings.NumberOfSinusoids)
+            tx_samples = block_fir_filter(tx_samples, fir_taps, DOPPLER_BLOCK_SIZE)
+        elif multipath_select == 1:
+            fir_taps = GetMultipathFilter(sample_rate, delay_spread, N, rng)
+            tx_samples = fir_filter(tx_samples, fir_taps, self.filter_method)
+        else:
+            fir_taps = np.ones(1, dtype=complex)
 
-        # Normalizacija energije
+        # Normalizacija energije; nakon nje je snaga 1 + |srednja|^2/var,
+        # pa je AWGN ne mora ponovo mjeriti
+        signal_power = None
         var_out = np.var(tx_samples)
         if var_out > 0:
             tx_samples = tx_samples / np.sqrt(var_out)
+            signal_power = 1 + np.abs(np.mean(tx_samples))**2
 
-        # 4. AWGN
+        # 4. AWGN (šum istog oblika kao signal, bez (1, L) dimenzije)
         if awgn_select == 1:
-            tx_samples = tx_samples + Generate_AWGN(tx_samples, snr_db)
+            tx_samples = tx_samples + Generate_AWGN(np.asarray(tx_samples), snr_db, rng,
+                                                    signal_power=signal_power)
+
+        # 5. Nesavršenosti prijemnika (nakon šuma, kao u RF front-endu)
+        if self._impairments():
+            tx_samples = self._apply_impairments(tx_samples, rng)
 
         return tx_samples, fir_taps
+
+    def apply_batch(self, tx_samples, fir_taps=None, sd=None):
+        """
+        Primjenjuje model kanala na (R, L) niz paketa odjednom.
+
+        tx_samples: (R, L) niz, svaki red je jedan paket.
+        fir_taps: opcionalno (N,) tapovi zajednički za sve pakete ili (R, N)
+            nezavisne realizacije po paketu. Ako nije zadano, generiše se R
+            nezavisnih realizacija iz GetMultipathFilter.
+        sd: sjeme ili np.random.Generator za ovaj poziv (kao u apply).
+
+        Svaki red prolazi isti lanac kao u apply: FIR kanal (sa skraćivanjem na
+        L uzoraka kao lfilter), normalizacija snage po redu, AWGN po redu i,
+        uz Impairments = 1, nesavršenosti prijemnika.
+        Filtriranje se radi FFT konvolucijom svih redova odjednom (dužina
+        FFT-a >= L+N-1, pa nema kružnog preklapanja), a šum se izvlači jednim
+        pozivom generatora.
+
+        Uz Doppler = 1 tapovi su trajektorije (R, num_blocks, N) (ili zadane
+        (num_blocks, N) zajedničke za sve pakete) i primjenjuju se blokovskom
+        vremenski promjenljivom konvolucijom, kao u apply.
+
+        Povratna vrijednost: (rx (R, L), fir_taps (R, N)); bez multipatha
+        fir_taps je (R, 1) niz jedinica.
+        """
+        tx_samples = np.asarray(tx_samples)
+        if tx_samples.ndim != 2:
+            raise ValueError("tx_samples mora biti 2-D niz oblika (R, L)")
+        R, L = tx_samples.shape
+        rng = self.rng if sd is None else np.random.default_rng(sd)
+
+        if self.mode.Multipath == 1 and self._doppler():
+            if fir_taps is None:
+                fir_taps = GetTimeVaryingFilter(self.settings.SampleRate, self.settings.DelaySpread,
+                                                self.settings.NumberOfTaps, self.settings.MaxDoppler,
+                                                L, rng, self.settings.NumberOfSinusoids,
+                                                num_realizations=R)
+            fir_taps = np.broadcast_to(fir_taps, (R,) + np.shape(fir_taps)[-2:])
+            rx = block_fir_filter(tx_samples, fir_taps, DOPPLER_BLOCK_SIZE)
+        elif self.mode.Multipath == 1:
+            if fir_taps is None:
+                fir_taps = GetMultipathFilter(self.settings.SampleRate, self.settings.DelaySpread,
+                                              self.settings.NumberOfTaps, rng, num_realizations=R)
+            fir_taps = np.broadcast_to(np.atleast_2d(fir_taps), (R, np.shape(fir_taps)[-1]))
+            n_fft = sp_fft.next_fast_len(L + fir_taps.shape[1] - 1)
+            spectrum = sp_fft.fft(tx_samples, n_fft, axis=-1)
+            spectrum *= sp_fft.fft(fir_taps, n_fft, axis=-1)
+            rx = sp_fft.ifft(spectrum, axis=-1, overwrite_x=True)[:, :L]
+        else:
+            fir_taps = np.ones((R, 1), dtype=complex)
+            rx = tx_samples.astype(complex)
+
+        # Normalizacija energije po paketu
+        var_out = np.var(rx, axis=1, keepdims=True)
+        rx /= np.sqrt(np.where(var_out > 0, var_out, 1.0))
+
+        if self.mode.ThermalNoise == 1:
+            rx += Generate_AWGN_batch(rx, self.settings.SNR_dB, rng)
+
+        if self._impairments():
+            rx = self._apply_impairments(rx, rng)
+
+        return rx, fir_taps
+
+    def _doppler(self):
+        # Stariji mode/settings objekti nemaju Doppler polja
+        return getattr(self.mode, "Doppler", 0) == 1
+
+    def _impairments(self):
+        return getattr(self.mode, "Impairments", 0) == 1
+
+    def _apply_impairments(self, samples, rng):
+        s = self.settings
+        return apply_impairments(samples, s.SampleRate, cfo_hz=s.CFO_Hz, sfo_ppm=s.SFO_ppm,
+                                 phase_noise_hz=s.PhaseNoiseLinewidth, iq_gain_db=s.IQGain_dB,
+                                 iq_phase_deg=s.IQPhase_deg, rng=rng)
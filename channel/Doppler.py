@@ -0,0 +1,107 @@
+import numpy as np
+from .Multipath import power_delay_profile
+
+#Tapovi se osvježavaju svakih DOPPLER_BLOCK_SIZE uzoraka (unutar bloka su
+#konstantni); za Doppler od nekoliko stotina Hz i fs od 20-40 MHz promjena
+#kanala unutar bloka je zanemariva
+DOPPLER_BLOCK_SIZE = 64
+DEFAULT_SINUSOIDS = 16
+
+
+def sum_of_sinusoids(num_samples, dt, MaxDoppler, shape, rng,
+                     NumberOfSinusoids=DEFAULT_SINUSOIDS, t0=0.0):
+    """
+    Rayleigh fading procesi jedinične snage modelom sume sinusoida (Jakes).
+
+    Svaki proces je g(t) = 1/sqrt(M) * sum_m exp(j*(2*pi*fD*cos(a_m)*t + phi_m)),
+    sa uglovima dolaska a_m = (2*pi*m - pi + theta)/M ravnomjerno raspoređenim
+    po krugu (slučajna rotacija theta po procesu) i slučajnim fazama phi_m.
+    Autokorelacija teži J0(2*pi*fD*tau), a za fD = 0 proces je konstantan.
+
+    Parametri
+    num_samples : int
+        Broj trenutaka t = t0 + i*dt, i = 0..num_samples-1
+    dt : float
+        Razmak trenutaka u sekundama
+    MaxDoppler : float
+        Maksimalni Doppler pomak fD u Hz
+    shape : tuple
+        Oblik skupa nezavisnih procesa (npr. (N,) za N tapova)
+    rng : np.random.Generator
+    NumberOfSinusoids : int, opcionalno
+        Broj sinusoida M po procesu
+    t0 : float, opcionalno
+        Prvi trenutak u sekundama
+
+    Povratna vrijednost
+    g : np.ndarray (num_samples, *shape)
+        Kompleksne trajektorije, E|g|^2 = 1
+
+    Napomene
+    Indeks se razlaže na i = q*S + r (S ~ sqrt(num_samples)), pa je
+    exp(j*w*t_i) = exp(j*w*(t0 + q*S*dt)) * exp(j*w*r*dt). Umjesto
+    num_samples*M eksponencijala po procesu računa se ~2*sqrt(num_samples)*M,
+    a suma po sinusoidama postaje matrično množenje (Q, M) @ (M, S).
+    """
+    M = int(NumberOfSinusoids)
+    shape = tuple(shape)
+    m = np.arange(1, M + 1)
+    theta = rng.uniform(-np.pi, np.pi, size=shape + (1,))
+    phi = rng.uniform(-np.pi, np.pi, size=shape + (M,))
+    w = 2 * np.pi * MaxDoppler * np.cos((2 * np.pi * m - np.pi + theta) / M)
+
+    S = max(1, int(np.ceil(np.sqrt(num_samples))))
+    Q = -(-num_samples // S)
+    t_coarse = t0 + S * dt * np.arange(Q)
+    t_fine = dt * np.arange(S)
+
+    # (..., Q, M) sa ugrađenim fazama i (..., M, S)
+    coarse = np.exp(1j * (w[..., None, :] * t_coarse[:, None] + phi[..., None, :]))
+    fine = np.exp(1j * w[..., :, None] * t_fine)
+    g = (coarse @ fine).reshape(shape + (Q * S,))[..., :num_samples]
+    return np.moveaxis(g, -1, 0) / np.sqrt(M)
+
+
+def GetTimeVaryingFilter(SampleRate, DelaySpread, N, MaxDoppler, Length, rng=None,
+                         NumberOfSinusoids=DEFAULT_SINUSOIDS, block_size=DOPPLER_BLOCK_SIZE,
+                         num_realizations=None):
+    """
+    Vremenski promjenljivi Rayleigh FIR kanal (trajektorije tapova za cijeli paket).
+
+    Svaki tap je nezavisan Jakes fading proces (sum_of_sinusoids) sa
+    eksponencijalnim profilom snage kao u GetMultipathFilter (ista srednja
+    snaga po tapu), izračunat na mreži blokova od block_size uzoraka.
+
+    Parametri
+    SampleRate, DelaySpread, N :
+        Kao u GetMultipathFilter
+    MaxDoppler : float
+        Maksimalni Doppler pomak u Hz
+    Length : int
+        Dužina signala u uzorcima
+    rng : np.random.Generator, sjeme ili None
+    NumberOfSinusoids : int, opcionalno
+    block_size : int, opcionalno
+        Broj uzoraka tokom kojih je tap konstantan
+    num_realizations : int ili None, opcionalno
+        Ako je zadan, vraća (num_realizations, num_blocks, N) niz nezavisnih
+        realizacija; inače (num_blocks, N)
+
+    Povratna vrijednost
+    FIR_Taps : np.ndarray (num_blocks, N) ili (num_realizations, num_blocks, N)
+        num_blocks = ceil(Length / block_size); red b važi za uzorke
+        [b*block_size, (b+1)*block_size)
+    """
+    rng = np.random.default_rng(rng)
+    # sqrt(2) jer statički tapovi imaju E|h|^2 = 2 * amplituda^2
+    amplitude = np.sqrt(2) * power_delay_profile(SampleRate, DelaySpread, N)
+    # Tap bloka se računa u sredini bloka
+    num_blocks = -(-int(Length) // block_size)
+    dt = block_size / SampleRate
+    t0 = (block_size - 1) / 2 / SampleRate
+
+    shape = (N,) if num_realizations is None else (num_realizations, N)
+    g = sum_of_sinusoids(num_blocks, dt, MaxDoppler, shape, rng, NumberOfSinusoids, t0)
+    if num_realizations is None:
+        return amplitude * g
+    return amplitude * np.moveaxis(g, 0, 1)
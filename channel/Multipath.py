@@ -1,15 +1,45 @@
 import numpy as np
+from functools import lru_cache
 
-def GetMultipathFilter(SampleRate, DelaySpread, N):
+
+@lru_cache(maxsize=64)
+def power_delay_profile(SampleRate, DelaySpread, N):
+    """
+    Amplitude tapova (korijen eksponencijalnog profila snage), keširano.
+
+    Varijansa taha n je exp(-n*Ts/Trms). Za DelaySpread = 0 sva snaga je
+    u prvom tapu. Vraćeni niz je samo za čitanje jer se dijeli između poziva.
+    """
     Ts = 1 / SampleRate  # Sampling Period in seconds
     Trms = DelaySpread   # Delay spread in seconds
 
     n = np.arange(N)
+    if Trms > 0:
+        ExpVariance = np.exp(-n * Ts / Trms)
+    else:
+        ExpVariance = (n == 0).astype(float)
+
+    amplitude = np.sqrt(ExpVariance)
+    amplitude.setflags(write=False)
+    return amplitude
+
+
+def GetMultipathFilter(SampleRate, DelaySpread, N, rng=None, num_realizations=None):
+    """
+    Slučajni Rayleigh FIR kanal sa eksponencijalnim profilom snage.
+
+    rng: np.random.Generator, sjeme ili None (np.random.default_rng(rng));
+         globalni RNG se ne koristi.
+    num_realizations: ako je zadan, vraća (num_realizations, N) niz nezavisnih
+         realizacija kanala; inače (N,) niz.
 
-    ExpVariance = np.exp(-n * Ts / Trms)
-    FIR_Taps = np.zeros(N, dtype=complex)
+    Profil snage se kešira po (SampleRate, DelaySpread, N), a svi tapovi se
+    izvlače jednim vektorskim pozivom generatora.
+    """
+    rng = np.random.default_rng(rng)
+    amplitude = power_delay_profile(SampleRate, DelaySpread, N)
 
-    for i in range(N):
-        FIR_Taps[i] = np.sqrt(ExpVariance[i]) * np.random.randn() + 1j * np.sqrt(ExpVariance[i]) * np.random.randn()
+    shape = (N,) if num_realizations is None else (num_realizations, N)
+    FIR_Taps = amplitude * (rng.standard_normal(shape) + 1j * rng.standard_normal(shape))
 
-    return FIR_Taps
\ No newline at end of file
+    return FIR_Taps
@@ -5,11 +5,18 @@ class ChannelMode:
     Attributes:
         Multipath (int): 0 = exclude, 1 = include
         ThermalNoise (int): 0 = exclude, 1 = include
+        Doppler (int): 0 = statički multipath tapovi, 1 = vremenski promjenljivi
+            tapovi (Jakes fading sa ChannelSettings.MaxDoppler); djeluje samo uz
+            Multipath = 1
+        Impairments (int): 0 = exclude, 1 = include hardverske nesavršenosti
+            prijemnika (CFO, SFO, fazni šum, IQ debalans iz ChannelSettings)
     """
 
-    def __init__(self, multipath=0, thermal_noise=1):
+    def __init__(self, multipath=0, thermal_noise=1, doppler=0, impairments=0):
         self.Multipath = multipath
         self.ThermalNoise = thermal_noise
+        self.Doppler = doppler
+        self.Impairments = impairments
 
     @property
     def Multipath(self):
@@ -33,3 +40,24 @@ class ChannelMode:
         else:
             raise ValueError("ThermalNoise mora biti 0 ili 1")
 
+    @property
+    def Doppler(self):
+        return self._doppler
+
+    @Doppler.setter
+    def Doppler(self, value):
+        if value in (0, 1):
+            self._doppler = value
+        else:
+            raise ValueError("Doppler mora biti 0 ili 1")
+
+    @property
+    def Impairments(self):
+        return self._impairments
+
+    @Impairments.setter
+    def Impairments(self, value):
+        if value in (0, 1):
+            self._impairments = value
+        else:
+            raise ValueError("Impairments mora biti 0 ili 1")
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class ChannelSettings:
     """
     Settings definira parametre simulacije kanala.
@@ -6,13 +9,42 @@ class ChannelSettings:
         NumberOfTaps (int): broj tapova za multipath model
         DelaySpread (float): maksimalno kašnjenje multipath u sekundama
         SNR_dB (float): Signal-to-Noise Ratio u dB
+        Seed (int, np.random.Generator ili None): sjeme ili generator za
+            tapove kanala i šum. Default je None (nasumično sjeme iz OS-a), pa
+            svaki novi Channel_Model daje nezavisne realizacije. Ovo je
+            namjerna promjena ponašanja: ranije je Generate_AWGN pri svakom
+            pozivu postavljao np.random.seed(0), pa su šum (i tapovi nakon
+            prvog poziva) bili uvijek isti. Ko treba ponovljive realizacije
+            (testovi, poređenja) zadaje cijeli broj, npr. seed=0. Za više
+            nezavisnih ponovljivih kanala sjemena se izvode iz jednog
+            np.random.SeedSequence pomoću spawn().
+            Generator zadan ovdje dijele svi modeli napravljeni sa ovim
+            podešavanjima (nije kopija); Generator nije thread-safe, pa se
+            takva podešavanja ne smiju koristiti iz više niti istovremeno.
+        MaxDoppler (float): maksimalni Doppler pomak u Hz (ChannelMode.Doppler = 1)
+        NumberOfSinusoids (int): broj sinusoida po tapu u Jakes modelu
+        CFO_Hz (float): frekvencijski ofset nosioca u Hz (ChannelMode.Impairments = 1)
+        SFO_ppm (float): odstupanje takta uzorkovanja u ppm
+        PhaseNoiseLinewidth (float): 3 dB širina linije oscilatora u Hz (Wiener fazni šum)
+        IQGain_dB (float): debalans pojačanja I/Q grana u dB
+        IQPhase_deg (float): debalans faze I/Q grana u stepenima
     """
 
-    def __init__(self, sample_rate=40e6, number_of_taps=40, delay_spread=150e-9, snr_db=35):
+    def __init__(self, sample_rate=40e6, number_of_taps=40, delay_spread=150e-9, snr_db=35, seed=None,
+                 max_doppler=0.0, number_of_sinusoids=16, cfo_hz=0.0, sfo_ppm=0.0,
+                 phase_noise_linewidth=0.0, iq_gain_db=0.0, iq_phase_deg=0.0):
         self.SampleRate = sample_rate
         self.NumberOfTaps = number_of_taps
         self.DelaySpread = delay_spread
         self.SNR_dB = snr_db
+        self.Seed = seed
+        self.MaxDoppler = max_doppler
+        self.NumberOfSinusoids = number_of_sinusoids
+        self.CFO_Hz = cfo_hz
+        self.SFO_ppm = sfo_ppm
+        self.PhaseNoiseLinewidth = phase_noise_linewidth
+        self.IQGain_dB = iq_gain_db
+        self.IQPhase_deg = iq_phase_deg
 
     @property
     def SampleRate(self):
@@ -54,3 +86,84 @@ class ChannelSettings:
     @SNR_dB.setter
     def SNR_dB(self, value):
         self._snr_db = value
+
+    @property
+    def Seed(self):
+        return self._seed
+
+    @Seed.setter
+    def Seed(self, value):
+        if value is None or isinstance(value, (np.random.Generator, np.random.SeedSequence)):
+            self._seed = value
+        elif isinstance(value, (int, np.integer)) and not isinstance(value, bool) and value >= 0:
+            self._seed = int(value)
+        else:
+            raise ValueError("Seed mora biti nenegativan cijeli broj, np.random.Generator ili None")
+
+    @property
+    def MaxDoppler(self):
+        return self._max_doppler
+
+    @MaxDoppler.setter
+    def MaxDoppler(self, value):
+        if value >= 0:
+            self._max_doppler = value
+        else:
+            raise ValueError("MaxDoppler mora biti ≥ 0")
+
+    @property
+    def NumberOfSinusoids(self):
+        return self._number_of_sinusoids
+
+    @NumberOfSinusoids.setter
+    def NumberOfSinusoids(self, value):
+        if isinstance(value, int) and value > 0:
+            self._number_of_sinusoids = value
+        else:
+            raise ValueError("NumberOfSinusoids mora biti pozitivan cijeli broj")
+
+    @property
+    def CFO_Hz(self):
+        return self._cfo_hz
+
+    @CFO_Hz.setter
+    def CFO_Hz(self, value):
+        self._cfo_hz = value
+
+    @property
+    def SFO_ppm(self):
+        return self._sfo_ppm
+
+    @SFO_ppm.setter
+    def SFO_ppm(self, value):
+        if value > -1e6:
+            self._sfo_ppm = value
+        else:
+            raise ValueError("SFO_ppm mora biti veći od -1e6")
+
+    @property
+    def PhaseNoiseLinewidth(self):
+        return self._phase_noise_linewidth
+
+    @PhaseNoiseLinewidth.setter
+    def PhaseNoiseLinewidth(self, value):
+        if value >= 0:
+            self._phase_noise_linewidth = value
+        else:
+            raise ValueError("PhaseNoiseLinewidth mora biti ≥ 0")
+
+    @property
+    def IQGain_dB(self):
+        return self._iq_gain_db
+
+    @IQGain_dB.setter
+    def IQGain_dB(self, value):
+        self._iq_gain_db = value
+
+    @property
+    def IQPhase_deg(self):
+        return self._iq_phase_deg
+
+    @IQPhase_deg.setter
+    def IQPhase_deg(self, value):
+        self._iq_phase_deg = value
@@ -0,0 +1,175 @@
+import numpy as np
+
+#Broj izlaznih uzoraka po bloku obrade; privremeni nizovi su veličine bloka,
+#bez obzira na dužinu signala
+IMPAIRMENT_CHUNK = 8192
+
+
+def _window(x, start, stop):
+    """x[..., start:stop] sa nulama za indekse izvan [0, L)."""
+    L = x.shape[-1]
+    out = np.zeros(x.shape[:-1] + (stop - start,), dtype=np.result_type(x, complex))
+    lo, hi = max(start, 0), min(stop, L)
+    if hi > lo:
+        out[..., lo - start:hi - start] = x[..., lo:hi]
+    return out
+
+
+def farrow_cubic(x, tau):
+    """
+    Kubna Lagrange interpolacija x u (necijelim) trenucima tau, Farrow strukturom.
+
+    Za i = floor(tau) i mu = tau - i koristi uzorke x[i-1], x[i], x[i+1],
+    x[i+2]; polinom u mu se računa Hornerovom šemom sa koeficijentima koji su
+    fiksne linearne kombinacije ta četiri uzorka. Uzorci izvan signala su nula.
+
+    Parametri
+    x : np.ndarray (..., L)
+    tau : np.ndarray (T,)
+        Rastući trenuci u jedinicama uzorka
+
+    Povratna vrijednost
+    y : np.ndarray (..., T)
+    """
+    i = np.floor(tau).astype(np.int64)
+    mu = tau - i
+    start = int(i[0]) - 1
+    buffer = _window(x, start, int(i[-1]) + 3)
+    k = i - start
+    xm1, x0, x1, x2 = (buffer[..., k + d] for d in (-1, 0, 1, 2))
+
+    a3 = (x2 - xm1) / 6 + (x0 - x1) / 2
+    a2 = (xm1 + x1) / 2 - x0
+    a1 = x1 - x0 / 2 - xm1 / 3 - x2 / 6
+    return ((a3 * mu + a2) * mu + a1) * mu + x0
+
+
+def cfo_rotation(cycles_per_sample, length):
+    """
+    Rotacija exp(j*2*pi*c*k) za k = 0..length-1, po zadnjoj osi.
+
+    cycles_per_sample je oblika (..., 1) (c po paketu). Kako je k = q*S + r,
+    rotacija je proizvod exp(j*2*pi*c*q*S) i exp(j*2*pi*c*r), pa se računa
+    ~2*sqrt(length) eksponencijala po paketu umjesto length.
+    """
+    S = max(1, int(np.ceil(np.sqrt(length))))
+    Q = -(-length // S)
+    w = 2 * np.pi * cycles_per_sample
+    coarse = np.exp(1j * w * (S * np.arange(Q)))
+    fine = np.exp(1j * w * np.arange(S))
+    rotation = coarse[..., :, None] * fine[..., None, :]
+    return rotation.reshape(rotation.shape[:-2] + (Q * S,))[..., :length]
+
+
+def iq_imbalance_coefficients(gain_db, phase_deg):
+    """
+    Koeficijenti (mu, nu) modela IQ debalansa y = mu*x + nu*conj(x).
+
+    g = 10^(gain_db/20), phi u radijanima:
+    mu = (1 + g*exp(-j*phi))/2, nu = (1 - g*exp(j*phi))/2.
+    Za gain_db = 0 i phase_deg = 0 je mu = 1, nu = 0.
+    """
+    g = 10 ** (gain_db / 20)
+    phi = np.deg2rad(phase_deg)
+    return (1 + g * np.exp(-1j * phi)) / 2, (1 - g * np.exp(1j * phi)) / 2
+
+
+def apply_cfo(x, cfo_hz, fs, chunk_size=IMPAIRMENT_CHUNK):
+    """
+    Frekvencijski ofset nosioca: x[n] * exp(j*2*pi*cfo*n/fs).
+
+    Eksponencijal se računa jednom za blok od chunk_size uzoraka; svaki blok
+    se množi tom tabelom i jednim faznim pomakom početka bloka (računatim po
+    modulu 2*pi, bez akumulacije greške). Radi za x oblika (..., L); cfo_hz
+    je skalar ili niz oblika x.shape[:-1] (poseban ofset za svaki paket).
+    Korekcija procijenjenog ofseta je apply_cfo(x, -cfo_hz, fs).
+    """
+    return apply_impairments(x, fs, cfo_hz=cfo_hz, chunk_size=chunk_size)
+
+
+def apply_impairments(x, fs, cfo_hz=0.0, sfo_ppm=0.0, phase_noise_hz=0.0,
+                      iq_gain_db=0.0, iq_phase_deg=0.0, rng=None, chunk_size=IMPAIRMENT_CHUNK):
+    """
+    Hardverske nesavršenosti prijemnika u jednom prolazu po blokovima.
+
+    Redoslijed po izlaznom uzorku n:
+    1. SFO: takt prijemnika je fs*(1 + sfo_ppm*1e-6), pa je uzorak n uzet u
+       trenutku n/(1 + sfo_ppm*1e-6) (kubna Farrow interpolacija)
+    2. CFO: rotacija exp(j*2*pi*cfo_hz*n/fs)
+    3. Wiener fazni šum: phi[n] = phi[n-1] + N(0, 2*pi*phase_noise_hz/fs),
+       gdje je phase_noise_hz 3 dB širina linije oscilatora
+    4. IQ debalans: y = mu*y + nu*conj(y) (vidi iq_imbalance_coefficients)
+
+    Nesavršenosti sa nultim parametrom se preskaču. Obrada ide blok po blok
+    (chunk_size izlaznih uzoraka), a stanje (faza šuma, položaj) se prenosi
+    između blokova, pa privremena memorija ne zavisi od dužine signala.
+
+    Parametri
+    x : np.ndarray (..., L)
+        Ulazni signal(i); vodeće dimenzije su nezavisni paketi
+    fs : float
+        Frekvencija uzorkovanja [Hz]
+    cfo_hz : float ili np.ndarray, opcionalno
+        CFO [Hz]; niz oblika x.shape[:-1] daje poseban ofset svakom paketu
+    sfo_ppm, phase_noise_hz, iq_gain_db, iq_phase_deg : float, opcionalno
+    rng : np.random.Generator, sjeme ili None, opcionalno
+        Generator za fazni šum
+    chunk_size : int, opcionalno
+
+    Povratna vrijednost
+    y : np.ndarray (..., L), kompleksan
+
+    Izuzeci
+    ValueError
+        Ako je phase_noise_hz negativan, sfo_ppm <= -1e6 ili chunk_size < 1
+    """
+    x = np.asarray(x)
+    if phase_noise_hz < 0:
+        raise ValueError("phase_noise_hz mora biti ≥ 0")
+    if sfo_ppm <= -1e6:
+        raise ValueError("sfo_ppm mora biti veći od -1e6")
+    if chunk_size < 1:
+        raise ValueError("chunk_size mora biti pozitivan")
+
+    L = x.shape[-1]
+    out = np.empty(x.shape, dtype=np.result_type(x, complex))
+    # Generator (i entropija OS-a za rng=None) samo ako treba fazni šum
+    rng = np.random.default_rng(rng) if phase_noise_hz > 0 else None
+    clock = 1 + sfo_ppm * 1e-6
+    mu, nu = iq_imbalance_coefficients(iq_gain_db, iq_phase_deg)
+    pn_std = np.sqrt(2 * np.pi * phase_noise_hz / fs)
+    pn_phase = np.zeros(x.shape[:-1] + (1,))
+
+    # Tabela CFO rotacije za jedan blok (bez faznog šuma dovoljna je ona),
+    # po paketu ako je cfo_hz niz
+    cycles_per_sample = np.asarray(cfo_hz, dtype=float)[..., None] / fs
+    has_cfo = np.any(cycles_per_sample != 0)
+    cfo_table = cfo_rotation(cycles_per_sample, min(chunk_size, L))
+
+    for start in range(0, L, chunk_size):
+        n = min(chunk_size, L - start)
+        if sfo_ppm != 0:
+            block = farrow_cubic(x, np.arange(start, start + n) / clock)
+        else:
+            block = x[..., start:start + n]  # pogled; dalje samo operacije bez izmjene ulaza
+
+        # Faza početka bloka po modulu jednog ciklusa
+        start_phase = 2 * np.pi * ((cycles_per_sample * start) % 1.0)
+        if phase_noise_hz > 0:
+            increments = rng.standard_normal(x.shape[:-1] + (n,)) * pn_std
+            phi = pn_phase + np.cumsum(increments, axis=-1)
+            pn_phase = phi[..., -1:].copy()
+            if has_cfo:
+                phi += start_phase + 2 * np.pi * cycles_per_sample * np.arange(n)
+            block = block * np.exp(1j * phi)
+        elif has_cfo:
+            rotation = cfo_table[..., :n]
+            if start:
+                rotation = rotation * np.exp(1j * start_phase)
+            block = block * rotation
+
+        if nu != 0 or mu != 1:
+            block = mu * block + nu * block.conj()
+        out[..., start:start + n] = block
+
+    return out
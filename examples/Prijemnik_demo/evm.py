@@ -12,21 +12,15 @@ from rx.estimacija_kanala import channel_estimate_and_equalizer
 from rx.PhaseCorrection_80211a import phase_correction_80211a
 
 from tx.long_sequence import get_long_training_sequence
-from rx.prijemnik import run_rx
+from rx.prijemnik import run_rx, apply_cfo_correction
 from tx.OFDM_TX_802_11 import Transmitter80211a
 
 from channel.Channel_Model import Channel_Model
 from channel.channel_settings import ChannelSettings
 from channel.channel_mode import ChannelMode
+from channel.impairments import apply_cfo
 
 # ---------------- helperi ----------------
-def apply_cfo(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(1j * 2 * np.pi * cfo_hz * n / fs)
-
-def apply_cfo_correction(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(-1j * 2 * np.pi * cfo_hz * n / fs)
 
 def add_awgn(x, snr_db, seed=0):
     rng = np.random.default_rng(seed)
@@ -5,19 +5,13 @@ import matplotlib.pyplot as plt
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from rx.prijemnik import run_rx
+from rx.prijemnik import run_rx, apply_cfo_correction
 from rx.pretprocessing import iq_preprocessing
 from tx.OFDM_TX_802_11 import Transmitter80211a
+from channel.impairments import apply_cfo
 
 
 # ---------------- helperi ----------------
-def apply_cfo(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(1j * 2 * np.pi * cfo_hz * n / fs)
-
-def apply_cfo_correction(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(-1j * 2 * np.pi * cfo_hz * n / fs)
 
 def add_awgn(x, snr_db, seed=0):
     rng = np.random.default_rng(seed)
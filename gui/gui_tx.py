@@ -103,8 +103,8 @@ class OFDMGUI:
 
         #Generisanje komponenti
         sts, lts = tx.generate_training_sequences()
-        sts /= 64
-        lts /= 64
+        sts = sts / 64
+        lts = lts / 64
         payload, _ = tx.generate_payload()
         final_frame, _ = tx.generate_frame()
 
@@ -1,5 +1,216 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import scipy.signal as sc
+
+#Pozicije pilota (FFT binovi) i odgovarajući indeksi podnosioca k
+PILOT_BINS = np.array([11, 25, 38, 52])
+
+# FFT bin -> subcarrier index k (za fazni nagib)
+# k = idx za 0..31, a k = idx-64 za 32..63 (negativni tonovi)
+K_VEC = np.fft.fftfreq(64) * 64  # [0..31, -32..-1]
+PILOT_K = K_VEC[PILOT_BINS]
+
+# Indeksi data podnosioca (vaš TX mapping)
+DATA_INDICES = np.array([
+    6,7,8,9,10,
+    12,13,14,15,16,17,18,19,20,21,22,23,24,
+    26,27,28,29,30,31,32,33,34,35,36,37,39,
+    40,41,42,43,44,45,46,47,48,49,50,51,
+    53,54,55,56,57
+])
+DATA_K = K_VEC[DATA_INDICES]
+
+# Least-squares nagib pravca kroz (PILOT_K, faza) u zatvorenoj formi:
+# slope = sum_p LS_FIT[p] * faza[p]  (isto kao np.linalg.lstsq sa [k, 1])
+_k_centered = PILOT_K - PILOT_K.mean()
+LS_FIT = _k_centered / np.sum(_k_centered**2)
+
+# Ista težina izražena preko razlika susjednih faza:
+# slope = sum_q SLOPE_WEIGHTS[q] * (faza[q+1] - faza[q])
+SLOPE_WEIGHTS = np.cumsum(LS_FIT[::-1])[::-1][1:]
+
+
+def pilot_weights(channel_est, max_ratio=1):
+    """
+    Težine pilota za usrednjavanje CPE-a.
+
+    Parametri
+    channel_est : np.ndarray (64,) ili (..., 64)
+        Procijenjeni frekvencijski odziv kanala (po paketu)
+    max_ratio : int, opcionalno
+        Ako je 1 težine su proporcionalne amplitudi kanala na pilotu,
+        ako je 0 svi piloti imaju jednake težine
+
+    Povratna vrijednost
+    C : np.ndarray (4,) ili (..., 4)
+        Težine pilota 11, 25, 38 i 52
+    """
+    snaga = np.abs(channel_est[..., PILOT_BINS])
+    if max_ratio == 0:
+        return np.full(snaga.shape, 1/4)
+    return snaga / np.sum(snaga, axis=-1, keepdims=True)
+
+
+def _slope_drift_loop(pilots, C, L):
+    """
+    Sekvencijalni (referentni) proračun akumuliranog faznog nagiba.
+
+    Ponavlja originalnu petlju simbol po simbol (unwrap + LS + filtar
+    usrednjavanja) i koristi se samo kada zatvorena forma nije primjenjiva
+    (razlika faza susjednih pilota prelazi +-pi).
+
+    Povratna vrijednost
+    D : np.ndarray (N+1,)
+        D[i] je nagib već ugrađen u ekvilajzer prije simbola i
+    """
+    N = pilots.shape[0]
+    D = np.zeros(N + 1)
+    average_slope_filter = np.zeros(L)
+    for i in range(N):
+        p = pilots[i] * np.exp(-1j * D[i] * PILOT_K)
+        averaged_pilot = C @ p
+        pilot_phase = np.unwrap(np.angle(p * np.conj(averaged_pilot)))
+        slope = LS_FIT @ pilot_phase
+
+        average_slope_filter[1:] = average_slope_filter[:-1]
+        average_slope_filter[0] = slope
+        D[i + 1] = D[i] + np.sum(average_slope_filter) / L / L
+    return D
+
+
+def slope_drift(pilots, C, L=8):
+    """
+    Akumulirani fazni nagib za sve simbole odjednom.
+
+    U originalnoj petlji ekvilajzer se nakon svakog simbola množi sa
+    exp(-1j*avg_slope*k/L), pa je nagib ugrađen u ekvilajzer prije simbola i
+    D[i] = sum_{m<i} avg_slope[m] / L. Dok se faze pilota ne premotavaju,
+    izmjereni nagib je slope[i] = s[i] - D[i], gdje s[i] zavisi samo od
+    simbola izjednačenog početnim ekvilajzerom. Uz pomični prosjek dužine L
+    to daje linearnu rekurziju
+
+        D[n] = D[n-1] + (1/L^2) * sum_{m=1..L} (s[n-m] - D[n-m])
+
+    koja se računa jednim IIR filtrom (scipy.signal.lfilter).
+
+    Parametri
+    pilots : np.ndarray (..., N, 4)
+        Piloti izjednačeni početnim ekvilajzerom
+    C : np.ndarray (4,) ili (..., 4)
+        Težine pilota (vidi pilot_weights), zajedničke ili po paketu
+    L : int, opcionalno
+        Dužina filtra za usrednjavanje faznog nagiba
+
+    Povratna vrijednost
+    D : np.ndarray (..., N+1)
+        D[..., i] je nagib ugrađen u ekvilajzer prije simbola i,
+        D[..., N] je nagib nakon zadnjeg simbola
+    """
+    pilots = np.asarray(pilots)
+    N = pilots.shape[-2]
+    lead = pilots.shape[:-2]
+
+    #Razlike faza susjednih pilota (bez uticaja D)
+    w = np.angle(pilots[..., 1:] * np.conj(pilots[..., :-1]))
+    s = w @ SLOPE_WEIGHTS
+
+    b = np.full(L + 1, 1 / L**2)
+    b[0] = 0.0
+    a = np.full(L + 1, 1 / L**2)
+    a[0] = 1.0
+    a[1] -= 1.0
+    s_ext = np.concatenate((s, np.zeros(lead + (1,))), axis=-1)
+    D = sc.lfilter(b, a, s_ext, axis=-1)
+
+    #Provjera pretpostavke (nema premotavanja faze) i egzaktni povratak
+    increments = w - D[..., :N, None] * np.diff(PILOT_K)
+    wrapped = np.any(np.abs(increments) >= np.pi, axis=-1)
+    if np.any(wrapped):
+        D = D.reshape(-1, N + 1)
+        flat_pilots = pilots.reshape(-1, N, 4)
+        flat_C = np.broadcast_to(C, lead + (4,)).reshape(-1, 4)
+        for r in np.flatnonzero(np.any(wrapped.reshape(-1, N), axis=-1)):
+            D[r] = _slope_drift_loop(flat_pilots[r], flat_C[r], L)
+        D = D.reshape(lead + (N + 1,))
+    return D
+
+
+def correct_equalized_symbols(equalized, C, L=8):
+    """
+    CPE i korekcija faznog nagiba za već izjednačene simbole.
+
+    Parametri
+    equalized : np.ndarray (..., N, 64)
+        FFT payload simbola pomnožen početnim koeficijentima ekvilajzera
+    C : np.ndarray (4,) ili (..., 4)
+        Težine pilota (vidi pilot_weights), zajedničke ili po paketu
+    L : int, opcionalno
+        Dužina filtra za usrednjavanje faznog nagiba
+
+    Povratna vrijednost
+    corrected : np.ndarray (..., N, 48)
+        Fazno ispravljeni data podnosioci
+    """
+    pilots = equalized[..., PILOT_BINS]
+    D = slope_drift(pilots, C, L)
+    D_before = D[..., :-1]
+    avg_slope = L * np.diff(D, axis=-1)
+
+    #CPE nakon nagiba ugrađenog u ekvilajzer
+    averaged_pilot = np.einsum("...np,...p->...n", pilots * np.exp(-1j * D_before[..., None] * PILOT_K), C)
+    theta = np.angle(averaged_pilot)
+
+    phase = (D_before + avg_slope)[..., None] * DATA_K + theta[..., None]
+    return equalized[..., DATA_INDICES] * np.exp(-1j * phase)
+
+
+def phase_correction_80211a_batch(rx_signal, num_symbols, ltpeak, channel_est, equalizer_coeffs, L=8, max_ratio=1):
+    """
+    Fazna korekcija za IEEE 802.11a OFDM sistem, svi simboli odjednom.
+
+    Isti rezultat kao phase_correction_80211a, ali se svi payload simboli
+    izdvajaju kao (N, 64) pogled, transformišu jednim FFT-om, a CPE i nagib
+    računaju vektorski (vidi slope_drift).
+
+    Parametri
+    rx_signal : np.ndarray
+        Primljeni signal u vremenskom domenu
+    num_symbols : int
+        Broj OFDM simbola za obradu
+    ltpeak : int
+        Indeks početka LTS-a (detektovani vrh dugog trening simbola)
+    channel_est : np.ndarray (64,)
+        Procijenjeni frekvencijski odziv kanala
+    equalizer_coeffs : np.ndarray (64,)
+        Koeficijenti kanalskog ekvilajzera
+    L : int, opcionalno
+        Dužina filetra za usrednjavanje faznog nagiba
+    max_ratio : int, opcionalno
+        Ako je 1 koristi ponderisanje pilota po snazi,
+        ako je 0 svi piloti imaju jednake težine
+
+    Povratna vrijednost
+    corrected_symbols : np.ndarray (num_symbols, 48)
+        Fazno ispravljeni OFDM simboli (48 podnosioca po simbolu)
+
+    Izuzeci
+    ValueError
+        Ako rx_signal nema dovoljno uzoraka za traženi broj simbola
+    """
+    C = pilot_weights(channel_est, max_ratio)
+    if num_symbols == 0:
+        return np.zeros((0, 48), dtype=complex)
+
+    CP = 16
+    SYM = 80
+    payload_start = ltpeak + 2*64
+    payload_stop = payload_start + num_symbols*SYM
+    if payload_start < 0 or payload_stop > len(rx_signal):
+        raise ValueError("rx_signal nema dovoljno uzoraka za traženi broj OFDM simbola.")
+
+    symbols = rx_signal[payload_start:payload_stop].reshape(num_symbols, SYM)[:, CP:]
+    equalized = 1/64 * np.fft.fft(symbols, axis=1) * equalizer_coeffs
+    return correct_equalized_symbols(equalized, C, L)
+
 
 def phase_correction_80211a(rx_signal, num_symbols,ltpeak,channel_est,equalizer_coeffs,L=8, max_ratio=1):
     """
@@ -30,95 +241,12 @@ def phase_correction_80211a(rx_signal, num_symbols,ltpeak,channel_est,equalizer_
     Povratne vrijednosti
     corrected_symbols : list[np.ndarray]
         Lista fazno ispravljenih OFDM simbola (48 podnosioca po simbolu)
-    """
-    #Pozicije pilota
-    idx_p1 = 11
-    idx_p2 = 25
-    idx_p3 = 38
-    idx_p4 = 52
-
-    pilot_p1_snaga=abs(channel_est[idx_p1])
-    pilot_p2_snaga=abs(channel_est[idx_p2])
-    pilot_p3_snaga=abs(channel_est[idx_p3])
-    pilot_p4_snaga=abs(channel_est[idx_p4])
-
-    snaga_pilota=pilot_p1_snaga+pilot_p2_snaga+pilot_p3_snaga+pilot_p4_snaga
-    
-    if(max_ratio==0):
-        C1, C2, C3, C4=1/4, 1/4, 1/4, 1/4
-    else: 
-        C1= pilot_p1_snaga/snaga_pilota
-        C2= pilot_p2_snaga/snaga_pilota
-        C3= pilot_p3_snaga/snaga_pilota
-        C4= pilot_p4_snaga/snaga_pilota
 
-    average_slope_filter = np.zeros(L)
-    corrected_symbols=[]
-
-    # FFT bin -> subcarrier index k (za fazni nagib)
-    # k = idx za 0..31, a k = idx-64 za 32..63 (negativni tonovi)
-    k_vec = np.fft.fftfreq(64) * 64  # [0..31, -32..-1]
-
-    # k vrijednosti za vaše pilot binove
-    pilot_bins = np.array([idx_p1, idx_p2, idx_p3, idx_p4], dtype=int)
-    pilot_k = k_vec[pilot_bins]
-
-    # Indeksi data podnosioca (vaš TX mapping)
-    data_indices=np.array([
-        6,7,8,9,10,
-        12,13,14,15,16,17,18,19,20,21,22,23,24,
-        26,27,28,29,30,31,32,33,34,35,36,37,39,
-        40,41,42,43,44,45,46,47,48,49,50,51,
-        53,54,55,56,57
-    ])
-
-    for i in range (num_symbols):
-        CP = 16
-        SYM = 80
-        start=ltpeak+2*64+i*SYM+CP
-        stop=start+64
-        trenutni_simbol=rx_signal[start:stop]
-        trenutni_fft=1/64*np.fft.fft(trenutni_simbol)
-        equalized_symbol=trenutni_fft*equalizer_coeffs
-
-        #Ekstrakcija pilota
-        pilot_1 = equalized_symbol[idx_p1]
-        pilot_2 = equalized_symbol[idx_p2]
-        pilot_3 = equalized_symbol[idx_p3]
-        pilot_4 = equalized_symbol[idx_p4]
-
-        #CPE korekcija
-        averaged_pilot=(C1*pilot_1+C2*pilot_2+C3*pilot_3+C4*pilot_4)
-        theta = np.angle(averaged_pilot)
-        corr_symbol1 = equalized_symbol * np.exp(-1j * theta)
-
-        #Phase slope 
-        # (nakon skidanja CPE, faze pilota fitamo na liniju: phase ≈ slope*k + const)
-        pilots_cpe_removed = np.array([
-            pilot_1*np.conj(averaged_pilot),
-            pilot_2*np.conj(averaged_pilot),
-            pilot_3*np.conj(averaged_pilot),
-            pilot_4*np.conj(averaged_pilot)
-        ], dtype=complex)
-
-        pilot_phase = np.unwrap(np.angle(pilots_cpe_removed))
-
-        # Least-squares fit: pilot_phase = a*pilot_k + b  -> slope=a
-        A = np.vstack([pilot_k, np.ones_like(pilot_k)]).T
-        slope, _ = np.linalg.lstsq(A, pilot_phase, rcond=None)[0]
-
-        #Average slope filter 
-        average_slope_filter[1:] = average_slope_filter[:-1]
-        average_slope_filter[0] = slope
-        avg_slope = np.sum(average_slope_filter)/L
-
-        #Korekcija
-        applied_correction = avg_slope * k_vec
-        corr_symbol2=corr_symbol1*np.exp(-1j*applied_correction)
-        equalizer_coeffs=equalizer_coeffs*np.exp(-1j*applied_correction/L)
-
-        #Ekstrakcija data podnosioca
-        corrected_sym = corr_symbol2[data_indices]
-        corrected_symbols.append(corrected_sym)
-
-    return corrected_symbols
+    Napomene
+    Računa se preko phase_correction_80211a_batch; elementi liste su redovi
+    jednog (num_symbols, 48) niza.
+    """
+    corrected = phase_correction_80211a_batch(
+        rx_signal, num_symbols, ltpeak, channel_est, equalizer_coeffs, L=L, max_ratio=max_ratio
+    )
+    return list(corrected)
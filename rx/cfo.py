@@ -1,5 +1,5 @@
 import numpy as np
-from rx.detection import packet_detector
+from rx.detection import sliding_autocorrelation
 import matplotlib.pyplot as plt
 
 def gruba_vremenska_sinhronizacija(rx_lts, search_win=32):
@@ -27,6 +27,56 @@ def gruba_vremenska_sinhronizacija(rx_lts, search_win=32):
     return fft_start, timing_corr, timing_idxs
 
 
+def autocorrelation_at(RX_Input, idx, delay, window):
+    """
+    Vrijednost pomične autokorelacije samo na jednom indeksu.
+
+    Računa (1/window) * sum_{k=idx-window+1}^{idx} x[k] * conj(x[k-delay]),
+    pri čemu su uzorci prije početka signala nule. Isto kao
+    'sliding_autocorrelation(x, delay, window)[idx]', ali u O(window).
+    """
+    k_start = max(idx - window + 1, delay)
+    if idx < k_start:
+        return 0j
+    current = RX_Input[k_start:idx+1]
+    delayed = RX_Input[k_start-delay:idx+1-delay]
+    return np.vdot(delayed, current) / window
+
+
+def autocorrelation_at_batch(RX_Input, idx, delay, window):
+    """
+    autocorrelation_at za svaki red (R, N) na njegovom indeksu idx[r].
+
+    Uzorci svih prozora se izdvajaju jednim indeksiranjem (R, window), pa
+    nema petlje po paketima.
+    """
+    RX_Input = np.asarray(RX_Input)
+    R, N = RX_Input.shape
+    k = np.asarray(idx)[:, None] - np.arange(window - 1, -1, -1)
+    valid = (k >= delay) & (k < N)
+    if N <= delay:
+        return np.zeros(R, dtype=complex)
+    k = np.clip(k, delay, N - 1)
+    rows = np.arange(R)[:, None]
+    products = np.conj(RX_Input[rows, k - delay]) * RX_Input[rows, k]
+    return np.sum(np.where(valid, products, 0), axis=-1) / window
+
+
+def frequency_offset_traces(RX_Input):
+    """
+    Puni tragovi autokorelacije za grubi (STS) i precizni (LTS) CFO, za prikaz.
+
+    Povratna vrijednost
+    AutoCorr_Est : ndarray
+        Autokorelacija sa kašnjenjem 16 i prozorom 32 za svaki uzorak.
+    AutoCorr_Est_Fine : ndarray
+        Autokorelacija sa kašnjenjem 64 i prozorom 64 za svaki uzorak.
+    """
+    AutoCorr_Est = sliding_autocorrelation(RX_Input, delay=16, window=32)
+    AutoCorr_Est_Fine = sliding_autocorrelation(RX_Input, delay=64, window=64)
+    return AutoCorr_Est, AutoCorr_Est_Fine
+
+
 def detect_frequency_offsets(RX_Input, lts_start, plot=False, fs=20e6):
     """
     Detektuje frekvencijski ofset nosioca (CFO) primljenog 802.11a OFDM signala.
@@ -53,59 +103,31 @@ def detect_frequency_offsets(RX_Input, lts_start, plot=False, fs=20e6):
         Niz koji sadrži:
             FrequencyOffsets[0] : grubi CFO u Hz
             FrequencyOffsets[1] : precizni CFO u Hz
+
+    Napomene
+    - Autokorelacija se računa samo na dva indeksa koja se koriste
+      (idx_coarse i idx_fine), pa je cijena O(prozor) umjesto O(N).
+    - Puni tragovi autokorelacije dostupni su preko 'frequency_offset_traces'.
     """
-    RX_Input = np.asarray(RX_Input)
+    RX_Input = np.asarray(RX_Input, dtype=complex)
     N = len(RX_Input)
 
     #1=coarse/gruba, 2=fine/precizna 
     FrequencyOffsets = np.zeros(2)
 
-    #Coarse/gruba
-    AutoCorr_Est = np.zeros(N, dtype=complex)
-    Delay16 = np.zeros(16, dtype=complex)
-    SlidingAverage1 = np.zeros(32, dtype=complex)
-
-    for i in range(N):
-        RX_Input_16 = Delay16[-1]
-        Delay16[1:] = Delay16[:-1]
-        Delay16[0] = RX_Input[i]
-
-        Temp = RX_Input[i] * np.conj(RX_Input_16)
-        SlidingAverage1[1:] = SlidingAverage1[:-1]
-        SlidingAverage1[0] = Temp
-
-        AutoCorr_Est[i] = np.sum(SlidingAverage1) / 32
-
-    idx_coarse = int(np.clip(lts_start - 32 - 50, 0, N - 1))
-    Theta = np.angle(AutoCorr_Est[idx_coarse])
+    #Coarse/gruba: kašnjenje 16, prozor 32, samo na indeksu idx_coarse
+    idx_coarse = int(np.clip(lts_start - 32 - 50, 0, max(N - 1, 0)))
+    Theta = np.angle(autocorrelation_at(RX_Input, idx_coarse, delay=16, window=32))
     FrequencyOffsets[0] = Theta * fs / (2 * np.pi * 16)
 
-    #Plot 
-    if plot:
-        pass
-
-    #Fine/precizna 
-    AutoCorr_Est_Fine = np.zeros(N, dtype=complex)
-    Delay64 = np.zeros(64, dtype=complex)
-    SlidingAverage2 = np.zeros(64, dtype=complex)
-
-    for i in range(N):
-        RX_Input_64 = Delay64[-1]
-        Delay64[1:] = Delay64[:-1]
-        Delay64[0] = RX_Input[i]
-
-        Temp = RX_Input[i] * np.conj(RX_Input_64)
-        SlidingAverage2[1:] = SlidingAverage2[:-1]
-        SlidingAverage2[0] = Temp
-
-        AutoCorr_Est_Fine[i] = np.sum(SlidingAverage2) / 64
-
-    idx_fine = int(np.clip(lts_start + 64, 0, N - 1))
-    Theta = np.angle(AutoCorr_Est_Fine[idx_fine])
+    #Fine/precizna: kašnjenje 64, prozor 64, samo na indeksu idx_fine
+    idx_fine = int(np.clip(lts_start + 64, 0, max(N - 1, 0)))
+    Theta = np.angle(autocorrelation_at(RX_Input, idx_fine, delay=64, window=64))
     FrequencyOffsets[1] = Theta * fs / (2 * np.pi * 64)
 
-    #Plot 
+    #Plot (puni trag se računa samo za prikaz)
     if plot:
+        AutoCorr_Est_Fine = sliding_autocorrelation(RX_Input, delay=64, window=64)
         plt.figure(figsize=(12,3))
         plt.plot(np.abs(AutoCorr_Est_Fine), label='|R(n)| - LTS')
         plt.axvline(idx_fine, color='r', linestyle='--', label='Fine CFO index')
@@ -117,3 +139,29 @@ def detect_frequency_offsets(RX_Input, lts_start, plot=False, fs=20e6):
         plt.show()
 
     return FrequencyOffsets
+
+
+def detect_frequency_offsets_batch(RX_Input, lts_start, fs=20e6):
+    """
+    detect_frequency_offsets za R snimaka iste dužine odjednom.
+
+    Parametri
+    RX_Input : array_like (R, N)
+    lts_start : array_like (R,)
+        Indeks (kao u detect_frequency_offsets) za svaki snimak
+    fs : float, optional
+
+    Povratna vrijednost
+    FrequencyOffsets : ndarray, shape (R, 2)
+        [:, 0] grubi i [:, 1] precizni CFO u Hz
+    """
+    RX_Input = np.asarray(RX_Input, dtype=complex)
+    N = RX_Input.shape[-1]
+    lts_start = np.asarray(lts_start)
+
+    idx_coarse = np.clip(lts_start - 32 - 50, 0, max(N - 1, 0))
+    idx_fine = np.clip(lts_start + 64, 0, max(N - 1, 0))
+    FrequencyOffsets = np.empty((RX_Input.shape[0], 2))
+    FrequencyOffsets[:, 0] = np.angle(autocorrelation_at_batch(RX_Input, idx_coarse, 16, 32)) * fs / (2 * np.pi * 16)
+    FrequencyOffsets[:, 1] = np.angle(autocorrelation_at_batch(RX_Input, idx_fine, 64, 64)) * fs / (2 * np.pi * 64)
+    return FrequencyOffsets
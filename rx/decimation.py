@@ -0,0 +1,198 @@
+import numpy as np
+import scipy.signal as sc
+from functools import lru_cache
+
+from tx.filters import design_nyquist_filter, polyphase_bank
+
+
+@lru_cache(maxsize=32)
+def decimation_bank(N=31, down_factor=2, band=2):
+    """
+    Polifazne komponente filtera za decimaciju, normalizovane na DC pojačanje 1.
+
+    Isti filter kao na predajniku (design_nyquist_filter(N, band)) i isto
+    razlaganje kao polyphase_bank ('zero' / 'delay' / 'fir' faze), samo su
+    tapovi podijeljeni sa sum(h) jer decimacija ne treba pojačanje ×band.
+    Keširano po (N, down_factor, band); tapovi su samo za čitanje.
+    """
+    scale = 1 / np.sum(design_nyquist_filter(N, band))
+    bank = []
+    for vrsta, taps, offset in polyphase_bank(N, down_factor, band):
+        taps = taps * scale
+        taps.setflags(write=False)
+        bank.append((vrsta, taps, offset))
+    return tuple(bank)
+
+
+@lru_cache(maxsize=32)
+def decimation_stages(down_factor=2, N=31):
+    """
+    Rastavlja faktor decimacije na stepene (faktor, dužina filtera, opseg).
+
+    Kao cascaded_upsample na predajniku: stepeni ×2 sa half-band filterom
+    dužine N i, za neparan ostatak r > 1, jedan stepen ×r sa Nyquist
+    filterom r-tog opsega.
+    """
+    if not isinstance(down_factor, int) or isinstance(down_factor, bool):
+        raise TypeError("down_factor mora biti cijeli broj.")
+    if down_factor <= 0:
+        raise ValueError("down_factor mora biti pozitivan cijeli broj.")
+
+    stages = []
+    ostatak = down_factor
+    while ostatak % 2 == 0:
+        stages.append((2, N, 2))
+        ostatak //= 2
+    if ostatak > 1:
+        N_r = ostatak * ((N + 1) // 2) - 1
+        if N_r % 2 == 0:
+            N_r += 1
+        stages.append((ostatak, N_r, ostatak))
+    return tuple(stages)
+
+
+def _add_shifted(y, values, shift):
+    """y[..., m] += values[..., m + shift] za sve m gdje je indeks unutar values."""
+    lo = max(0, -shift)
+    hi = min(y.shape[-1], values.shape[-1] - shift)
+    if hi > lo:
+        y[..., lo:hi] += values[..., lo + shift:hi + shift]
+
+
+def polyphase_decimate(signal, down_factor=2, N=31, band=None, phase=0):
+    """
+    Filtriranje i decimacija polifaznom strukturom (računaju se samo zadržani uzorci).
+
+    Rezultat je y[m] = sum_k g[k] * x[m*M + phase + (N-1)//2 - k], gdje je
+    g = h / sum(h) filter iz design_nyquist_filter(N, band), tj. centrirana
+    ('same') filtracija nakon koje se uzima svaki M-ti uzorak počevši od
+    'phase'. Za phase=0 vremenska osa je ista kao kod x[::M].
+
+    Svaka polifazna komponenta filtrira samo svaki M-ti ulazni uzorak, pa je
+    cijena ~N*L/M množenja umjesto N*L, a kod half-band filtera neparna faza
+    je samo jedno množenje (centralni tap).
+
+    Parametri
+    signal : numpy.ndarray (..., L)
+        Ulazni signal; decimira se po zadnjoj osi (vodeće ose su paketi).
+    down_factor : int, opcionalno
+        Faktor decimacije M. Default je 2.
+    N : int, opcionalno
+        Dužina filtera. Default je 31 (kao half-band filter predajnika);
+        N=1 daje čistu decimaciju x[phase::M].
+    band : int ili None, opcionalno
+        Broj opsega filtera; None znači band = down_factor.
+    phase : int, opcionalno
+        Indeks ulaznog uzorka koji odgovara prvom izlaznom uzorku.
+
+    Povratna vrijednost
+    decimirano : numpy.ndarray (..., ceil((L - phase) / M))
+    """
+    x = np.asarray(signal)
+    M = down_factor
+    band = M if band is None else band
+    L = x.shape[-1]
+    center = (N - 1) // 2
+
+    num_out = max(0, -(-(L - phase) // M))
+    y = np.zeros(x.shape[:-1] + (num_out,), dtype=np.result_type(x, float))
+    if num_out == 0:
+        return y
+
+    for p, (vrsta, taps, offset) in enumerate(decimation_bank(N, M, band)):
+        if vrsta == "zero":
+            continue
+        # Faza p koristi ulaze x[(m - j)*M + base]; base = q*M + r
+        q, r = divmod(phase + center - p - offset * M, M)
+        x_r = x[..., r::M]
+        if x_r.shape[-1] == 0:
+            continue
+        if vrsta == "delay":
+            _add_shifted(y, taps[0] * x_r, q)
+        elif x.ndim == 1:
+            _add_shifted(y, np.convolve(x_r, taps), q)
+        else:
+            _add_shifted(y, sc.oaconvolve(x_r, taps.reshape((1,) * (x.ndim - 1) + (-1,)), axes=-1), q)
+
+    return y
+
+
+def cascaded_decimate(signal, down_factor=2, N=31):
+    """
+    Decimacija proizvoljnim cjelobrojnim faktorom kaskadom polifaznih stepena.
+
+    Stepeni su iz decimation_stages (×2 half-band filterom dužine N, pa
+    eventualno ×r); vremenska osa je ista kao kod signal[::down_factor], a
+    dužina izlaza je ceil(len / 2) po svakom stepenu ×2.
+
+    Parametri
+    signal : numpy.ndarray (..., L)
+        Ulazni signal; decimira se po zadnjoj osi.
+    down_factor : int, opcionalno
+        Ukupni faktor decimacije. Default je 2.
+    N : int, opcionalno
+        Dužina half-band filtera po stepenu. Default je 31.
+
+    Povratna vrijednost
+    decimirano : numpy.ndarray
+    """
+    decimirano = np.asarray(signal)
+    for M, N_stage, band in decimation_stages(down_factor, N):
+        decimirano = polyphase_decimate(decimirano, M, N_stage, band)
+    return decimirano
+
+
+class StreamingDecimator:
+    """
+    Decimacija toka uzoraka u blokovima, identična cascaded_decimate nad
+    cijelim tokom.
+
+    Svaki stepen čuva ulazne uzorke potrebne za izlaze koji još nisu
+    izračunati (centrirani filter treba (N-1)//2 budućih uzoraka), pa izlaz
+    kasni najviše za pola dužine filtera. flush() računa preostale izlaze sa
+    nulama nakon kraja toka, kao i obrada cijelog signala.
+    """
+
+    def __init__(self, down_factor=2, N=31):
+        self.stages = decimation_stages(down_factor, N)
+        # Po stepenu: zadržani ulaz, apsolutni indeks njegovog prvog uzorka i
+        # indeks sljedećeg izlaznog uzorka
+        self._state = [[np.zeros(0, dtype=complex), 0, 0] for _ in self.stages]
+
+    def process(self, chunk):
+        """Dodaje blok ulaznih uzoraka i vraća nove decimirane uzorke."""
+        out = np.ravel(chunk)
+        for stage, state in zip(self.stages, self._state):
+            out = self._stage(stage, state, out, final=False)
+        return out
+
+    def flush(self):
+        """Kraj toka: preostali izlazni uzorci (sa nulama iza kraja toka)."""
+        out = np.zeros(0, dtype=complex)
+        for stage, state in zip(self.stages, self._state):
+            out = self._stage(stage, state, out, final=True)
+        return out
+
+    @staticmethod
+    def _stage(stage, state, x, final):
+        M, N, band = stage
+        center = (N - 1) // 2
+        buffer, start, next_out = state
+        buffer = np.concatenate((buffer, x)) if len(buffer) else np.asarray(x, dtype=complex)
+        end = start + len(buffer)
+
+        # Izlaz m treba ulaze do m*M + center; bez kraja toka samo dostupni
+        if final:
+            count = max(0, -(-(end - next_out * M) // M))
+        else:
+            count = max(0, (end - 1 - center - next_out * M) // M + 1)
+
+        phase = next_out * M - start
+        y = polyphase_decimate(buffer[:phase + count * M + center], M, N, band, phase)[:count]
+        # Uzorci prije početka bafera su dio ranijih izlaza ili prije početka toka
+        next_out += count
+        keep_from = max(0, next_out * M - center - start)
+        state[0] = buffer[keep_from:]
+        state[1] = start + keep_from
+        state[2] = next_out
+        return y
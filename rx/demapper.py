@@ -0,0 +1,57 @@
+import numpy as np
+from tx.OFDM_mapper import BPSK_LUT, QPSK_LUT, QAM16_LUT, QAM64_LUT
+
+#LUT po osi za svaku modulaciju (isto kao u Mapper_OFDM)
+LUT_PO_OSI = {1: BPSK_LUT, 2: QPSK_LUT, 4: QAM16_LUT, 6: QAM64_LUT}
+
+
+def _odluka_po_osi(x, lut):
+    """
+    Indeks najbliže tačke ravnomjerne LUT tabele za svaki uzorak x (realni).
+
+    LUT je oblika (2i - (M-1)) / norm, pa je odluka zaokruživanje
+    (x*norm + M-1)/2 ograničeno na [0, M-1].
+    """
+    M = len(lut)
+    norm = (M - 1) / lut[-1]
+    index = np.rint((x * norm + (M - 1)) / 2)
+    return np.clip(index, 0, M - 1).astype(np.int64)
+
+
+def Demapper_OFDM(Symbols, BitsPerSymbol):
+    """
+    Tvrda odluka: mapira primljene kompleksne simbole nazad u bitove.
+
+    Inverzna operacija od Mapper_OFDM - svaki simbol se zamjenjuje najbližom
+    tačkom konstelacije (odluka se donosi posebno za I i Q osu), a indeks
+    tačke se razlaže na BitsPerSymbol bita (MSB prvi).
+
+    Parametri
+    Symbols : array-like
+        Niz kompleksnih (izjednačenih) simbola.
+    BitsPerSymbol : int
+        Broj bitova po simbolu (1, 2, 4 ili 6).
+
+    Povratna vrijednost
+    OutputBits : numpy.ndarray
+        1D niz bitova (0 ili 1), dužine len(Symbols) * BitsPerSymbol.
+
+    Izuzeci
+    ValueError
+        Ako BitsPerSymbol nije 1, 2, 4 ili 6.
+    """
+    if BitsPerSymbol not in LUT_PO_OSI:
+        raise ValueError("BitsPerSymbol mora biti 1, 2, 4 ili 6")
+
+    Symbols = np.asarray(Symbols).ravel()
+    lut = LUT_PO_OSI[BitsPerSymbol]
+
+    if BitsPerSymbol == 1:
+        Index = _odluka_po_osi(Symbols.real, lut)
+    else:
+        half = BitsPerSymbol // 2
+        Index = (_odluka_po_osi(Symbols.real, lut) << half) | _odluka_po_osi(Symbols.imag, lut)
+
+    shifts = np.arange(BitsPerSymbol - 1, -1, -1)
+    OutputBits = (Index[:, None] >> shifts) & 1
+    return OutputBits.ravel().astype(int)
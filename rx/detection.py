@@ -1,4 +1,90 @@
 import numpy as np
+import scipy.signal as sc
+
+
+def _moving_sum(x, window):
+    """
+    Kauzalna pomična suma dužine 'window' po zadnjoj osi (nule prije početka).
+
+    Za 1D ulaz koristi se np.convolve sa box kernelom, a za više dimenzija
+    scipy.signal.lfilter po zadnjoj osi (svaki red nezavisno). Suma se
+    računa direktno po prozoru, bez razlike kumulativnih suma, pa greška ne
+    raste sa dužinom snimka ni sa odnosom jakih i slabih dijelova signala.
+    """
+    kernel = np.ones(window)
+    if x.shape[-1] == 0:
+        return np.zeros_like(x)
+    if x.ndim == 1:
+        return np.convolve(x, kernel)[:len(x)]
+    return sc.lfilter(kernel, 1, x, axis=-1)
+
+
+def sliding_autocorrelation(rx_input, delay=16, window=32):
+    """
+    Pomična autokorelacija signala sa zakašnjenom kopijom.
+
+    autocorr[i] = (1/window) * sum_{k=i-window+1}^{i} rx[k] * conj(rx[k-delay]),
+    gdje se uzorci prije početka signala smatraju nulama.
+
+    Parametri
+    rx_input : ndarray
+        Kompleksni signal; računa se po zadnjoj osi.
+    delay : int, opcionalno
+        Kašnjenje u uzorcima (16 za STS, 64 za LTS).
+    window : int, opcionalno
+        Dužina prozora usrednjavanja.
+
+    Povratna vrijednost
+    autocorr : ndarray
+        Autokorelacija istog oblika kao ulaz.
+    """
+    rx_input = np.asarray(rx_input, dtype=np.complex128)
+    delayed = np.zeros_like(rx_input)
+    if rx_input.shape[-1] > delay:
+        delayed[..., delay:] = rx_input[..., :rx_input.shape[-1]-delay]
+    return _moving_sum(rx_input * np.conj(delayed), window) / window
+
+
+def sliding_power(rx_input, window=32):
+    """
+    Pomična srednja snaga signala: (1/window) * sum |rx[k]|^2 po zadnjih 'window' uzoraka.
+    """
+    rx_input = np.asarray(rx_input, dtype=np.complex128)
+    inst_power = rx_input.real**2 + rx_input.imag**2
+    return _moving_sum(inst_power, window) / window
+
+
+def hysteresis_flag(comparison_ratio, high=0.85, low=0.65):
+    """
+    Binarna zastavica sa histerezom, izračunata vektorski po zadnjoj osi.
+
+    Zastavica prelazi u 1 kada je odnos veći od 'high', u 0 kada je manji od
+    'low', a između pragova zadržava prethodno stanje (početno stanje je 0).
+    """
+    comparison_ratio = np.asarray(comparison_ratio)
+    N = comparison_ratio.shape[-1]
+
+    #Stanje koje nameće svaki uzorak: 1, 0 ili -1 (bez promjene)
+    event = np.full(comparison_ratio.shape, -1, dtype=np.int8)
+    event[comparison_ratio < low] = 0
+    event[comparison_ratio > high] = 1
+
+    #Indeks zadnjeg uzorka koji je promijenio stanje (forward fill)
+    idx = np.where(event >= 0, np.arange(N), -1)
+    idx = np.maximum.accumulate(idx, axis=-1)
+
+    flag = np.take_along_axis(event, np.maximum(idx, 0), axis=-1).astype(int)
+    flag[idx < 0] = 0
+    return flag
+
+
+def falling_edges(packet_det_flag):
+    """
+    Vraća sve indekse gdje zastavica prelazi iz 1 u 0 (1D ulaz).
+    """
+    packet_det_flag = np.asarray(packet_det_flag)
+    return np.flatnonzero((packet_det_flag[:-1] == 1) & (packet_det_flag[1:] == 0)) + 1
+
 
 def packet_detector(rx_input):
     """
@@ -23,59 +109,138 @@ def packet_detector(rx_input):
         Ako paket nije detektovan, vraća None.
     autocorr_est : ndarray
         Procijenjena autokorelacija signala po uzorcima.
+
+    Napomene
+    - Obrada je vektorizovana: pomične sume autokorelacije i snage računaju se
+      konvolucijom sa box kernelom, a histereza i padajuća ivica bez petlje
+      po uzorcima. Rezultat je isti kao kod obrade uzorak po uzorak
+      (delay linija od 16 i prozori od 32 uzorka inicijalizovani nulama).
+    - Ako postoji više padajućih ivica, vraća se zadnja.
     """
     rx_input=np.asarray(rx_input, dtype=np.complex128)
     N=len(rx_input)
 
-    #Izlazi
-    autocorr_est=np.zeros(N, dtype=np.complex128)
+    #Estimacija autokorelacije i varijanse (pomični prozor od 32 uzorka)
+    autocorr_est=sliding_autocorrelation(rx_input, delay=16, window=32)
+    variance_est=sliding_power(rx_input, window=32)
+
+    #Poredenje
     comparison_ratio=np.zeros(N)
-    packet_det_flag=np.zeros(N, dtype=int)
-    falling_edge_position=None
-
-    #Unutrasnja stanja
-    delay16=np.zeros(16, dtype=np.complex128)
-    sliding_avg_autocorr=np.zeros(32, dtype=np.complex128)
-    sliding_avg_power=np.zeros(32)
-    detection_flag=0
-
-    for i in range(N):
-        #16-uzoraka kasnjenje
-        rx_delayed=delay16[-1]
-        delay16[1:]=delay16[:-1]
-        delay16[0]=rx_input[i]
-
-        #Estimacija autokorelacije
-        temp=rx_input[i]*np.conj(rx_delayed)
-        sliding_avg_autocorr[1:]=sliding_avg_autocorr[:-1]
-        sliding_avg_autocorr[0]=temp
-
-        autocorr_est[i]=np.sum(sliding_avg_autocorr)/32
-        abs_autocorr_est=np.abs(autocorr_est[i])
-
-        #Estimacija varijanse
-        inst_power=rx_input[i]*np.conj(rx_input[i])
-        sliding_avg_power[1:]=sliding_avg_power[:-1]
-        sliding_avg_power[0]=inst_power.real
-
-        variance_est=np.sum(sliding_avg_power)/32
-
-        #Poredenje
-        if variance_est>0:
-            comparison_ratio[i]=abs_autocorr_est/variance_est
-        else:
-            comparison_ratio[i]=0.0
-
-        #Detekcija paketa sa histerezom
-        if comparison_ratio[i]>0.85:
-            detection_flag=1 
-        elif comparison_ratio[i]<0.65:
-            detection_flag=0
-
-        packet_det_flag[i]=detection_flag
-
-        #Falling edge detekcija
-        if i > 0 and packet_det_flag[i-1] == 1 and packet_det_flag[i] == 0:
-           falling_edge_position = i
+    valid=variance_est>0
+    comparison_ratio[valid]=np.abs(autocorr_est[valid])/variance_est[valid]
+
+    #Detekcija paketa sa histerezom
+    packet_det_flag=hysteresis_flag(comparison_ratio, high=0.85, low=0.65)
+
+    #Falling edge detekcija (zadnja)
+    edges=falling_edges(packet_det_flag)
+    falling_edge_position=int(edges[-1]) if edges.size else None
 
     return comparison_ratio, packet_det_flag, falling_edge_position, autocorr_est
+
+
+def packet_detector_batch(rx_inputs):
+    """
+    packet_detector za R snimaka iste dužine odjednom (po zadnjoj osi).
+
+    Parametri
+    rx_inputs : array_like (R, N)
+
+    Povratna vrijednost
+    comparison_ratio : ndarray (R, N)
+    packet_det_flag : ndarray (R, N)
+    falling_edge_positions : ndarray (R,), int
+        Zadnja padajuća ivica svakog reda (kao packet_detector), -1 ako je nema
+    """
+    rx_inputs = np.asarray(rx_inputs, dtype=np.complex128)
+    autocorr_est = sliding_autocorrelation(rx_inputs, delay=16, window=32)
+    variance_est = sliding_power(rx_inputs, window=32)
+
+    comparison_ratio = np.zeros(rx_inputs.shape)
+    valid = variance_est > 0
+    comparison_ratio[valid] = np.abs(autocorr_est[valid]) / variance_est[valid]
+    packet_det_flag = hysteresis_flag(comparison_ratio, high=0.85, low=0.65)
+
+    #Zadnji prelaz 1 -> 0 u svakom redu
+    edges = (packet_det_flag[:, :-1] == 1) & (packet_det_flag[:, 1:] == 0)
+    last = edges.shape[-1] - 1 - np.argmax(edges[:, ::-1], axis=-1)
+    falling_edge_positions = np.where(np.any(edges, axis=-1), last + 1, -1)
+    return comparison_ratio, packet_det_flag, falling_edge_positions
+
+
+def find_packets(rx_input, min_plateau=48, high=0.85, low=0.65):
+    """
+    Pronalazi sve pakete (STS platoe) u dužem snimku jednim vektorskim prolazom.
+
+    Računa isti odnos autokorelacije i snage i istu zastavicu sa histerezom
+    kao packet_detector, a zatim uparuje svaku rastuću ivicu zastavice sa
+    sljedećom padajućom. Plato kraći od 'min_plateau' uzoraka se odbacuje:
+    takve kratke impulse detektor daje npr. na kraju svakog paketa, kada snaga
+    naglo padne (idealni STS od 160 uzoraka daje plato od ~128 uzoraka).
+
+    Parametri
+    rx_input : array_like
+        Kompleksni primljeni signal (1D).
+    min_plateau : int, opcionalno
+        Minimalna dužina platoa (u uzorcima) da bi se prihvatio kao paket.
+    high, low : float, opcionalno
+        Pragovi histereze (kao u packet_detector).
+
+    Povratna vrijednost
+    packets : list[dict]
+        Po jedan dict za svaki paket, redom po vremenu:
+            rising_edge : int
+                Prvi uzorak platoa (zastavica = 1)
+            falling_edge : int
+                Padajuća ivica STS-a (kao falling_edge_position iz packet_detector)
+            plateau_length : int
+                falling_edge - rising_edge
+            mean_ratio : float
+                Srednji comparison_ratio na platou (kvalitet detekcije)
+            power : float
+                Srednja snaga signala na platou
+
+    Napomene
+    - Plato koji nije završio do kraja signala (nema padajuće ivice) se ne vraća.
+    """
+    rx_input = np.asarray(rx_input, dtype=np.complex128)
+    N = len(rx_input)
+    if N == 0:
+        return []
+
+    autocorr_est = sliding_autocorrelation(rx_input, delay=16, window=32)
+    variance_est = sliding_power(rx_input, window=32)
+    comparison_ratio = np.zeros(N)
+    valid = variance_est > 0
+    comparison_ratio[valid] = np.abs(autocorr_est[valid]) / variance_est[valid]
+    flag = hysteresis_flag(comparison_ratio, high=high, low=low)
+
+    # Ivice zastavice (rastuća i padajuća), sa nulom ispred signala
+    change = np.diff(flag, prepend=0)
+    rising = np.flatnonzero(change == 1)
+    falling = np.flatnonzero(change == -1)
+    # Zastavica naizmjenično raste i pada, pa je i-ta padajuća ivica par i-te rastuće
+    rising = rising[:len(falling)]
+    keep = falling - rising >= min_plateau
+    rising, falling = rising[keep], falling[keep]
+
+    if rising.size == 0:
+        return []
+
+    # Srednje vrijednosti na platou: direktna suma po segmentu [rising, falling)
+    # (bez razlike kumulativnih suma, čija greška raste sa dužinom snimka)
+    bounds = np.c_[rising, falling].ravel()
+    length = falling - rising
+    mean_ratio = np.add.reduceat(comparison_ratio, bounds)[::2] / length
+    power = np.add.reduceat(rx_input.real**2 + rx_input.imag**2, bounds)[::2] / length
+
+    return [
+        {
+            "rising_edge": int(r),
+            "falling_edge": int(f),
+            "plateau_length": int(f - r),
+            "mean_ratio": float(m),
+            "power": float(p),
+        }
+        for r, f, m, p in zip(rising, falling, mean_ratio, power)
+    ]
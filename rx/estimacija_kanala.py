@@ -1,10 +1,195 @@
 import numpy as np
 import sys
 import os
+from functools import lru_cache
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-from tx.long_sequence import get_long_training_sequence
+from tx.long_sequence import get_lts_reference_fft
 
-def channel_estimate_and_equalizer(signal,lts_start):
+#Korišteni podnosači (FFT binovi) LTS-a: +1..+26 i -26..-1
+USED_TONES = np.r_[1:27, 38:64]
+USED_TONES.setflags(write=False)
+#Najveća dužina kanala koju pokriva CP (u uzorcima na 20 MHz)
+CP_LENGTH = 16
+#Tapovi prije nultog koji pokrivaju grešku vremenske sinhronizacije (LTS
+#korelator se može zaključati na jači, kasniji put)
+TIMING_MARGIN = 2
+#Apriorni delay spread za MMSE (kao default u ChannelSettings)
+DEFAULT_DELAY_SPREAD = 150e-9
+
+
+@lru_cache(maxsize=1)
+def ideal_lts_tones():
+    """Idealni LTS tonovi na USED_TONES (52,), keširani i samo za čitanje."""
+    tones = get_lts_reference_fft()[USED_TONES]
+    tones.setflags(write=False)
+    return tones
+
+
+@lru_cache(maxsize=32)
+def _tone_matrix(num_taps, precursor=TIMING_MARGIN):
+    """DFT matrica (52, precursor + num_taps): odziv tapova sa kašnjenjima -precursor..num_taps-1."""
+    delays = np.arange(-precursor, num_taps)
+    return np.exp(-2j * np.pi * np.outer(USED_TONES, delays) / 64)
+
+
+@lru_cache(maxsize=32)
+def dft_projection(num_taps=CP_LENGTH, precursor=TIMING_MARGIN):
+    """
+    Matrica DFT (vremenski prozor) poravnanja LS procjene, keširana.
+
+    LS procjena na 52 tona se projektuje na prostor kanala sa tapovima
+    -precursor..num_taps-1: P = F pinv(F). Za razliku od IFFT -> prozor ->
+    FFT sa nulama na nekorištenim podnosačima, projekcija nema curenja na
+    rubnim tonovima. Šum se smanjuje ~52/(num_taps + precursor) puta.
+
+    Povratna vrijednost
+    P : np.ndarray (52, 52), samo za čitanje
+    """
+    F = _tone_matrix(num_taps, precursor)
+    P = F @ np.linalg.pinv(F)
+    P.setflags(write=False)
+    return P
+
+
+@lru_cache(maxsize=32)
+def mmse_prior(delay_spread=DEFAULT_DELAY_SPREAD, sample_rate=20e6, precursor=TIMING_MARGIN):
+    """
+    Svojstvene vrijednosti i vektori apriorne korelacije kanala po tonovima, keširano.
+
+    Profil snage tapova je eksponencijalan kao u channel.Multipath
+    (exp(-n*Ts/delay_spread)), odsječen na CP_LENGTH tapova ili kada padne
+    ispod 1e-3, uz 'precursor' tapova ispred (snage kao prvi tap) zbog
+    greške vremenske sinhronizacije. R = F diag(p) F^H, normalizovano na
+    srednju snagu 1 po tonu.
+
+    Povratna vrijednost
+    lam : np.ndarray (52,)
+        Svojstvene vrijednosti R (nenegativne)
+    U : np.ndarray (52, 52)
+        Ortonormirani svojstveni vektori (kolone)
+    """
+    if delay_spread > 0:
+        num_taps = int(min(CP_LENGTH, np.ceil(delay_spread * sample_rate * np.log(1e3)) + 1))
+    else:
+        num_taps = 1
+    delays = np.arange(-precursor, num_taps)
+    pdp = np.exp(-np.maximum(delays, 0) / (delay_spread * sample_rate)) if delay_spread > 0 else np.ones(len(delays))
+    pdp = pdp / np.sum(pdp)
+
+    F = _tone_matrix(num_taps, precursor)
+    R = (F * pdp) @ F.conj().T
+    lam, U = np.linalg.eigh(R)
+    lam = np.maximum(lam, 0)
+    lam.setflags(write=False)
+    U.setflags(write=False)
+    return lam, U
+
+
+def ls_estimate(lts_symbols):
+    """
+    LS procjena kanala i varijanse šuma iz dva LTS simbola (vektorizovano).
+
+    H = (Y1 + Y2) / 2 / X po tonu; razlika simbola (Y1 - Y2) / 2 / X sadrži
+    samo šum iste varijanse, pa je noise_var njena srednja snaga po tonovima.
+
+    Parametri
+    lts_symbols : np.ndarray (..., 128)
+        Dva uzastopna LTS simbola (bez CP-a) za svaki paket
+
+    Povratne vrijednosti
+    H_ls : np.ndarray (..., 52)
+        Procjena na USED_TONES
+    noise_var : np.ndarray (...)
+        Procjena varijanse šuma LS procjene po tonu
+    """
+    lts_symbols = np.asarray(lts_symbols)
+    spectra = np.fft.fft(lts_symbols.reshape(lts_symbols.shape[:-1] + (2, 64)), axis=-1) / 64
+    tones = spectra[..., USED_TONES]
+    X = ideal_lts_tones()
+    H_ls = 0.5 * (tones[..., 0, :] + tones[..., 1, :]) / X
+    diff = 0.5 * (tones[..., 0, :] - tones[..., 1, :]) / X
+    noise_var = np.mean(diff.real**2 + diff.imag**2, axis=-1)
+    return H_ls, noise_var
+
+
+def dft_estimate(H_ls, noise_var=None, num_taps=CP_LENGTH):
+    """DFT poravnanje LS procjene (vidi dft_projection); noise_var se ne koristi."""
+    return H_ls @ dft_projection(num_taps).T
+
+
+def mmse_estimate(H_ls, noise_var, delay_spread=DEFAULT_DELAY_SPREAD, sample_rate=20e6):
+    """
+    MMSE procjena H = R (R + noise_var*I)^-1 H_ls, vektorizovano po paketima.
+
+    R je apriorna korelacija iz mmse_prior skalirana procijenjenom snagom
+    kanala po paketu (mean|H_ls|^2 - noise_var). Preko svojstvene
+    dekompozicije R = U diag(lam) U^H, filter je U diag(g) U^H sa
+    g = s*lam / (s*lam + noise_var), pa nema inverzije matrice po paketu.
+
+    delay_spread može biti i ChannelSettings (koristi se DelaySpread).
+    """
+    delay_spread = getattr(delay_spread, "DelaySpread", delay_spread)
+    lam, U = mmse_prior(delay_spread, sample_rate)
+    noise_var = np.asarray(noise_var)[..., None]
+    power = np.mean(H_ls.real**2 + H_ls.imag**2, axis=-1, keepdims=True)
+    signal = np.maximum(power - noise_var, 1e-3 * power)
+    gains = signal * lam / (signal * lam + noise_var)
+    return ((H_ls @ U.conj()) * gains) @ U.T
+
+
+CHANNEL_ESTIMATORS = {
+    "ls": lambda H_ls, noise_var: H_ls,
+    "dft": dft_estimate,
+    "mmse": mmse_estimate,
+}
+
+
+def estimate_channel(lts_symbols, method="ls", **kwargs):
+    """
+    Procjena kanala i koeficijenti ekvalajzera za jedan ili više paketa.
+
+    Parametri
+    lts_symbols : np.ndarray (..., 128)
+        Dva LTS simbola po paketu (vodeće dimenzije su paketi)
+    method : str ili callable, opcionalno
+        'ls' (default, usrednjena LS procjena), 'dft' (DFT poravnanje),
+        'mmse' (MMSE sa eksponencijalnim profilom kašnjenja) ili funkcija
+        method(H_ls, noise_var) -> H na USED_TONES
+    **kwargs :
+        Dodatni parametri izabrane metode (npr. num_taps za 'dft',
+        delay_spread / sample_rate za 'mmse')
+
+    Povratne vrijednosti
+    channel_estimate : np.ndarray (..., 64)
+    equalizer_coefficients : np.ndarray (..., 64)
+        1 / procjena na korištenim tonovima, nula na ostalim
+
+    Izuzeci
+    ValueError
+        Ako zadnja dimenzija nije 128 ili je metoda nepoznata
+    """
+    lts_symbols = np.asarray(lts_symbols)
+    if lts_symbols.shape[-1] != 128:
+        raise ValueError("Potrebna su dva LTS simbola (128 uzoraka po paketu)")
+    if callable(method):
+        estimator = method
+    elif method in CHANNEL_ESTIMATORS:
+        estimator = CHANNEL_ESTIMATORS[method]
+    else:
+        raise ValueError(f"Nepoznata metoda procjene kanala: {method!r}")
+
+    H_ls, noise_var = ls_estimate(lts_symbols)
+    H = estimator(H_ls, noise_var, **kwargs)
+
+    shape = lts_symbols.shape[:-1] + (64,)
+    channel_estimate = np.zeros(shape, dtype=complex)
+    equalizer_coefficients = np.zeros(shape, dtype=complex)
+    channel_estimate[..., USED_TONES] = H
+    equalizer_coefficients[..., USED_TONES] = 1.0 / H
+    return channel_estimate, equalizer_coefficients
+
+
+def channel_estimate_and_equalizer(signal, lts_start, method="ls", **kwargs):
     """
     Procjena kanala i računanje koeficijenata ekvalajzera na osnovu dugih trening simbola (LTS).
 
@@ -12,43 +197,26 @@ def channel_estimate_and_equalizer(signal,lts_start):
     signal : np.ndarray
         Primljeni (RX) signal, oblika (1, N) ili (N,)
     lts_start : int
-        Indeks početka LTS-a 
+        Indeks početka LTS-a
+    method : str ili callable, opcionalno
+        Metoda procjene (vidi estimate_channel); default 'ls'
+    **kwargs :
+        Parametri metode (npr. delay_spread za 'mmse')
 
     Povratne vrijednosti
     channel_estimate : np.ndarray
         Procijenjeni frekvencijski odziv kanala
     equalizer_coefficients : np.ndarray
         Koeficijenti ekvilajzera (1 / procjena kanala)
+
+    Izuzeci
+    ValueError
+        Ako signal nema 128 uzoraka od lts_start
     """
     #1D signal
     signal = np.squeeze(signal)
+    if lts_start < 0 or len(signal) < lts_start + 128:
+        raise ValueError("Signal je prekratak za dva LTS simbola")
 
-    #Izdvajanje dugih trening simbola i njihovo usrednjavanje
-    first_long_symbol = signal[lts_start : lts_start+64]
-    second_long_symbol = signal[lts_start+64 : lts_start+128]
-    averaged_long_training_symbol = (0.5 * first_long_symbol + 0.5 * second_long_symbol)
-
-    #FFT i izdvajanje podnosača (tonova)
-    fft_of_long_training_symbol = 1/64 * np.fft.fft(averaged_long_training_symbol)
-
-    rx_positive_tones = fft_of_long_training_symbol[1:27]
-    rx_negative_tones = fft_of_long_training_symbol[38:64]
-
-    #Idealni tonovi
-    all_tones = get_long_training_sequence()
-    ideal_lts_td = all_tones[32 + 64 : 32 + 128]  # 64 uzorka bez CP (LTS)
-    ideal_lts_fd = 1/64 * np.fft.fft(ideal_lts_td)
-
-    ideal_positive_tones = ideal_lts_fd[1:27]
-    ideal_negative_tones = ideal_lts_fd[38:64]
-
-    channel_est_pos = rx_positive_tones / ideal_positive_tones
-    channel_est_neg = rx_negative_tones / ideal_negative_tones
-    channel_estimate = np.concatenate((np.zeros(1), channel_est_pos, np.zeros(11), channel_est_neg))
-
-    #Estimacija kanala i koeficijenti ekvalajzera
-    equalizer_coeff_pos = 1.0 / channel_est_pos
-    equalizer_coeff_neg = 1.0 / channel_est_neg
-    equalizer_coefficients = np.concatenate((np.zeros(1), equalizer_coeff_pos, np.zeros(11), equalizer_coeff_neg))
-    
-    return channel_estimate, equalizer_coefficients
+    #Oba duga trening simbola; procjena je ista kao za batch paketa
+    return estimate_channel(signal[lts_start:lts_start + 128], method=method, **kwargs)
@@ -1,11 +1,28 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import scipy.signal as sc
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from tx.long_sequence import get_lts_reference_64, get_lts_correlator_taps
 
 
-def long_symbol_correlator(long_training_symbol,rx_waveform, falling_edge_position):
+def correlator_taps(long_training_symbol):
+    """
+    Tapovi korelatora: konjugovani i obrnuti sign-kvantizovani LTS (±1 ± j).
+
+    Referenca se poredi po vrijednosti, pa i kopija standardnog LTS-a (ne
+    samo keširani objekat iz get_lts_reference_64) dobija keširane tapove.
+    """
+    reference = get_lts_reference_64()
+    long_training_symbol = np.asarray(long_training_symbol)
+    if np.array_equal(long_training_symbol, reference):
+        return get_lts_correlator_taps()
+    L = np.sign(np.real(long_training_symbol)) + \
+        1j * np.sign(np.imag(long_training_symbol))
+    return np.conj(L[::-1])
+
+
+def long_symbol_correlator(long_training_symbol,rx_waveform, falling_edge_position, return_trace=True):
     """
     Detektuje poziciju Long Training Symbol (LTS) u primljenom OFDM signalu koristeći
     klizni cross-korelator sa sign-normalizovanom verzijom LTS-a.
@@ -24,6 +41,10 @@ def long_symbol_correlator(long_training_symbol,rx_waveform, falling_edge_positi
     falling_edge_position : int
             Indeks približne početne pozicije paketa (crude timing reference) oko koje
             se traži LTS peak. Omogućava ograničenje pretražnog prozora.
+    return_trace : bool, opcionalno
+            Ako je True (default), računa se i cijeli izlaz korelatora 'output_long'.
+            Ako je False, korelacija se računa samo u pretražnom prozoru, a
+            'output_long' je None.
 
     Povratna vrijednost
     lt_peak_value : complex
@@ -31,38 +52,89 @@ def long_symbol_correlator(long_training_symbol,rx_waveform, falling_edge_positi
     lt_peak_position : int
             Indeks u 'rx_waveform' gde je detektovan peak cross-korelacije, tj. pozicija
             LTS simbola.
-    output_long : ndarray
+    output_long : ndarray ili None
             Niz kompleksnih vrednosti cross-korelacije kroz ceo prijemni signal.
             Može se koristiti za vizualizaciju i dalju analizu.
+
+    Napomene
+    - Pretražni prozor su indeksi falling_edge_position + 55 ... falling_edge_position + 117.
+    - Peak se traži samo u prozoru (64 + 63 uzorka ulaza), a cijeli trag se računa
+      jednim FFT matched filterom samo kada je zatražen.
     """
-    #Normalizovani LTS 
-    L = np.sign(np.real(long_training_symbol)) + \
-        1j * np.sign(np.imag(long_training_symbol))
+    #Normalizovani LTS (za standardnu referencu koriste se keširani tapovi)
+    taps = correlator_taps(long_training_symbol)
 
+    rx_waveform = np.asarray(rx_waveform)
     rx_len = len(rx_waveform)
 
-    output_long = np.zeros(rx_len, dtype=complex)
+    #Search window za LTS (granice isključene kao u originalnom korelatoru)
+    first = max(falling_edge_position + 55, 0)
+    last = min(falling_edge_position + 54 + 64, rx_len)
+
     lt_peak_value = 0 + 0j
     lt_peak_position = 0
 
-    cross_correlator = np.zeros(64, dtype=complex)
+    if first < last:
+        # Ulaz potreban za prozor, sa nulama prije početka signala
+        seg_start = first - 63
+        segment = rx_waveform[max(seg_start, 0):last]
+        if seg_start < 0:
+            segment = np.concatenate((np.zeros(-seg_start, dtype=complex), segment))
 
-    for i in range(rx_len):
+        #Kros-korelacija samo u prozoru: output[i] = sum_k rx[i-k] * taps[k]
+        window_output = np.convolve(segment, taps, mode='valid')
+        peak = int(np.argmax(np.abs(window_output)))
+        if abs(window_output[peak]) > 0:
+            lt_peak_value = complex(window_output[peak])
+            lt_peak_position = first + peak
 
-        # Shift registar
-        cross_correlator[1:] = cross_correlator[:-1]
-        cross_correlator[0] = rx_waveform[i]
+    output_long = None
+    if return_trace:
+        output_long = np.zeros(rx_len, dtype=complex)
+        if rx_len > 0:
+            output_long[:] = sc.oaconvolve(rx_waveform, taps)[:rx_len]
 
-        #Kros-korelacija
-        output = np.dot(cross_correlator, np.conj(L[::-1]))
-        output_long[i] = output
+    return lt_peak_value, lt_peak_position, output_long
 
-        # Search window za LTS
-        if (i > falling_edge_position + 54) and \
-           (i < falling_edge_position + 54 + 64):
 
-            if abs(output) > abs(lt_peak_value):
-                lt_peak_value = output
-                lt_peak_position = i
+def long_symbol_correlator_batch(long_training_symbol, rx_waveforms, falling_edge_positions):
+    """
+    long_symbol_correlator (bez traga) za R snimaka iste dužine odjednom.
 
-    return lt_peak_value, lt_peak_position, output_long
+    Za svaki red se izdvaja 126 uzoraka ulaza potrebnih za pretražni prozor
+    (falling_edge + 55 ... falling_edge + 117), a izlaz korelatora za sve
+    prozore je jedno matrično množenje nad sliding_window_view pogledom.
+
+    Parametri
+    long_training_symbol : array_like
+        Referentni LTS (kao u long_symbol_correlator)
+    rx_waveforms : array_like (R, N)
+    falling_edge_positions : array_like (R,)
+
+    Povratne vrijednosti
+    lt_peak_values : ndarray (R,), kompleksan
+    lt_peak_positions : ndarray (R,), int
+        0 (i vrijednost 0) za red bez nenultog izlaza u prozoru, kao kod
+        long_symbol_correlator
+    """
+    taps = correlator_taps(long_training_symbol)
+
+    rx_waveforms = np.asarray(rx_waveforms)
+    R, N = rx_waveforms.shape
+    edges = np.asarray(falling_edge_positions)
+
+    #Ulaz za prozor (63 pozicije), sa nulama izvan signala
+    index = edges[:, None] + 55 - 63 + np.arange(126)
+    inside = (index >= 0) & (index < N)
+    segment = np.where(inside, rx_waveforms[np.arange(R)[:, None], np.clip(index, 0, max(N - 1, 0))], 0)
+
+    #output[i] = sum_k rx[i-k] * taps[k] za i = edge + 55 + j
+    window_output = np.lib.stride_tricks.sliding_window_view(segment, 64, axis=-1) @ taps[::-1]
+    positions = edges[:, None] + 55 + np.arange(63)
+    magnitude = np.where((positions >= 0) & (positions < N), np.abs(window_output), -1.0)
+
+    peak = np.argmax(magnitude, axis=-1)
+    found = np.take_along_axis(magnitude, peak[:, None], -1)[:, 0] > 0
+    lt_peak_values = np.where(found, np.take_along_axis(window_output, peak[:, None], -1)[:, 0], 0)
+    lt_peak_positions = np.where(found, positions[np.arange(R), peak], 0)
+    return lt_peak_values, lt_peak_positions
@@ -1,36 +1,153 @@
 import numpy as np
 
-def iq_preprocessing(rx_signal, tx_signal, fs):
+from rx.decimation import cascaded_decimate
+
+#AGC: dužina bloka za mjerenje snage (pola STS-a na 20 MHz) i prag iznad
+#nivoa šuma (medijana snage blokova) od kojeg se blok smatra početkom paketa
+AGC_BLOCK = 80
+AGC_THRESHOLD = 4.0
+
+
+def sts_power(rx_signal, block=AGC_BLOCK, threshold=AGC_THRESHOLD):
+    """
+    Procjena snage STS-a prvog paketa iz primljenih uzoraka (AGC mjerenje).
+
+    Signal se dijeli na blokove od 'block' uzoraka i računa se snaga svakog
+    bloka (jedan prolaz, bez |x|^2 međurezultata). Prvi blok čija je snaga
+    veća od 'threshold' puta medijana (nivo šuma) uzima se kao početak
+    paketa, a snaga STS-a je srednja snaga tog i sljedećeg bloka (160
+    uzoraka, dužina STS-a). Ako takvog bloka nema (npr. snimak počinje
+    paketom), vraća se srednja snaga cijelog signala.
+
+    Parametri
+    rx_signal : np.ndarray (L,) ili (..., L)
+        Za više dimenzija svaki red (zadnja osa) je nezavisan snimak
+    block : int, opcionalno
+    threshold : float, opcionalno
+
+    Povratna vrijednost
+    power : float za 1D ulaz, inače np.ndarray oblika rx_signal.shape[:-1]
+    """
+    x = np.asarray(rx_signal)
+    L = x.shape[-1]
+    n = L // block
+    if n == 0:
+        power = (np.sum(x.real**2 + x.imag**2, axis=-1) / L) if L else np.zeros(x.shape[:-1])
+        return float(power) if x.ndim == 1 else power
+
+    blocks = x[..., :n * block].reshape(x.shape[:-1] + (n, block))
+    if np.iscomplexobj(blocks):
+        powers = (np.einsum("...ij,...ij->...i", blocks.real, blocks.real) +
+                  np.einsum("...ij,...ij->...i", blocks.imag, blocks.imag)) / block
+    else:
+        powers = np.einsum("...ij,...ij->...i", blocks, blocks) / block
+
+    strong = powers > threshold * np.median(powers, axis=-1, keepdims=True)
+    first = np.argmax(strong, axis=-1)[..., None]
+    # Srednja snaga prvog jakog i sljedećeg bloka (samo prvog ako je zadnji)
+    second = np.minimum(first + 1, n - 1)
+    p1 = np.take_along_axis(powers, first, -1)[..., 0]
+    p2 = np.take_along_axis(powers, second, -1)[..., 0]
+    pair = np.where(second[..., 0] > first[..., 0], (p1 + p2) / 2, p1)
+    power = np.where(np.any(strong, axis=-1), pair, np.mean(powers, axis=-1))
+    return float(power) if x.ndim == 1 else power
+
+
+def iq_preprocessing(rx_signal, tx_signal=None, fs=40e6, target_power=1.0,
+                     down_factor=2, N=31):
     """
     Priprema IQ signala prije daljnje obrade.
 
     Uključuje:
     - Pretvaranje signala u 1D niz
-    - Normalizaciju snage primljenog signala u odnosu na poslani
-    - Decimaciju signala za faktor 2 (smanjenje frekvencije uzorkovanja)
+    - Decimaciju signala za faktor down_factor (default 2) polifaznim
+      half-band filterom (cascaded_decimate), koji prije odbacivanja uzoraka
+      potiskuje šum i smetnje izvan opsega umjesto da ih preklopi u opseg
+    - Normalizaciju snage decimiranog signala:
+        * bez TX reference (tx_signal=None): AGC - snaga STS-a izmjerena iz
+          primljenih uzoraka (sts_power) svodi se na target_power
+        * sa TX referencom: srednja snaga signala svodi se na snagu tx_signal
+          (ranije ponašanje)
+
+    Ulazni niz se ne mijenja; rezultat je uvijek novi niz.
 
     Parametri
     rx_signal : array-like
         Primljeni (RX) IQ signal
-    tx_signal : array-like
-        Poslani (TX) IQ signal (referenca za normalizaciju)
+    tx_signal : array-like ili None, opcionalno
+        Poslani (TX) IQ signal (referenca za normalizaciju). Default: None (AGC)
     fs : float
         Frekvencija uzorkovanja [Hz]
+    target_power : float, opcionalno
+        Ciljna snaga STS-a za AGC (koristi se samo bez tx_signal)
+    down_factor : int, opcionalno
+        Faktor decimacije. Default je 2 (40 MHz -> 20 MHz)
+    N : int, opcionalno
+        Dužina half-band filtera po stepenu decimacije. Default je 31;
+        N=1 daje decimaciju bez filtera (rx_signal[::down_factor])
 
     Povratne vrijednosti
     rx_signal : np.ndarray
         Predobrađeni primljeni IQ signal
     fs : float
         Nova (smanjena) frekvencija uzorkovanja
+
+    Napomene
+    - Decimacija se radi prva, pa se snaga mjeri nad upola manje uzoraka.
+      Računaju se samo zadržani uzorci, a filter je centriran, pa je
+      vremenska osa ista kao kod rx_signal[::2] (dužina ceil(L/2)).
+    - Sa TX referencom i nultom snagom primljenog signala izlaz je NaN
+      (uz RuntimeWarning), kao i ranije.
     """
-    rx_signal = np.asarray(rx_signal).flatten()
+    # polifazna decimacija (novi niz, ulaz se ne mijenja)
+    rx_signal = cascaded_decimate(np.ravel(rx_signal), down_factor, N)
+    fs = fs / down_factor
 
     # normalizacija
-    rx_signal *= np.sqrt(np.mean(np.abs(tx_signal)**2)) / \
-                 np.sqrt(np.mean(np.abs(rx_signal)**2))
+    if tx_signal is not None:
+        tx_signal = np.ravel(tx_signal)
+        tx_power = np.vdot(tx_signal, tx_signal).real / len(tx_signal)
+        rx_power = np.vdot(rx_signal, rx_signal).real / len(rx_signal)
+        scale = np.sqrt(tx_power) / np.sqrt(rx_power)
+    else:
+        power = sts_power(rx_signal)
+        scale = np.sqrt(target_power / power) if power > 0 else 1.0
+
+    return rx_signal * scale, fs
+
+
+def iq_preprocessing_batch(rx_signals, tx_signal=None, fs=40e6, target_power=1.0,
+                           down_factor=2, N=31):
+    """
+    iq_preprocessing za R snimaka iste dužine odjednom.
+
+    Decimacija (cascaded_decimate) i normalizacija snage rade se po zadnjoj
+    osi, nezavisno za svaki red; rezultat reda je isti kao iq_preprocessing
+    nad tim redom.
+
+    Parametri
+    rx_signals : array-like (R, L)
+        Primljeni snimci
+    tx_signal : array-like (Ltx,), (R, Ltx) ili None, opcionalno
+        TX referenca (zajednička ili po snimku); None = AGC po snazi STS-a
+    fs, target_power, down_factor, N :
+        Kao u iq_preprocessing
+
+    Povratne vrijednosti
+    rx_signals : np.ndarray (R, ceil(L / down_factor))
+    fs : float
+    """
+    rx_signals = cascaded_decimate(np.asarray(rx_signals), down_factor, N)
+    fs = fs / down_factor
 
-    # decimacija ×2
-    rx_signal = rx_signal[::2]
-    fs = fs / 2
+    if tx_signal is not None:
+        tx_signal = np.asarray(tx_signal)
+        tx_power = np.sum(tx_signal.real**2 + tx_signal.imag**2, axis=-1) / tx_signal.shape[-1]
+        rx_power = np.sum(rx_signals.real**2 + rx_signals.imag**2, axis=-1) / rx_signals.shape[-1]
+        scale = np.sqrt(tx_power) / np.sqrt(rx_power)
+    else:
+        power = sts_power(rx_signals)
+        with np.errstate(divide="ignore"):
+            scale = np.where(power > 0, np.sqrt(target_power / np.where(power > 0, power, 1)), 1.0)
 
-    return rx_signal, fs
+    return rx_signals * np.asarray(scale)[..., None], fs
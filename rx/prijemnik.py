@@ -1,54 +1,124 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
-from rx.pretprocessing import iq_preprocessing
-from rx.detection import packet_detector
-from rx.cfo import detect_frequency_offsets
-from rx.long_symbol_correlator import long_symbol_correlator
-from rx.estimacija_kanala import channel_estimate_and_equalizer
-from rx.PhaseCorrection_80211a import phase_correction_80211a
+from rx.pretprocessing import iq_preprocessing, iq_preprocessing_batch
+from rx.detection import packet_detector, packet_detector_batch, find_packets
+from rx.cfo import detect_frequency_offsets, detect_frequency_offsets_batch
+from rx.long_symbol_correlator import long_symbol_correlator, long_symbol_correlator_batch
+from rx.estimacija_kanala import channel_estimate_and_equalizer, estimate_channel
+from rx.PhaseCorrection_80211a import phase_correction_80211a, pilot_weights, correct_equalized_symbols
 
-from tx.long_sequence import get_long_training_sequence
+from tx.long_sequence import get_lts_reference_64
+from channel.impairments import apply_cfo
 
 
 def apply_cfo_correction(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(-1j * 2 * np.pi * cfo_hz * n / fs)
+    # Uklanja procijenjeni CFO: rotacija za -cfo_hz (channel.impairments.apply_cfo).
+    # x (..., L); cfo_hz skalar ili niz oblika x.shape[:-1] (po paketu).
+    return apply_cfo(x, -np.asarray(cfo_hz, dtype=float), fs)
+
+
+#Faze koje decode_packet mjeri kada je zadan timings (run_rx dodaje i
+#iq_preprocessing), redom izvršavanja
+DECODE_STAGES = (
+    "packet_detector",
+    "cfo_coarse",
+    "cfo_coarse_correction",
+    "long_symbol_correlator",
+    "cfo_fine",
+    "cfo_fine_correction",
+    "channel_estimate_and_equalizer",
+    "phase_correction_80211a",
+)
+
+
+def _timed(timings, name, fn, /, *args, **kwargs):
+    # Poziva fn; ako je timings dict, dodaje trajanje poziva u timings[name]
+    if timings is None:
+        return fn(*args, **kwargs)
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    timings.setdefault(name, []).append(time.perf_counter() - t0)
+    return result
 
 
 def get_lts_64_reference():
-    lts_all = get_long_training_sequence(step=1)  # CP32 + 2*64
-    return lts_all[32:32+64]  # 64 uzorka bez CP
+    return get_lts_reference_64()  # 64 uzorka bez CP, keširano
 
 
-def run_rx(rx_40mhz, tx_40mhz, num_symbols_req=None, fs_in=40e6, plot=False):
-    # 1) IQ preprocessing (40->20)
-    rx, fs = iq_preprocessing(rx_40mhz, tx_40mhz, fs=fs_in)
+def run_rx(rx_40mhz, tx_40mhz=None, num_symbols_req=None, fs_in=40e6, plot=False,
+           channel_method="ls", timings=None):
+    # 1) IQ preprocessing (40->20); bez tx_40mhz normalizacija je AGC po snazi STS-a
+    # timings: opcionalni dict u koji se dodaju trajanja faza (vidi decode_packet)
+    rx, fs = _timed(timings, "iq_preprocessing", iq_preprocessing, rx_40mhz, tx_40mhz, fs=fs_in)
+    return decode_packet(rx, fs, num_symbols_req=num_symbols_req, plot=plot,
+                         channel_method=channel_method, timings=timings)
+
 
+def decode_packet(rx, fs, num_symbols_req=None, falling_edge=None, plot=False,
+                  channel_method="ls", timings=None):
+    """
+    Dekodira jedan paket iz već predobrađenog (20 MHz) signala.
+
+    Koraci 2-8 iz run_rx: detekcija (ako falling_edge nije zadan), grubi i
+    fini CFO, LTS korelacija, procjena kanala i korekcija faze. Koristi ga
+    i StreamingReceiver, koji sam bira falling edge u svom baferu.
+
+    Parametri
+    rx : np.ndarray
+        Signal nakon iq_preprocessing
+    fs : float
+        Frekvencija uzorkovanja signala rx [Hz]
+    num_symbols_req : int ili None, opcionalno
+        Traženi broj payload simbola (None = koliko stane u rx)
+    falling_edge : int ili None, opcionalno
+        Padajuća ivica STS-a; ako je None, traži se packet_detector-om
+    plot : bool, opcionalno
+    channel_method : str ili callable, opcionalno
+        Metoda procjene kanala ('ls', 'dft', 'mmse'; vidi estimate_channel)
+    timings : dict ili None, opcionalno
+        Ako je zadan, trajanje svakog poziva faze (u sekundama) dodaje se u
+        listu timings[faza]; imena faza su u DECODE_STAGES
+
+    Povratna vrijednost
+    dict (isti ključevi kao run_rx)
+
+    Izuzeci
+    RuntimeError
+        Ako detektor ne nađe padajuću ivicu STS-a
+    """
     # 2) Packet detection (STS)
-    _, _, falling_edge, _ = packet_detector(rx)
+    if falling_edge is None:
+        _, _, falling_edge, _ = _timed(timings, "packet_detector", packet_detector, rx)
     if falling_edge is None:
         raise RuntimeError("Packet detector nije našao falling edge (STS).")
 
     # 3) Coarse CFO (STS) + korekcija
-    cfo_coarse = float(detect_frequency_offsets(rx, falling_edge, plot=False, fs=fs)[0])
-    rx_cfo1 = apply_cfo_correction(rx, cfo_coarse, fs)
+    cfo_coarse = float(_timed(timings, "cfo_coarse", detect_frequency_offsets,
+                              rx, falling_edge, plot=False, fs=fs)[0])
+    rx_cfo1 = _timed(timings, "cfo_coarse_correction", apply_cfo_correction, rx, cfo_coarse, fs)
 
     # 4) LTS korelacija -> lts_start
     lts_ref_64 = get_lts_64_reference()
-    _, lt_peak_pos, _ = long_symbol_correlator(lts_ref_64, rx_cfo1, falling_edge)
+    _, lt_peak_pos, _ = _timed(timings, "long_symbol_correlator", long_symbol_correlator,
+                               lts_ref_64, rx_cfo1, falling_edge, return_trace=False)
 
     lts_start = int(lt_peak_pos - 63)
     if lts_start < 0:
         lts_start = 0
 
     # 5) Fine CFO (LTS) + korekcija
-    cfo_fine = float(detect_frequency_offsets(rx_cfo1, lts_start, plot=plot, fs=fs)[1])
+    cfo_fine = float(_timed(timings, "cfo_fine", detect_frequency_offsets,
+                            rx_cfo1, lts_start, plot=plot, fs=fs)[1])
     cfo_fine_res = cfo_fine - cfo_coarse
-    rx_cfo2 = apply_cfo_correction(rx_cfo1, cfo_fine_res, fs)
-    rx_cfo2 = apply_cfo_correction(rx_cfo1, cfo_fine, fs)
+    rx_cfo2 = _timed(timings, "cfo_fine_correction", apply_cfo_correction, rx_cfo1, cfo_fine, fs)
 
     # 6) Kanal + EQ (na 2x64 LTS)
-    channel_est, equalizer_coeffs = channel_estimate_and_equalizer(rx_cfo2, lts_start)
+    channel_est, equalizer_coeffs = _timed(timings, "channel_estimate_and_equalizer",
+                                           channel_estimate_and_equalizer, rx_cfo2, lts_start,
+                                           method=channel_method)
 
     # 7) Koliko payload simbola možemo izvući (80 = 16CP + 64)
     CP = 16
@@ -65,7 +135,8 @@ def run_rx(rx_40mhz, tx_40mhz, num_symbols_req=None, fs_in=40e6, plot=False):
         num_symbols = int(min(num_symbols_req, max_symbols))
 
     # 8) Phase correction (piloti + data indeksi su unutra)
-    corrected_symbols = phase_correction_80211a(
+    corrected_symbols = _timed(
+        timings, "phase_correction_80211a", phase_correction_80211a,
         rx_signal=rx_cfo2,
         num_symbols=num_symbols,
         ltpeak=lts_start,
@@ -89,3 +160,221 @@ def run_rx(rx_40mhz, tx_40mhz, num_symbols_req=None, fs_in=40e6, plot=False):
     "equalizer_coeffs": equalizer_coeffs,
 }
 
+
+#Uzorci (20 MHz) prije padajuće ivice koji ulaze u prozor paketa: cijeli STS
+#(160) sa rezervom za prozore grubog CFO-a
+PACKET_CONTEXT = 320
+#Od padajuće ivice do početka payloada u najgorem slučaju (LTS peak se traži
+#do ivica + 117, pa je lts_start <= ivica + 54)
+LTS_SPAN = 54 + 128
+
+
+def packet_windows(segments, length, num_symbols_req=None):
+    """
+    Granice [start, stop) prozora svakog paketa u 20 MHz signalu dužine length.
+
+    Prozor počinje PACKET_CONTEXT uzoraka prije padajuće ivice, a završava
+    prije rastuće ivice sljedećeg paketa (ili na kraju signala). Ako je broj
+    simbola zadan, prozor se skraćuje na dužinu potrebnu za toliko simbola.
+    """
+    windows = []
+    for i, seg in enumerate(segments):
+        edge = seg["falling_edge"]
+        start = max(edge - PACKET_CONTEXT, 0)
+        stop = segments[i + 1]["rising_edge"] if i + 1 < len(segments) else length
+        if num_symbols_req is not None:
+            # decode_packet broji simbole kao (len - (payload_start + 80)) // 80
+            stop = min(stop, edge + LTS_SPAN + 80 * (int(num_symbols_req) + 1))
+        windows.append((start, max(stop, edge + 1)))
+    return windows
+
+
+def _decode_window(args):
+    """Dekodira jedan prozor (za ProcessPoolExecutor); None ako ne uspije."""
+    window, fs, num_symbols_req, falling_edge, channel_method = args
+    try:
+        return decode_packet(window, fs, num_symbols_req=num_symbols_req, falling_edge=falling_edge,
+                             channel_method=channel_method)
+    except (RuntimeError, ValueError, IndexError):
+        return None
+
+
+def run_rx_multi(rx_40mhz, tx_40mhz=None, num_symbols_req=None, fs_in=40e6, workers=1,
+                 min_plateau=48, channel_method="ls"):
+    """
+    Dekodira sve pakete iz dužeg snimka.
+
+    Nakon iq_preprocessing, find_packets pronalazi sve STS platoe jednim
+    prolazom, a svaki paket se dekodira (decode_packet) u svom prozoru
+    (vidi packet_windows). Sa workers > 1 paketi se dekodiraju na više
+    procesa; redoslijed rezultata je uvijek redoslijed paketa u snimku.
+
+    Parametri
+    rx_40mhz, tx_40mhz, num_symbols_req, fs_in :
+        Kao u run_rx (num_symbols_req važi za svaki paket; tx_40mhz je
+        opcionalan, bez njega iq_preprocessing radi AGC)
+    workers : int, opcionalno
+        Broj procesa za dekodiranje (1 = serijski)
+    min_plateau : int, opcionalno
+        Minimalna dužina STS platoa (vidi find_packets)
+    channel_method : str, opcionalno
+        Metoda procjene kanala (vidi decode_packet)
+
+    Povratna vrijednost
+    packets : list[dict]
+        Za svaki uspješno dekodiran paket dict kao iz run_rx (pozicije
+        relativne na prozor paketa) sa dodatnim ključevima:
+            packet_index : int
+                Redni broj detektovanog paketa u snimku
+            capture_falling_edge, capture_lts_start : int
+                Pozicije u 20 MHz snimku
+            detection : dict
+                Metrike detekcije iz find_packets
+
+    Izuzeci
+    ValueError
+        Ako workers nije pozitivan cijeli broj
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError("workers mora biti pozitivan cijeli broj")
+
+    rx, fs = iq_preprocessing(rx_40mhz, tx_40mhz, fs=fs_in)
+    segments = find_packets(rx, min_plateau=min_plateau)
+    windows = packet_windows(segments, len(rx), num_symbols_req)
+    jobs = [(rx[start:stop], fs, num_symbols_req, seg["falling_edge"] - start, channel_method)
+            for seg, (start, stop) in zip(segments, windows)]
+
+    if workers == 1 or len(jobs) <= 1:
+        results = [_decode_window(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // (4 * workers))
+            results = list(executor.map(_decode_window, jobs, chunksize=chunksize))
+
+    packets = []
+    for index, (seg, (start, _), result) in enumerate(zip(segments, windows, results)):
+        if result is None or len(result["corrected_symbols"]) == 0:
+            continue
+        result["packet_index"] = index
+        result["capture_falling_edge"] = start + result["falling_edge"]
+        result["capture_lts_start"] = start + result["lts_start"]
+        result["detection"] = seg
+        packets.append(result)
+    return packets
+
+
+def run_rx_batch(rx_40mhz, tx_40mhz=None, num_symbols_req=None, fs_in=40e6, channel_method="ls"):
+    """
+    run_rx za R snimaka iste dužine, sa svim koracima vektorizovanim po paketima.
+
+    Koraci su isti kao u run_rx (iq_preprocessing, detekcija zadnje padajuće
+    ivice, grubi CFO, LTS korelacija, fini CFO, procjena kanala, korekcija
+    faze), ali svaki radi nad (R, N) nizom odjednom, pa Monte-Carlo pokušaji
+    jedne tačke ne zahtijevaju R poziva run_rx. Za svaki uspješno dekodiran
+    red rezultat je isti kao run_rx nad tim redom.
+
+    Parametri
+    rx_40mhz : array-like (R, L)
+        Primljeni snimci na fs_in
+    tx_40mhz : array-like (Ltx,), (R, Ltx) ili None, opcionalno
+        TX referenca za normalizaciju snage (None = AGC)
+    num_symbols_req : int ili None, opcionalno
+        Traženi broj payload simbola (None = koliko stane u najduži paket)
+    fs_in : float, opcionalno
+    channel_method : str ili callable, opcionalno
+        Metoda procjene kanala (vidi estimate_channel)
+
+    Povratna vrijednost
+    dict sa istim ključevima kao run_rx, ali sa nizovima po paketu:
+        fs : float
+        decoded : ndarray (R,) bool
+            Ivica je nađena i LTS stane u snimak (run_rx ne baca grešku)
+        falling_edge, lt_peak_pos, lts_start : ndarray (R,) int
+            -1 za redove koji nisu dekodirani
+        cfo_coarse_hz, cfo_fine_hz, cfo_fine_res_hz : ndarray (R,)
+            NaN za redove koji nisu dekodirani
+        max_symbols_in_buffer, num_symbols : ndarray (R,) int
+            num_symbols je broj važećih simbola u corrected_symbols
+        corrected_symbols : ndarray (R, S, 48)
+            S = num_symbols_req (ili najveći num_symbols); simboli iza
+            num_symbols[r] su NaN
+        channel_est, equalizer_coeffs : ndarray (R, 64)
+            NaN za redove koji nisu dekodirani
+
+    Izuzeci
+    ValueError
+        Ako rx_40mhz nije 2D niz
+    """
+    rx_40mhz = np.asarray(rx_40mhz)
+    if rx_40mhz.ndim != 2:
+        raise ValueError("rx_40mhz mora biti 2D niz (R, L)")
+
+    # 1) IQ preprocessing (40->20) po redovima
+    rx, fs = iq_preprocessing_batch(rx_40mhz, tx_40mhz, fs=fs_in)
+    R, N = rx.shape
+    rows = np.arange(R)
+
+    # 2) Detekcija (zadnja padajuća ivica, kao packet_detector)
+    _, _, falling_edge = packet_detector_batch(rx)
+    detected = falling_edge >= 0
+    edge = np.where(detected, falling_edge, 0)
+
+    # 3) Grubi CFO + korekcija
+    cfo_coarse = detect_frequency_offsets_batch(rx, edge, fs=fs)[:, 0]
+    rx_cfo1 = apply_cfo_correction(rx, cfo_coarse, fs)
+
+    # 4) LTS korelacija -> lts_start
+    _, lt_peak_pos = long_symbol_correlator_batch(get_lts_64_reference(), rx_cfo1, edge)
+    lts_start = np.maximum(lt_peak_pos - 63, 0)
+
+    # 5) Fini CFO + korekcija (kao u decode_packet)
+    cfo_fine = detect_frequency_offsets_batch(rx_cfo1, lts_start, fs=fs)[:, 1]
+    rx_cfo2 = apply_cfo_correction(rx_cfo1, cfo_fine, fs)
+
+    # 6) Kanal + EQ samo za redove u kojima LTS stane u snimak
+    decoded = detected & (lts_start + 128 <= N)
+    ok = np.flatnonzero(decoded)
+    channel_est = np.full((R, 64), np.nan, dtype=complex)
+    equalizer_coeffs = np.full((R, 64), np.nan, dtype=complex)
+    lts = rx_cfo2[ok[:, None], lts_start[ok, None] + np.arange(128)]
+    channel_est[ok], equalizer_coeffs[ok] = estimate_channel(lts, method=channel_method)
+
+    # 7) Broj payload simbola (80 = 16CP + 64)
+    CP = 16
+    SYM = 80
+    payload_start = lts_start + 2 * 64
+    max_symbols = np.maximum((N - (payload_start + CP + 64)) // SYM, 0)
+    num_symbols = max_symbols if num_symbols_req is None else np.minimum(int(num_symbols_req), max_symbols)
+    num_symbols = np.where(decoded, num_symbols, 0)
+    S = int(num_symbols_req) if num_symbols_req is not None else int(num_symbols.max(initial=0))
+
+    # 8) Phase correction za sve simbole svih paketa; simboli iza kraja
+    # snimka se računaju nad odsječenim indeksima i zatim maskiraju (korekcija
+    # je kauzalna, pa ne utiču na ranije simbole)
+    corrected_symbols = np.full((R, S, 48), np.nan, dtype=complex)
+    if S > 0 and ok.size:
+        index = payload_start[ok, None, None] + SYM * np.arange(S)[:, None] + CP + np.arange(64)
+        symbols = rx_cfo2[ok[:, None, None], np.minimum(index, N - 1)]
+        equalized = 1/64 * np.fft.fft(symbols, axis=-1) * equalizer_coeffs[ok, None, :]
+        corrected = correct_equalized_symbols(equalized, pilot_weights(channel_est[ok]), L=8)
+        valid = np.arange(S) < num_symbols[ok, None]
+        corrected_symbols[ok] = np.where(valid[..., None], corrected, np.nan)
+
+    def masked(values, fill):
+        return np.where(decoded, values, fill)
+
+    return {
+        "fs": fs,
+        "decoded": decoded,
+        "falling_edge": masked(falling_edge, -1),
+        "lt_peak_pos": masked(lt_peak_pos, -1),
+        "lts_start": masked(lts_start, -1),
+        "cfo_coarse_hz": masked(cfo_coarse, np.nan),
+        "cfo_fine_hz": masked(cfo_fine, np.nan),
+        "cfo_fine_res_hz": masked(cfo_fine - cfo_coarse, np.nan),
+        "max_symbols_in_buffer": masked(max_symbols, 0),
+        "num_symbols": num_symbols,
+        "corrected_symbols": corrected_symbols,
+        "channel_est": channel_est,
+        "equalizer_coeffs": equalizer_coeffs,
+    }
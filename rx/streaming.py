@@ -0,0 +1,166 @@
+import numpy as np
+
+from rx.decimation import StreamingDecimator
+from rx.detection import find_packets
+from rx.prijemnik import decode_packet, PACKET_CONTEXT, LTS_SPAN
+
+#Uzorci (20 MHz) zadržani prije padajuće ivice (cijeli STS sa rezervom)
+STS_CONTEXT = PACKET_CONTEXT
+#Detektor daje kratku lažnu ivicu i na kraju svakog paketa (nagli pad snage);
+#find_packets odbacuje kratke platoe, a ivice bliže od jednog simbola kraju
+#dekodiranog paketa se dodatno ignorišu
+TAIL_GUARD = 80
+CP = 16
+SYM = 80
+
+
+class StreamingReceiver:
+    """
+    Prijemnik za neograničen tok uzoraka koji stižu u blokovima proizvoljne dužine.
+
+    Ulaz na fs_in se decimira ×2 istim polifaznim half-band filterom kao u
+    iq_preprocessing (StreamingDecimator, isti uzorci kao nad cijelim tokom)
+    i dodaje u interni 20 MHz bafer. U baferu se traži prvi STS plato
+    (find_packets); kada stigne dovoljno uzoraka za cijeli paket (num_symbols OFDM
+    simbola), paket se dekodira (decode_packet), vraća/prosljeđuje callbacku,
+    a bafer se skraćuje do kraja paketa. Bez detekcije bafer zadržava samo
+    zadnjih STS_CONTEXT uzoraka.
+
+    Stanje između blokova (stanje decimatora, pozicija u toku, započeti
+    paket i njegova padajuća ivica) čuva objekat. Detektor je kauzalan, pa
+    položaj ivice ne zavisi od granica blokova. Memorija je ograničena na
+    otprilike jedan paket + jedan ulazni blok, bez obzira na dužinu toka.
+
+    Primjer:
+        receiver = StreamingReceiver(num_symbols=30)
+        for chunk in capture_chunks:
+            for packet in receiver.push(chunk):
+                print(packet["stream_lts_start"], len(packet["corrected_symbols"]))
+        receiver.flush()
+    """
+
+    def __init__(self, num_symbols, fs_in=40e6, callback=None):
+        """
+        num_symbols: broj payload OFDM simbola po paketu (pozitivan cijeli broj)
+        fs_in: frekvencija uzorkovanja ulaznog toka [Hz]
+        callback: opcionalna funkcija callback(packet) pozvana za svaki paket
+        """
+        if not isinstance(num_symbols, (int, np.integer)) or num_symbols < 1:
+            raise ValueError("num_symbols mora biti pozitivan cijeli broj")
+        if fs_in <= 0:
+            raise ValueError("fs_in mora biti veći od 0")
+        self.num_symbols = int(num_symbols)
+        self.fs = fs_in / 2
+        self.callback = callback
+        self.packets_decoded = 0
+        self._buffer = np.zeros(0, dtype=complex)
+        self._offset = 0          # indeks (20 MHz) prvog uzorka bafera u toku
+        self._decimator = StreamingDecimator(2)
+        self._pending_edge = None  # padajuća ivica paketa koji čeka uzorke
+        self._min_edge = 0        # ivice prije ovog indeksa bafera se ignorišu
+
+    @property
+    def packet_span(self):
+        """Broj uzoraka (20 MHz) od padajuće ivice potreban za cijeli paket."""
+        # decode_packet broji simbole kao (len - (payload_start + CP + 64)) // SYM
+        return LTS_SPAN + CP + 64 + SYM * self.num_symbols
+
+    @property
+    def buffered_samples(self):
+        """Trenutna dužina internog bafera (20 MHz uzorci)."""
+        return len(self._buffer)
+
+    def push(self, chunk):
+        """
+        Dodaje blok ulaznih uzoraka i vraća listu paketa dekodiranih u njemu.
+
+        Svaki paket je dict kao iz run_rx (pozicije relativne na prozor
+        dekodiranja) sa dodatnim ključevima:
+            stream_falling_edge, stream_lts_start : int
+                Pozicije u toku (20 MHz uzorci od početka toka)
+            packet_index : int
+                Redni broj paketa u toku
+        """
+        chunk = np.asarray(chunk)
+        if chunk.ndim != 1:
+            raise ValueError("chunk mora biti 1-D niz")
+
+        # Decimator čuva svoje stanje, pa izlaz ne zavisi od granica blokova
+        decimated = self._decimator.process(chunk)
+        self._buffer = np.concatenate((self._buffer, decimated))
+        return self._scan(final=False)
+
+    def flush(self):
+        """
+        Kraj toka: dekodira započeti paket sa uzorcima koji su stigli (ako
+        sadrži bar jedan cijeli simbol) i prazni bafer.
+        """
+        self._buffer = np.concatenate((self._buffer, self._decimator.flush()))
+        packets = self._scan(final=True)
+        self._decimator = StreamingDecimator(2)
+        self._offset += len(self._buffer)
+        self._buffer = self._buffer[:0]
+        self._pending_edge = None
+        self._min_edge = 0
+        return packets
+
+    def run(self, chunks):
+        """Generator: prolazi kroz iterable blokova i daje pakete redom."""
+        for chunk in chunks:
+            yield from self.push(chunk)
+        yield from self.flush()
+
+    def _drop(self, count):
+        """Odbacuje prvih count uzoraka bafera (count <= 0 ne radi ništa)."""
+        count = min(count, len(self._buffer))
+        if count <= 0:
+            return
+        self._buffer = self._buffer[count:]
+        self._offset += count
+        self._min_edge = max(self._min_edge - count, 0)
+        if self._pending_edge is not None:
+            self._pending_edge -= count
+
+    def _scan(self, final):
+        packets = []
+        while True:
+            if self._pending_edge is None:
+                edges = np.array([seg["falling_edge"] for seg in find_packets(self._buffer)], dtype=int)
+                edges = edges[edges >= self._min_edge]
+                if edges.size == 0:
+                    if not final:
+                        self._drop(len(self._buffer) - STS_CONTEXT)
+                    return packets
+                self._pending_edge = int(edges[0])
+                # Zadržava se samo STS prije ivice
+                self._drop(self._pending_edge - STS_CONTEXT)
+
+            edge = self._pending_edge
+            end = edge + self.packet_span
+            if len(self._buffer) < end and not final:
+                return packets
+
+            try:
+                result = decode_packet(self._buffer[:end], self.fs,
+                                       num_symbols_req=self.num_symbols, falling_edge=edge)
+            except (RuntimeError, ValueError, IndexError):
+                result = None
+
+            if result is None or len(result["corrected_symbols"]) == 0:
+                # Lažna ivica ili nepotpun paket na kraju toka: nastavlja se iza nje
+                self._pending_edge = None
+                self._drop(edge + 1)
+                continue
+
+            result["stream_falling_edge"] = self._offset + edge
+            result["stream_lts_start"] = self._offset + result["lts_start"]
+            result["packet_index"] = self.packets_decoded
+            self.packets_decoded += 1
+            packets.append(result)
+            if self.callback is not None:
+                self.callback(result)
+
+            self._pending_edge = None
+            payload_end = result["lts_start"] + 2 * 64 + SYM * len(result["corrected_symbols"])
+            self._min_edge = payload_end + TAIL_GUARD
+            self._drop(payload_end - STS_CONTEXT)
@@ -0,0 +1,466 @@
+"""
+Monte-Carlo simulacija BER/EVM/detekcije paketa za 802.11a lanac.
+
+Za svaku tačku mreže parametara (SNR, modulacija, delay spread, CFO, dužina
+paketa, Doppler) pokušaji (TX -> kanal -> CFO -> run_rx) se izvršavaju u grupama
+(batch), a prijemnik obrađuje cijelu grupu jednim pozivom run_rx_batch.
+Nakon svake grupe računaju se intervali povjerenja i simulacija tačke se
+prekida čim je tražena preciznost postignuta (ili je dostignut maksimalan
+broj pokušaja).
+
+Pokušaji su nezavisni, pa se grupa može raspodijeliti na više procesa
+(workers > 1). Svaki pokušaj ima svoje sjeme izvedeno iz (seed, tačka,
+pokušaj), a rezultati se skupljaju redoslijedom pokušaja, tako da je
+paralelno izvršavanje identično serijskom.
+
+Primjer:
+    grid = parameter_grid(snr_db=[5, 10, 15], bits_per_symbol=[2, 4])
+    results = run_simulation(grid, max_trials=500, rel_precision=0.1, workers=4)
+"""
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.stats import norm
+
+from tx.OFDM_TX_802_11 import Transmitter80211a
+from channel.Channel_Model import Channel_Model
+from channel.channel_settings import ChannelSettings
+from channel.channel_mode import ChannelMode
+from channel.impairments import apply_cfo
+from rx.prijemnik import run_rx, run_rx_batch
+from rx.demapper import Demapper_OFDM
+
+#Podrazumijevane vrijednosti parametara jedne tačke mreže
+DEFAULT_POINT = {
+    "snr_db": 20.0,
+    "bits_per_symbol": 2,
+    "delay_spread": 0.0,
+    "cfo_hz": 0.0,
+    "num_symbols": 10,
+    "doppler_hz": 0.0,
+}
+
+
+def parameter_grid(**axes):
+    """
+    Kartezijev proizvod vrijednosti parametara.
+
+    Parametri
+    **axes : iterable
+        Vrijednosti za bilo koji od ključeva DEFAULT_POINT (snr_db,
+        bits_per_symbol, delay_spread, cfo_hz, num_symbols, doppler_hz). Parametri
+        koji nisu navedeni uzimaju podrazumijevanu vrijednost.
+
+    Povratna vrijednost
+    list[dict]
+        Jedna tačka (dict sa svim ključevima DEFAULT_POINT) po kombinaciji.
+
+    Izuzeci
+    ValueError
+        Ako je naveden nepoznat parametar.
+    """
+    unknown = set(axes) - set(DEFAULT_POINT)
+    if unknown:
+        raise ValueError(f"Nepoznati parametri mreže: {sorted(unknown)}")
+    keys = list(DEFAULT_POINT)
+    values = [list(np.atleast_1d(axes.get(k, DEFAULT_POINT[k]))) for k in keys]
+    return [
+        {k: (v.item() if isinstance(v, np.generic) else v) for k, v in zip(keys, combo)}
+        for combo in itertools.product(*values)
+    ]
+
+
+def trial_seed(seed, point_index, trial):
+    """
+    Sjeme jednog pokušaja, izvedeno iz (seed, tačka, pokušaj) preko SeedSequence.
+
+    Ne zavisi od veličine grupe ni redoslijeda izvršavanja, pa su rezultati
+    ponovljivi bez obzira na raspored pokušaja.
+    """
+    return int(np.random.SeedSequence([seed, point_index, trial]).generate_state(1)[0])
+
+
+def _trial_signals(point, seed, up_factor=2):
+    """TX okvir, poslani simboli i primljeni signal (kanal + CFO) jednog pokušaja."""
+    fs = 20e6 * up_factor
+    bps = int(point["bits_per_symbol"])
+    num_symbols = int(point["num_symbols"])
+    delay_spread = float(point["delay_spread"])
+    doppler_hz = float(point.get("doppler_hz", 0.0))
+
+    tx_seq, channel_seq = np.random.SeedSequence(seed).spawn(2)
+    tx = Transmitter80211a(num_ofdm_symbols=num_symbols, bits_per_symbol=bps,
+                           up_factor=up_factor, seed=np.random.default_rng(tx_seq), plot=False)
+    tx_signal, tx_symbols = tx.generate_frame()
+
+    # Uz Doppler i bez delay spreada kanal je jedan (ravni) fading tap
+    doppler = 1 if doppler_hz > 0 else 0
+    multipath = 1 if delay_spread > 0 or doppler else 0
+    taps = max(1, int(math.ceil(5 * delay_spread * fs)) + 1)
+    settings = ChannelSettings(sample_rate=fs, number_of_taps=taps, delay_spread=delay_spread,
+                               snr_db=point["snr_db"], max_doppler=doppler_hz)
+    channel = Channel_Model(settings, ChannelMode(multipath=multipath, thermal_noise=1,
+                                                  doppler=doppler))
+    rx_signal, _ = channel.apply(tx_signal, sd=np.random.default_rng(channel_seq))
+    rx_signal = apply_cfo(np.ravel(rx_signal), point["cfo_hz"], fs)
+    return np.ravel(tx_signal), tx_symbols, rx_signal
+
+
+def _score(rx_symbols, tx_symbols, bps):
+    """Greške bita i snaga greške za simbole koje je prijemnik vratio."""
+    tx_symbols = tx_symbols[:len(rx_symbols)]
+
+    #Kao u test_e2e/evm.py: podnosioci koje ekvilajzer ne obrađuje (nula) se ne broje
+    mask = np.abs(rx_symbols) > 1e-6
+    rx_symbols = rx_symbols[mask]
+    tx_symbols = tx_symbols[mask]
+
+    tx_bits = Demapper_OFDM(tx_symbols, bps)
+    rx_bits = Demapper_OFDM(rx_symbols, bps)
+    return {
+        "detected": True,
+        "bit_errors": int(np.count_nonzero(rx_bits != tx_bits)),
+        "num_bits": int(len(tx_bits)),
+        "error_power": float(np.sum(np.abs(tx_symbols - rx_symbols)**2)),
+        "num_symbols": int(len(rx_symbols)),
+    }
+
+
+FAILED_TRIAL = {"detected": False, "bit_errors": 0, "num_bits": 0, "error_power": 0.0, "num_symbols": 0}
+
+
+def run_trial(point, seed, up_factor=2):
+    """
+    Jedan Monte-Carlo pokušaj: TX -> kanal -> CFO -> run_rx -> demapiranje.
+
+    Parametri
+    point : dict
+        Tačka mreže (vidi parameter_grid)
+    seed : int
+        Sjeme pokušaja; iz njega se preko SeedSequence.spawn izvode nezavisni
+        generatori za bite i za kanal (tapovi i šum)
+    up_factor : int, opcionalno
+        Faktor upsamplovanja predajnika
+
+    Povratna vrijednost
+    dict
+        detected : bool
+            Da li je paket detektovan (run_rx nije bacio grešku)
+        bit_errors, num_bits : int
+            Greške i broj poređenih bita; 0 ako paket nije detektovan
+        error_power, num_symbols : float, int
+            Suma |tx - rx|^2 po data podnosiocima i njihov broj (za EVM)
+
+    Napomene
+    Porede se samo simboli koje run_rx vrati, bez podnosioca na kojima je
+    izlaz nula (isto kao u test_e2e i examples/Prijemnik_demo/evm.py).
+    """
+    tx_signal, tx_symbols, rx_signal = _trial_signals(point, seed, up_factor)
+    try:
+        res = run_rx(rx_signal, tx_signal, num_symbols_req=int(point["num_symbols"]),
+                     fs_in=20e6 * up_factor)
+    except RuntimeError:
+        return dict(FAILED_TRIAL)
+
+    corrected = res["corrected_symbols"]
+    rx_symbols = np.concatenate(corrected) if len(corrected) else np.zeros(0, dtype=complex)
+    return _score(rx_symbols, tx_symbols, int(point["bits_per_symbol"]))
+
+
+def run_trials_batch(point, seeds, up_factor=2):
+    """
+    Pokušaji za zadana sjemena sa jednim pozivom run_rx_batch.
+
+    Signali svih pokušaja tačke imaju istu dužinu, pa se slažu u (R, L)
+    niz i dekodiraju vektorski; svaki red daje isti rezultat kao run_trial
+    sa tim sjemenom (do na zaokruživanje).
+    """
+    trials = [_trial_signals(point, sd, up_factor) for sd in seeds]
+    if len({len(rx) for _, _, rx in trials}) > 1:
+        return [run_trial(point, sd, up_factor) for sd in seeds]
+
+    res = run_rx_batch(np.stack([rx for _, _, rx in trials]), np.stack([tx for tx, _, _ in trials]),
+                       num_symbols_req=int(point["num_symbols"]), fs_in=20e6 * up_factor)
+    bps = int(point["bits_per_symbol"])
+    results = []
+    for r, (_, tx_symbols, _) in enumerate(trials):
+        if not res["decoded"][r]:
+            results.append(dict(FAILED_TRIAL))
+            continue
+        rx_symbols = res["corrected_symbols"][r, :res["num_symbols"][r]].reshape(-1)
+        results.append(_score(rx_symbols, tx_symbols, bps))
+    return results
+
+
+def _run_chunk(point, seeds):
+    """
+    Niz pokušaja u jednom procesu (jedan zadatak za ProcessPoolExecutor).
+
+    I jedan pokušaj ide kroz run_trials_batch: run_rx i run_rx_batch se
+    razlikuju na nivou zaokruživanja, a vektorske operacije po redu ne zavise
+    od broja redova, pa rezultat ne zavisi od podjele pokušaja na zadatke.
+    """
+    if not seeds:
+        return []
+    return run_trials_batch(point, seeds)
+
+
+def run_trials(point, seeds, executor=None, chunk_size=None):
+    """
+    Pokušaji za zadana sjemena, serijski ili preko executora.
+
+    Parametri
+    point : dict
+        Tačka mreže
+    seeds : sekvenca int
+        Sjeme svakog pokušaja (vidi trial_seed)
+    executor : concurrent.futures.Executor ili None, opcionalno
+        Ako je None pokušaji se izvršavaju u trenutnom procesu
+    chunk_size : int ili None, opcionalno
+        Broj pokušaja po zadatku; veći blokovi smanjuju trošak slanja
+        (pickling) po pokušaju. Default: svi pokušaji u jednom zadatku.
+
+    Povratna vrijednost
+    list[dict]
+        Rezultati run_trial istim redoslijedom kao seeds
+    """
+    seeds = list(seeds)
+    if executor is None or len(seeds) <= 1:
+        return _run_chunk(point, seeds)
+
+    chunk_size = chunk_size or len(seeds)
+    futures = [
+        executor.submit(_run_chunk, point, seeds[i:i + chunk_size])
+        for i in range(0, len(seeds), chunk_size)
+    ]
+    return [trial for future in futures for trial in future.result()]
+
+
+def wilson_interval(k, n, confidence=0.95):
+    """
+    Wilsonov interval povjerenja za binomnu proporciju k/n.
+
+    Povratna vrijednost
+    (low, high) : tuple[float, float]
+        (0, 1) ako je n == 0
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = norm.ppf(0.5 + confidence / 2)
+    p = k / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2*n)) / denom
+    half = z * math.sqrt(p*(1 - p)/n + z**2 / (4*n**2)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def mean_interval(values, confidence=0.95):
+    """
+    Srednja vrijednost i normalni interval povjerenja (mean +- z*s/sqrt(n)).
+
+    Povratna vrijednost
+    (mean, low, high) : tuple[float, float, float]
+        NaN vrijednosti ako je niz prazan; za jedan element interval je (mean, mean).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return math.nan, math.nan, math.nan
+    mean = float(np.mean(values))
+    if values.size == 1:
+        return mean, mean, mean
+    z = norm.ppf(0.5 + confidence / 2)
+    half = z * float(np.std(values, ddof=1)) / math.sqrt(values.size)
+    return mean, mean - half, mean + half
+
+
+def ber_upper_bound_zero_errors(num_bits, confidence=0.95):
+    """
+    Jednostrana gornja granica BER-a kada u num_bits bita nema nijedne greške.
+
+    Najveći p za koji je vjerovatnoća nula grešaka, (1 - p)^num_bits, još
+    najmanje 1 - confidence (Clopper-Pearson). Za veliki num_bits je
+    ≈ -ln(1 - confidence) / num_bits, tj. "pravilo trojke" 3/num_bits za 95%.
+    """
+    if num_bits <= 0:
+        return 1.0
+    return 1.0 - (1.0 - confidence) ** (1.0 / num_bits)
+
+
+class PointStatistics:
+    """
+    Agregirana statistika pokušaja jedne tačke mreže.
+
+    Atributi:
+    - trials        : broj pokušaja
+    - detected      : broj detektovanih paketa
+    - bit_errors    : ukupan broj pogrešnih bita (samo detektovani paketi)
+    - num_bits      : ukupan broj bita (samo detektovani paketi)
+    - evm_per_trial : EVM (linearno, snaga greške) po detektovanom paketu
+    """
+
+    def __init__(self):
+        self.trials = 0
+        self.detected = 0
+        self.bit_errors = 0
+        self.num_bits = 0
+        self.evm_per_trial = []
+
+    def add(self, trial):
+        """Dodaje rezultat jednog pokušaja (izlaz run_trial)."""
+        self.trials += 1
+        if not trial["detected"]:
+            return
+        self.detected += 1
+        self.bit_errors += trial["bit_errors"]
+        self.num_bits += trial["num_bits"]
+        if trial["num_symbols"] > 0:
+            self.evm_per_trial.append(trial["error_power"] / trial["num_symbols"])
+
+    def converged(self, rel_precision, abs_precision, confidence, ber_floor=0.0):
+        """
+        Da li su intervali povjerenja dovoljno uski.
+
+        - Vjerovatnoća detekcije: poluširina Wilsonovog intervala <= abs_precision.
+        - BER (ako ima detektovanih paketa): poluširina <= rel_precision * BER,
+          ili je gornja granica BER-a ispod ber_floor (tačka je "bez grešaka"
+          na traženom nivou). Bez ijedne greške gornja granica je jednostrana
+          1 - (1 - confidence)^(1/num_bits) ≈ -ln(1 - confidence) / num_bits
+          (≈ 3/num_bits za 95%), pa se za ber_floor=0 takva tačka ne zaustavlja.
+        """
+        low, high = wilson_interval(self.detected, self.trials, confidence)
+        if (high - low) / 2 > abs_precision:
+            return False
+        if self.num_bits == 0:
+            return True
+        if self.bit_errors == 0:
+            return ber_upper_bound_zero_errors(self.num_bits, confidence) < ber_floor
+        low, high = wilson_interval(self.bit_errors, self.num_bits, confidence)
+        if high < ber_floor:
+            return True
+        return (high - low) / 2 <= rel_precision * self.bit_errors / self.num_bits
+
+    def summary(self, confidence=0.95):
+        """
+        Rezultati tačke: detect_rate, ber, evm_db i njihovi intervali povjerenja.
+        """
+        detect_rate = self.detected / self.trials if self.trials else math.nan
+        ber = self.bit_errors / self.num_bits if self.num_bits else math.nan
+        evm, evm_low, evm_high = mean_interval(self.evm_per_trial, confidence)
+
+        def to_db(x):
+            return 10 * math.log10(x) if x > 0 else (-math.inf if x == 0 else math.nan)
+
+        return {
+            "trials": self.trials,
+            "detected": self.detected,
+            "detect_rate": detect_rate,
+            "detect_rate_ci": wilson_interval(self.detected, self.trials, confidence),
+            "bit_errors": self.bit_errors,
+            "num_bits": self.num_bits,
+            "ber": ber,
+            "ber_ci": wilson_interval(self.bit_errors, self.num_bits, confidence) if self.num_bits else (math.nan, math.nan),
+            "evm_db": to_db(evm) if not math.isnan(evm) else math.nan,
+            "evm_db_ci": (to_db(evm_low), to_db(evm_high)) if not math.isnan(evm) else (math.nan, math.nan),
+        }
+
+
+def run_point(point, point_index=0, seed=0, batch_size=20, min_trials=20, max_trials=1000,
+              rel_precision=0.1, abs_precision=0.05, confidence=0.95, ber_floor=1e-4,
+              executor=None, chunk_size=None):
+    """
+    Simulacija jedne tačke mreže uz rano zaustavljanje.
+
+    Parametri
+    point : dict
+        Tačka mreže (vidi parameter_grid)
+    point_index : int, opcionalno
+        Indeks tačke (ulazi u sjeme pokušaja)
+    seed : int, opcionalno
+        Glavno sjeme simulacije
+    batch_size : int, opcionalno
+        Broj pokušaja između dvije provjere konvergencije
+    min_trials, max_trials : int, opcionalno
+        Najmanji i najveći broj pokušaja
+    rel_precision : float, opcionalno
+        Tražena relativna poluširina intervala za BER
+    abs_precision : float, opcionalno
+        Tražena apsolutna poluširina intervala za vjerovatnoću detekcije
+    confidence : float, opcionalno
+        Nivo povjerenja intervala
+    ber_floor : float, opcionalno
+        Najmanji BER koji je bitno razlučiti: tačka se zaustavlja i kada je
+        gornja granica BER-a ispod ove vrijednosti (i kada nema nijedne
+        greške). 0 isključuje ovo pravilo.
+    executor, chunk_size : opcionalno
+        Paralelno izvršavanje grupe (vidi run_trials)
+
+    Povratna vrijednost
+    dict
+        Parametri tačke, summary() statistike i 'stopped_early'
+    """
+    if batch_size <= 0 or max_trials <= 0:
+        raise ValueError("batch_size i max_trials moraju biti pozitivni")
+
+    stats = PointStatistics()
+    stopped_early = False
+    while stats.trials < max_trials:
+        count = min(batch_size, max_trials - stats.trials)
+        seeds = [trial_seed(seed, point_index, t) for t in range(stats.trials, stats.trials + count)]
+        for trial in run_trials(point, seeds, executor, chunk_size):
+            stats.add(trial)
+        if stats.trials >= min_trials and stats.converged(rel_precision, abs_precision, confidence, ber_floor):
+            stopped_early = stats.trials < max_trials
+            break
+
+    result = dict(point)
+    result.update(stats.summary(confidence))
+    result["stopped_early"] = stopped_early
+    return result
+
+
+def run_simulation(grid, seed=0, workers=1, chunk_size=None, **kwargs):
+    """
+    Simulacija cijele mreže parametara.
+
+    Parametri
+    grid : list[dict]
+        Tačke mreže (npr. izlaz parameter_grid)
+    seed : int, opcionalno
+        Glavno sjeme simulacije
+    workers : int, opcionalno
+        Broj procesa; 1 znači serijsko izvršavanje u trenutnom procesu.
+        Rezultat je isti za bilo koji broj procesa.
+    chunk_size : int ili None, opcionalno
+        Broj pokušaja po zadatku; default je grupa (batch_size) podijeljena
+        ravnomjerno na procese
+    **kwargs
+        Proslijeđuje se run_point (batch_size, min_trials, max_trials,
+        rel_precision, abs_precision, confidence, ber_floor)
+
+    Povratna vrijednost
+    list[dict]
+        Rezultat run_point za svaku tačku, istim redoslijedom kao grid
+
+    Izuzeci
+    ValueError
+        Ako workers nije pozitivan cijeli broj
+    """
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("workers mora biti pozitivan cijeli broj")
+
+    def run_all(executor):
+        return [
+            run_point({**DEFAULT_POINT, **point}, point_index=i, seed=seed,
+                      executor=executor, chunk_size=chunk_size, **kwargs)
+            for i, point in enumerate(grid)
+        ]
+
+    if workers == 1:
+        return run_all(None)
+
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(kwargs.get("batch_size", 20) / workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return run_all(executor)
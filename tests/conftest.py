@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from tx.OFDM_TX_802_11 import Transmitter80211a
+
+
+def build_capture(num_frames=1, num_symbols=12, gap=600, lead=777, tail=0, noise_std=1e-3, seed=0):
+    """
+    Snimak (40 MHz) sa num_frames QPSK paketa iz generate_stream, uz slab šum.
+
+    Paketi (TX sjeme 5) su razdvojeni sa 'gap' nula, ispred je 'lead', a iza
+    'tail' nultih uzoraka. Šum standardne devijacije noise_std po I i Q
+    dolazi iz np.random.default_rng(seed); noise_std=0 daje čist snimak.
+
+    Povratna vrijednost
+    capture : np.ndarray
+    frames : list[np.ndarray]
+        Okviri paketa (sa razmakom); frames[0] bez razmaka je generate_frame()
+    symbols : list[np.ndarray]
+        Data simboli svakog paketa
+    """
+    tx = Transmitter80211a(num_ofdm_symbols=num_symbols, bits_per_symbol=2, seed=5, plot=False)
+    frames, symbols = [], []
+    for frame, sym in tx.generate_stream(num_frames=num_frames, gap=gap):
+        frames.append(frame.copy())
+        symbols.append(sym.copy())
+    capture = np.concatenate([np.zeros(lead, dtype=complex)] + frames + [np.zeros(tail, dtype=complex)])
+    if noise_std:
+        rng = np.random.default_rng(seed)
+        capture += noise_std * (rng.standard_normal(len(capture)) + 1j * rng.standard_normal(len(capture)))
+    return capture, frames, symbols
+
+
+@pytest.fixture
+def make_capture():
+    """Fabrika snimaka sa paketima (vidi build_capture)."""
+    return build_capture
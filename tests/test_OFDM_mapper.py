@@ -180,3 +180,36 @@ def test_partial_symbols_64qam():
     bits = np.array([0,0,0,0,0,0, 1,1,1,1,1])
     output = Mapper_OFDM(bits, 6)
     assert len(output) == 1
+
+
+def _referentni_mapper(bits, bps):
+    """Referentno mapiranje simbol po simbol (originalna petlja)."""
+    luts = {
+        1: np.array([-1, 1]),
+        2: np.array([-1, 1]) / np.sqrt(2),
+        4: np.array([-3, -1, 1, 3]) / np.sqrt(10),
+        6: np.array([-7, -5, -3, -1, 1, 3, 5, 7]) / np.sqrt(42),
+    }
+    lut = luts[bps]
+    out = np.zeros(len(bits) // bps, dtype=complex)
+    for i in range(len(out)):
+        bg = bits[i * bps:(i + 1) * bps]
+        if bps == 1:
+            out[i] = lut[bg[0]]
+        else:
+            half = bps // 2
+            I = int("".join(map(str, bg[:half])), 2)
+            Q = int("".join(map(str, bg[half:])), 2)
+            out[i] = lut[I] + 1j * lut[Q]
+    return out
+
+
+@pytest.mark.parametrize("bps", [1, 2, 4, 6])
+def test_vectorized_matches_reference_bytes(bps):
+    """Provjerava da je vektorizovano mapiranje bajt-identično referentnoj petlji."""
+    rng = np.random.default_rng(bps)
+    bits = rng.integers(0, 2, size=48 * bps * 20 + 1)
+    output = Mapper_OFDM(bits, bps)
+    expected = _referentni_mapper(bits, bps)
+    assert output.dtype == expected.dtype
+    assert output.tobytes() == expected.tobytes()
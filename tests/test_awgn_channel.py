@@ -101,4 +101,44 @@ def test_awgn_invalid_input_type(bad_input):
     Pogrešan tip ulaza (nije numpy array) treba izazvati grešku.
     """
     with pytest.raises(Exception):
-        Generate_AWGN(bad_input, 20, 0)
\ No newline at end of file
+        Generate_AWGN(bad_input, 20, 0)
+
+def test_awgn_returns_1d_for_1d_input():
+    """Za 1D ulaz šum je 1D niz istog oblika (bez (1, L) dimenzije)."""
+    x = np.ones(256, dtype=complex)
+    n = Generate_AWGN(x, 20, 0)
+
+    assert n.shape == x.shape
+    assert (x + n).shape == x.shape
+
+
+def test_awgn_complex64_output():
+    """dtype=complex64 daje šum jednostruke preciznosti sa ispravnom snagom."""
+    x = np.ones(50_000, dtype=np.complex64)
+    n = Generate_AWGN(x, 10, 5, dtype=np.complex64)
+
+    assert n.dtype == np.complex64
+    assert np.mean(np.abs(n) ** 2) == pytest.approx(0.1, rel=0.05)
+
+
+def test_awgn_known_signal_power_matches_measured():
+    """Zadana snaga signala jednaka izmjerenoj daje identičan šum."""
+    x = np.random.randn(4096) + 1j * np.random.randn(4096)
+    power = np.mean(np.abs(x) ** 2)
+
+    n_measured = Generate_AWGN(x, 12, sd=8)
+    n_known = Generate_AWGN(x, 12, sd=8, signal_power=power)
+
+    assert np.allclose(n_measured, n_known)
+
+
+def test_awgn_unsupported_dtype():
+    """Nepodržan izlazni tip šuma treba izazvati ValueError."""
+    with pytest.raises(ValueError):
+        Generate_AWGN(np.ones(16, dtype=complex), 10, 0, dtype=np.float64)
+
+
+def test_awgn_list_input_raises_type_error():
+    """Lista umjesto numpy niza daje TypeError."""
+    with pytest.raises(TypeError):
+        Generate_AWGN([1.0, 2.0, 3.0], 10, 0)
@@ -0,0 +1,72 @@
+import json
+import pytest
+from benchmarks.benchmark_chain import (
+    RX_STAGES, benchmark_case, compare_results, main, run_benchmarks, summarize
+)
+
+
+def test_summarize_percentiles_and_throughput():
+    """Percentili su u ms, propusnost se računa iz medijana"""
+    stats = summarize([0.001, 0.002, 0.003], num_samples=2000)
+    assert stats["p50_ms"] == pytest.approx(2.0)
+    assert stats["min_ms"] == pytest.approx(1.0)
+    assert stats["max_ms"] == pytest.approx(3.0)
+    assert stats["samples_per_sec"] == pytest.approx(1e6)
+
+
+def test_benchmark_case_times_all_stages():
+    """Svaka faza TX, kanala i RX lanca ima svoju statistiku"""
+    result = benchmark_case(num_symbols=5, bits_per_symbol=4, repeats=2)
+    expected = {"generate_frame", "channel_apply", "run_rx", *RX_STAGES}
+    assert set(result["stages"]) == expected
+    assert result["num_samples"] > 0
+    for stats in result["stages"].values():
+        assert stats["p50_ms"] >= 0
+
+
+def test_results_are_json_and_comparable(tmp_path):
+    """Rezultat se upisuje kao JSON i poređenje sa samim sobom nema regresija"""
+    out = tmp_path / "bench.json"
+    assert main(["--symbols", "2", "--bps", "1", "--repeats", "1", "--output", str(out)]) == 0
+    data = json.loads(out.read_text())
+    assert data["meta"]["repeats"] == 1
+    assert len(data["results"]) == 1
+
+    rows = compare_results(data, data)
+    assert rows and not any(r["regression"] for r in rows)
+
+    slower = json.loads(out.read_text())
+    slower["results"][0]["stages"]["run_rx"]["p50_ms"] *= 2
+    flagged = [r["stage"] for r in compare_results(data, slower) if r["regression"]]
+    assert flagged == ["run_rx"]
+
+
+def test_run_benchmarks_grid():
+    """Po jedan rezultat za svaku kombinaciju dužine i modulacije"""
+    data = run_benchmarks(symbol_counts=(1, 3), bits_per_symbol=(2, 6), repeats=1)
+    combos = {(r["num_symbols"], r["bits_per_symbol"]) for r in data["results"]}
+    assert combos == {(1, 2), (1, 6), (3, 2), (3, 6)}
+
+
+def test_compare_keys_on_channel_configuration():
+    """Slučajevi sa različitim kanalom (tapovi, filtriranje) se ne porede međusobno"""
+    stage = {"run_rx": {"p50_ms": 1.0}}
+    case = {"num_symbols": 10, "bits_per_symbol": 2, "number_of_taps": 4, "filter_method": "direct",
+            "channel_method": "ls", "stages": stage}
+    baseline = {"results": [case, dict(case, filter_method="fft"), dict(case, number_of_taps=40)]}
+    current = {"results": [dict(case, stages={"run_rx": {"p50_ms": 3.0}}), dict(case, number_of_taps=40)]}
+
+    rows = compare_results(baseline, current)
+    assert [(r["number_of_taps"], r["filter_method"], r["regression"]) for r in rows] == [
+        (4, "direct", True), (40, "direct", False)]
+
+
+def test_compare_accepts_results_without_channel_fields():
+    """Stariji JSON bez parametara kanala poredi se kao kanal sa 4 tapa, lfilter i LS"""
+    old = {"results": [{"num_symbols": 10, "bits_per_symbol": 2, "stages": {"run_rx": {"p50_ms": 1.0}}}]}
+    new = {"results": [{"num_symbols": 10, "bits_per_symbol": 2, "number_of_taps": 4, "filter_method": "direct",
+                        "channel_method": "ls", "stages": {"run_rx": {"p50_ms": 1.1}}}]}
+    rows = compare_results(old, new)
+    assert len(rows) == 1
+    assert (rows[0]["number_of_taps"], rows[0]["filter_method"], rows[0]["channel_method"]) == (4, "direct", "ls")
+    assert not rows[0]["regression"]
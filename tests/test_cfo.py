@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from rx.cfo import detect_frequency_offsets, detect_frequency_offsets_batch, frequency_offset_traces
+from tx.short_sequence import get_short_training_sequence
+from tx.long_sequence import get_long_training_sequence
+
+
+def test_known_cfo_is_recovered():
+    """Grubi i precizni CFO moraju odgovarati poznatom ofsetu preambule."""
+    fs = 20e6
+    cfo = 25e3
+    preamble = np.concatenate((get_short_training_sequence(), get_long_training_sequence()))
+    rx = np.concatenate((np.zeros(100), preamble, np.zeros(100)))
+    rx = rx * np.exp(1j * 2 * np.pi * cfo * np.arange(len(rx)) / fs)
+
+    # Grubi CFO gleda kraj STS-a, precizni dva LTS simbola
+    sts_end = 100 + 160
+    first_lts = sts_end + 32
+    coarse = detect_frequency_offsets(rx, sts_end + 32, fs=fs)[0]
+    fine = detect_frequency_offsets(rx, first_lts + 63, fs=fs)[1]
+
+    assert coarse == pytest.approx(cfo, rel=1e-6)
+    assert fine == pytest.approx(cfo, rel=1e-6)
+
+
+def test_windowed_matches_full_trace():
+    """Procjena iz prozora mora odgovarati vrijednosti punog traga na istim indeksima."""
+    rng = np.random.default_rng(1)
+    rx = rng.normal(size=3000) + 1j * rng.normal(size=3000)
+    fs = 20e6
+    lts_start = 700
+
+    coarse_trace, fine_trace = frequency_offset_traces(rx)
+    offsets = detect_frequency_offsets(rx, lts_start, fs=fs)
+
+    expected_coarse = np.angle(coarse_trace[lts_start - 82]) * fs / (2 * np.pi * 16)
+    expected_fine = np.angle(fine_trace[lts_start + 64]) * fs / (2 * np.pi * 64)
+    assert offsets[0] == pytest.approx(expected_coarse, abs=1e-6)
+    assert offsets[1] == pytest.approx(expected_fine, abs=1e-6)
+
+
+def test_index_clipped_to_signal():
+    """Indeksi van signala se ograničavaju, a kratak signal ne izaziva grešku."""
+    rx = np.ones(40, dtype=complex)
+    assert np.all(detect_frequency_offsets(rx, 0) == 0)
+    assert np.all(np.isfinite(detect_frequency_offsets(rx, 1000)))
+
+
+def test_plot_branch_executes(monkeypatch):
+    """Plot grana se izvršava bez greške."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    monkeypatch.setattr(plt, "show", lambda *args, **kwargs: None)
+
+    rx = np.exp(1j * 0.01 * np.arange(500))
+    offsets = detect_frequency_offsets(rx, 200, plot=True)
+    assert offsets.shape == (2,)
+
+
+def test_batch_matches_single_packet():
+    """Batch procjena CFO-a je ista kao detect_frequency_offsets po redu."""
+    fs = 20e6
+    preamble = np.concatenate((get_short_training_sequence(), get_long_training_sequence()))
+    rng = np.random.default_rng(0)
+    n = np.arange(len(preamble) + 100)
+    rows = np.array([np.exp(1j * 2 * np.pi * cfo * n / fs) * np.concatenate((np.zeros(50), preamble, np.zeros(50)))
+                     for cfo in (-40e3, 0.0, 12e3, 90e3)])
+    rows += 0.01 * (rng.standard_normal(rows.shape) + 1j * rng.standard_normal(rows.shape))
+    lts_start = np.array([210, 211, 20, 0])
+
+    batch = detect_frequency_offsets_batch(rows, lts_start, fs=fs)
+
+    for r in range(len(rows)):
+        np.testing.assert_allclose(batch[r], detect_frequency_offsets(rows[r], lts_start[r], fs=fs))
@@ -66,7 +66,7 @@ def test_channelsettings_set_invalid():
 
 def test_channel_model_apply_multipath_awgn():
     """ Provjerava primjenu multipath efekta i AWGN šuma nad signalom."""
-    settings = ChannelSettings(number_of_taps=5, delay_spread=50e-9, snr_db=20)
+    settings = ChannelSettings(number_of_taps=5, delay_spread=50e-9, snr_db=20, seed=0)
     mode = ChannelMode(multipath=1, thermal_noise=1)
     model = Channel_Model(settings, mode)
     
@@ -96,3 +96,130 @@ def test_channel_model_apply_no_multipath_no_awgn():
     # Provjera da je izlaz samo normalizovani ulazni signal
     expected = tx_samples / np.sqrt(np.var(tx_samples))
     np.testing.assert_array_almost_equal(out_samples, expected)
+
+def test_channelsettings_seed():
+    """Seed prihvata cijeli broj, Generator ili None, a odbija negativne i necijele vrijednosti"""
+    assert ChannelSettings().Seed is None
+    settings = ChannelSettings(seed=0)
+    assert settings.Seed == 0
+    settings.Seed = np.random.default_rng(1)
+    with pytest.raises(ValueError):
+        settings.Seed = -1
+    with pytest.raises(ValueError):
+        settings.Seed = 1.5
+
+def test_channel_model_rng_reproducible_and_advancing():
+    """Isti Seed daje iste realizacije; uzastopni pozivi istog modela daju nove tapove i šum"""
+    settings = ChannelSettings(number_of_taps=5, delay_spread=50e-9, snr_db=10, seed=11)
+    mode = ChannelMode(multipath=1, thermal_noise=1)
+    x = np.exp(1j * np.arange(200) / 7)
+
+    out_a1, taps_a1 = Channel_Model(settings, mode).apply(x)
+    model_b = Channel_Model(settings, mode)
+    out_b1, taps_b1 = model_b.apply(x)
+    out_b2, taps_b2 = model_b.apply(x)
+
+    np.testing.assert_array_equal(out_a1, out_b1)
+    np.testing.assert_array_equal(taps_a1, taps_b1)
+    assert not np.array_equal(taps_b1, taps_b2)
+    assert not np.array_equal(out_b1, out_b2)
+
+def test_default_settings_give_independent_noise():
+    """Bez zadanog sjemena svaki model daje drugu realizaciju šuma"""
+    mode = ChannelMode(multipath=0, thermal_noise=1)
+    x = np.exp(1j * np.arange(200) / 7)
+    out_a, _ = Channel_Model(ChannelSettings(), mode).apply(x)
+    out_b, _ = Channel_Model(ChannelSettings(), mode).apply(x)
+    assert not np.array_equal(out_a, out_b)
+
+def test_channel_model_threads_match_serial():
+    """Modeli sa vlastitim generatorima daju iste rezultate u nitima kao serijski"""
+    from concurrent.futures import ThreadPoolExecutor
+    mode = ChannelMode(multipath=1, thermal_noise=1)
+    x = np.exp(1j * np.arange(2000) / 5)
+
+    def run(seed):
+        settings = ChannelSettings(number_of_taps=8, delay_spread=50e-9, snr_db=15, seed=seed)
+        return Channel_Model(settings, mode).apply(x)[0]
+
+    serial = [run(s) for s in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = list(pool.map(run, range(8)))
+    for a, b in zip(serial, threaded):
+        np.testing.assert_array_equal(a, b)
+
+def test_channel_model_no_multipath_skips_taps():
+    """Bez multipatha tapovi se ne generišu (jedinični kanal) i generator se ne troši na njih"""
+    settings = ChannelSettings(number_of_taps=5, delay_spread=50e-9, snr_db=20, seed=3)
+    model = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=1))
+    x = np.ones(100, dtype=complex) * 1j
+    out, fir_taps = model.apply(x)
+    np.testing.assert_array_equal(fir_taps, [1.0])
+    expected = x + Generate_AWGN(x, 20, np.random.default_rng(3))
+    np.testing.assert_allclose(out, expected)
+
+def test_channel_model_apply_batch_matches_lfilter_per_row():
+    """Bez šuma, svaki red batch izlaza odgovara lfilter + normalizaciji iz apply"""
+    import scipy.signal as sc
+    rng = np.random.default_rng(0)
+    settings = ChannelSettings(number_of_taps=6, delay_spread=50e-9, snr_db=20, seed=0)
+    model = Channel_Model(settings, ChannelMode(multipath=1, thermal_noise=0))
+    x = rng.normal(size=(5, 300)) + 1j * rng.normal(size=(5, 300))
+
+    out, taps = model.apply_batch(x)
+    assert out.shape == (5, 300)
+    assert taps.shape == (5, 6)
+    for r in range(5):
+        y = sc.lfilter(taps[r], 1, x[r])
+        np.testing.assert_allclose(out[r], y / np.sqrt(np.var(y)), atol=1e-10)
+
+    shared, shared_taps = model.apply_batch(x, fir_taps=taps[0])
+    y = sc.lfilter(taps[0], 1, x[3])
+    np.testing.assert_allclose(shared[3], y / np.sqrt(np.var(y)), atol=1e-10)
+
+def test_channel_model_apply_batch_snr_per_row():
+    """AWGN se dodaje po redu za zadani SNR, bez multipatha tapovi su jedinice"""
+    settings = ChannelSettings(snr_db=10, seed=4)
+    model = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=1))
+    x = np.exp(1j * np.arange(20000) / 3)[None, :] * np.array([[1.0], [5.0]])
+
+    out, taps = model.apply_batch(x)
+    np.testing.assert_array_equal(taps, np.ones((2, 1)))
+    clean = x / np.sqrt(np.var(x, axis=1, keepdims=True))
+    snr = 10 * np.log10(np.mean(np.abs(clean)**2, axis=1) / np.mean(np.abs(out - clean)**2, axis=1))
+    np.testing.assert_allclose(snr, 10, atol=0.2)
+
+def test_channel_model_apply_batch_requires_2d():
+    """apply_batch prihvata samo (R, L) nizove"""
+    model = Channel_Model(ChannelSettings(), ChannelMode())
+    with pytest.raises(ValueError):
+        model.apply_batch(np.ones(10))
+
+def test_channel_model_apply_returns_1d_with_noise():
+    """Sa AWGN izlaz ostaje 1D (L,) i ima zadani SNR u odnosu na normalizovan signal"""
+    settings = ChannelSettings(snr_db=15, seed=2)
+    model = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=1))
+    x = 3 + np.exp(1j * np.arange(40000) / 5)
+
+    out, _ = model.apply(x)
+    assert out.shape == x.shape
+    clean = x / np.sqrt(np.var(x))
+    snr = 10 * np.log10(np.mean(np.abs(clean)**2) / np.mean(np.abs(out - clean)**2))
+    assert snr == pytest.approx(15, abs=0.2)
+
+@pytest.mark.parametrize("snr_db", [10, 20, 35])
+def test_channel_model_noise_power_matches_snr_for_ofdm_frame(snr_db):
+    """Za 802.11a okvir šum na izlazu apply (izlaz minus normalizovan ulaz) ima snagu zadanu sa snr_db"""
+    from tx.OFDM_TX_802_11 import Transmitter80211a
+    tx, _ = Transmitter80211a(num_ofdm_symbols=30, bits_per_symbol=2, up_factor=2, seed=123,
+                              plot=False).generate_frame()
+    clean = tx / np.std(tx)
+    mode = ChannelMode(multipath=0, thermal_noise=1)
+
+    noise_energy = 0.0
+    for seed in range(16):
+        settings = ChannelSettings(sample_rate=40e6, snr_db=snr_db, seed=seed)
+        out, _ = Channel_Model(settings, mode).apply(tx)
+        noise_energy += np.sum(np.abs(out - clean)**2)
+    snr = 10 * np.log10(16 * np.sum(np.abs(clean)**2) / noise_energy)
+    assert snr == pytest.approx(snr_db, abs=0.1)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import scipy.signal as sc
+from channel.convolution import overlap_save, fir_filter, choose_method, overlap_save_block_size
+from channel.Channel_Model import Channel_Model
+from channel.channel_settings import ChannelSettings
+from channel.channel_mode import ChannelMode
+
+
+@pytest.mark.parametrize("L, N", [(1, 1), (10, 40), (300, 7), (5000, 64), (20000, 400)])
+def test_overlap_save_matches_lfilter(L, N):
+    """Overlap-save daje isti kauzalni izlaz iste dužine kao lfilter"""
+    rng = np.random.default_rng(L + N)
+    x = rng.normal(size=L) + 1j * rng.normal(size=L)
+    h = rng.normal(size=N) + 1j * rng.normal(size=N)
+    np.testing.assert_allclose(overlap_save(x, h), sc.lfilter(h, 1, x), atol=1e-10)
+
+
+def test_overlap_save_custom_block_size_and_real_input():
+    """Rezultat ne zavisi od dužine bloka; realni ulaz je podržan"""
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=1000)
+    h = rng.normal(size=20) + 1j * rng.normal(size=20)
+    expected = sc.lfilter(h, 1, x)
+    for block in (20, 64, 100, 4096):
+        np.testing.assert_allclose(overlap_save(x, h, block_size=block), expected, atol=1e-10)
+    with pytest.raises(ValueError):
+        overlap_save(x, h, block_size=19)
+
+
+def test_overlap_save_empty_signal():
+    """Prazan ulaz daje prazan izlaz"""
+    assert overlap_save(np.zeros(0), np.ones(3)).size == 0
+
+
+def test_choose_method_thresholds():
+    """Kratki kanali idu direktno, dugi kanali na dugim signalima preko FFT-a"""
+    assert choose_method(4, 100000) == "direct"
+    assert choose_method(40, 500) == "direct"
+    assert choose_method(40, 20000) == "fft"
+    assert overlap_save_block_size(400) > 399
+
+
+def test_fir_filter_methods_agree_and_validate():
+    """Sve metode daju isti rezultat; nepoznata metoda baca ValueError"""
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=3000) + 1j * rng.normal(size=3000)
+    h = rng.normal(size=50) + 1j * rng.normal(size=50)
+    ref = fir_filter(x, h, "direct")
+    np.testing.assert_allclose(fir_filter(x, h, "fft"), ref, atol=1e-10)
+    np.testing.assert_allclose(fir_filter(x, h, "auto"), ref, atol=1e-10)
+    with pytest.raises(ValueError):
+        fir_filter(x, h, "spectral")
+
+
+def test_channel_model_filter_method_same_output():
+    """Channel_Model daje isti izlaz za 'direct' i 'fft' filtriranje"""
+    settings = ChannelSettings(number_of_taps=60, delay_spread=150e-9, snr_db=20, seed=7)
+    mode = ChannelMode(multipath=1, thermal_noise=1)
+    x = np.exp(1j * np.arange(5000) / 9)
+    direct, taps_d = Channel_Model(settings, mode, filter_method="direct").apply(x)
+    fft, taps_f = Channel_Model(settings, mode, filter_method="fft").apply(x)
+    np.testing.assert_array_equal(taps_d, taps_f)
+    np.testing.assert_allclose(fft, direct, atol=1e-10)
+    with pytest.raises(ValueError):
+        Channel_Model(settings, mode, filter_method="x")
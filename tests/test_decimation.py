@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from rx.decimation import (
+    StreamingDecimator,
+    cascaded_decimate,
+    decimation_bank,
+    decimation_stages,
+    polyphase_decimate,
+)
+from tx.filters import design_nyquist_filter
+
+
+@pytest.mark.parametrize("length", [1, 2, 31, 999, 1000])
+@pytest.mark.parametrize("down_factor, N", [(2, 31), (3, 47), (2, 1)])
+def test_polyphase_matches_filter_then_downsample(length, down_factor, N):
+    """Polifazna decimacija daje iste uzorke kao centrirana filtracija pa x[::M]."""
+    rng = np.random.default_rng(length)
+    x = rng.standard_normal(length) + 1j * rng.standard_normal(length)
+    h = design_nyquist_filter(N, down_factor)
+    expected = np.convolve(x, h / np.sum(h))[(N - 1) // 2::down_factor][:-(-length // down_factor)]
+
+    result = polyphase_decimate(x, down_factor, N)
+
+    assert len(result) == -(-length // down_factor)
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+def test_without_filter_equals_plain_decimation():
+    """N=1 je čista decimacija, kao ranije x[::2]."""
+    x = np.arange(11) * (1 + 1j)
+    np.testing.assert_array_equal(cascaded_decimate(x, 2, N=1), x[::2])
+    np.testing.assert_array_equal(cascaded_decimate(x, 4, N=1), x[::4])
+
+
+def test_taps_cached_read_only_with_unit_dc_gain():
+    """Tapovi su keširani, samo za čitanje, a DC pojačanje je 1."""
+    bank = decimation_bank(31, 2, 2)
+    assert decimation_bank(31, 2, 2) is bank
+    assert [vrsta for vrsta, _, _ in bank] == ["fir", "delay"]
+    assert sum(np.sum(taps) for _, taps, _ in bank) == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        bank[0][1][0] = 0.0
+
+    np.testing.assert_allclose(cascaded_decimate(np.ones(400))[20:-20], 1.0, atol=1e-3)
+
+
+def test_stages_and_invalid_factor():
+    """Faktor se rastavlja na stepene ×2 i neparni ostatak."""
+    assert decimation_stages(4) == ((2, 31, 2), (2, 31, 2))
+    assert [stage[0] for stage in decimation_stages(6)] == [2, 3]
+    assert decimation_stages(1) == ()
+
+    with pytest.raises(ValueError):
+        cascaded_decimate(np.ones(10), 0)
+    with pytest.raises(TypeError):
+        cascaded_decimate(np.ones(10), 2.5)
+
+
+def test_out_of_band_tone_and_noise_suppressed():
+    """Ton izvan opsega se ne preklapa u opseg, a bijeli šum gubi pola snage."""
+    n = np.arange(20000)
+    in_band = cascaded_decimate(np.exp(2j * np.pi * 2e6 / 40e6 * n))[50:-50]
+    aliased = cascaded_decimate(np.exp(2j * np.pi * 15e6 / 40e6 * n))[50:-50]
+    assert np.mean(np.abs(in_band)**2) == pytest.approx(1.0, abs=0.01)
+    assert 10 * np.log10(np.mean(np.abs(aliased)**2)) < -50
+
+    rng = np.random.default_rng(0)
+    noise = rng.standard_normal(100000) + 1j * rng.standard_normal(100000)
+    assert np.mean(np.abs(cascaded_decimate(noise))**2) == pytest.approx(1.0, rel=0.1)
+
+
+@pytest.mark.parametrize("down_factor", [2, 3, 4])
+def test_streaming_decimator_matches_whole_signal(down_factor):
+    """Decimacija u blokovima proizvoljne dužine daje iste uzorke kao nad cijelim signalom."""
+    rng = np.random.default_rng(down_factor)
+    x = rng.standard_normal(3000) + 1j * rng.standard_normal(3000)
+    decimator = StreamingDecimator(down_factor)
+    parts, pos = [], 0
+    while pos < len(x):
+        size = int(rng.integers(1, 300))
+        parts.append(decimator.process(x[pos:pos + size]))
+        pos += size
+    parts.append(decimator.flush())
+
+    np.testing.assert_allclose(np.concatenate(parts), cascaded_decimate(x, down_factor), atol=1e-12)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from tx.OFDM_mapper import Mapper_OFDM
+from rx.demapper import Demapper_OFDM
+
+
+@pytest.mark.parametrize("bps", [1, 2, 4, 6])
+def test_demapper_inverts_mapper(bps):
+    """Demapiranje (i uz mali šum) vraća originalne bitove"""
+    rng = np.random.default_rng(bps)
+    bits = rng.integers(0, 2, size=48 * bps * 5)
+    symbols = Mapper_OFDM(bits, bps)
+    noise = 0.03 * (rng.normal(size=len(symbols)) + 1j * rng.normal(size=len(symbols)))
+    np.testing.assert_array_equal(Demapper_OFDM(symbols, bps), bits)
+    np.testing.assert_array_equal(Demapper_OFDM(symbols + noise, bps), bits)
+
+
+def test_demapper_clips_outer_points():
+    """Simboli izvan konstelacije se mapiraju na najbližu vanjsku tačku"""
+    bits = Demapper_OFDM(np.array([10 + 10j, -10 - 10j]), 4)
+    np.testing.assert_array_equal(bits, [1, 1, 1, 1, 0, 0, 0, 0])
+
+
+def test_demapper_invalid_bits_per_symbol():
+    """Nepodržan broj bita po simbolu baca ValueError"""
+    with pytest.raises(ValueError):
+        Demapper_OFDM(np.array([1 + 1j]), 3)
+
+
+def test_demapper_empty():
+    """Prazan ulaz daje prazan niz bita"""
+    assert Demapper_OFDM(np.array([], dtype=complex), 2).size == 0
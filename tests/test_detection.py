@@ -1,5 +1,6 @@
 import numpy as np
-from rx.detection import packet_detector  
+import pytest
+from rx.detection import packet_detector, packet_detector_batch, find_packets, falling_edges
 
 def test_noise_only():
     """Test 1: Čisti šum: ne smije detektovati paket"""
@@ -66,3 +67,160 @@ def test_short_signal():
     assert np.sum(flag) == 0
     assert fe is None
 
+
+
+def _referentni_detektor(rx_input):
+    """Referentna implementacija uzorak po uzorak (delay linija + pomični prozori)."""
+    rx_input = np.asarray(rx_input, dtype=np.complex128)
+    N = len(rx_input)
+    autocorr_est = np.zeros(N, dtype=np.complex128)
+    comparison_ratio = np.zeros(N)
+    packet_det_flag = np.zeros(N, dtype=int)
+    falling_edge_position = None
+    delay16 = np.zeros(16, dtype=np.complex128)
+    avg_autocorr = np.zeros(32, dtype=np.complex128)
+    avg_power = np.zeros(32)
+    detection_flag = 0
+    for i in range(N):
+        rx_delayed = delay16[-1]
+        delay16[1:] = delay16[:-1]
+        delay16[0] = rx_input[i]
+        avg_autocorr[1:] = avg_autocorr[:-1]
+        avg_autocorr[0] = rx_input[i] * np.conj(rx_delayed)
+        autocorr_est[i] = np.sum(avg_autocorr) / 32
+        avg_power[1:] = avg_power[:-1]
+        avg_power[0] = np.abs(rx_input[i]) ** 2
+        variance_est = np.sum(avg_power) / 32
+        comparison_ratio[i] = np.abs(autocorr_est[i]) / variance_est if variance_est > 0 else 0.0
+        if comparison_ratio[i] > 0.85:
+            detection_flag = 1
+        elif comparison_ratio[i] < 0.65:
+            detection_flag = 0
+        packet_det_flag[i] = detection_flag
+        if i > 0 and packet_det_flag[i-1] == 1 and packet_det_flag[i] == 0:
+            falling_edge_position = i
+    return comparison_ratio, packet_det_flag, falling_edge_position, autocorr_est
+
+
+def test_vectorized_matches_reference():
+    """Test 5: Vektorizovani detektor daje iste izlaze kao obrada uzorak po uzorak"""
+    rng = np.random.default_rng(3)
+    sts = np.tile(np.exp(1j*2*np.pi*rng.random(16)), 10)
+    noise = lambda n: 0.3 * (rng.normal(size=n) + 1j*rng.normal(size=n))
+    rx = np.concatenate([noise(200), sts + noise(160), noise(150), np.zeros(40),
+                         sts + noise(160), noise(100)])
+
+    ref = _referentni_detektor(rx)
+    out = packet_detector(rx)
+
+    np.testing.assert_allclose(out[0], ref[0], atol=1e-12)
+    assert np.array_equal(out[1], ref[1])
+    assert out[2] == ref[2]
+    np.testing.assert_allclose(out[3], ref[3], atol=1e-12)
+
+
+def test_empty_signal():
+    """Test 6: Prazan signal ne detektuje paket"""
+    cr, flag, fe, ac = packet_detector(np.zeros(0))
+    assert len(cr) == 0 and len(flag) == 0 and len(ac) == 0
+    assert fe is None
+
+
+def test_find_packets_all_plateaus():
+    """Test 7: find_packets vraća sve STS platoe redom, sa metrikama detekcije"""
+    rng = np.random.default_rng(4)
+    sts = np.tile(np.exp(1j*2*np.pi*rng.random(16)), 10)
+    noise = lambda n: 0.1 * (rng.normal(size=n) + 1j*rng.normal(size=n))
+    parts = [noise(300)]
+    for _ in range(4):
+        parts += [sts + noise(160), noise(400)]
+    rx = np.concatenate(parts)
+
+    packets = find_packets(rx)
+    _, flag, fe_last, _ = packet_detector(rx)
+
+    assert len(packets) == 4
+    edges = [p["falling_edge"] for p in packets]
+    assert edges == sorted(edges)
+    assert edges[-1] == fe_last
+    assert np.all(np.abs(np.diff(edges) - 560) <= 16)
+    for p in packets:
+        assert p["plateau_length"] == p["falling_edge"] - p["rising_edge"] >= 48
+        assert p["mean_ratio"] > 0.85
+        assert p["power"] > 0
+
+
+def test_find_packets_rejects_short_plateaus():
+    """Test 8: Kratki impulsi zastavice (npr. na kraju paketa) nisu paketi"""
+    rng = np.random.default_rng(5)
+    sts = np.tile(np.exp(1j*2*np.pi*rng.random(16)), 10)
+    short = np.tile(np.exp(1j*2*np.pi*rng.random(16)), 2)
+    noise = lambda n: 0.1 * (rng.normal(size=n) + 1j*rng.normal(size=n))
+    rx = np.concatenate([noise(300), short + noise(32), noise(300), sts + noise(160), noise(300)])
+
+    _, flag, _, _ = packet_detector(rx)
+    assert len(falling_edges(flag)) >= 2
+
+    packets = find_packets(rx)
+    assert len(packets) == 1
+    assert packets[0]["falling_edge"] > 600
+    assert find_packets(np.zeros(0)) == []
+
+
+def test_find_packets_plateau_means_on_long_capture():
+    """Test 9: Metrike platoa su tačne i za slabe pakete iza jakog dijela dugog snimka"""
+    rng = np.random.default_rng(6)
+    sts = np.tile(np.exp(1j*2*np.pi*rng.random(16)), 10)
+    noise = lambda n, a: a * (rng.normal(size=n) + 1j*rng.normal(size=n))
+    parts = [noise(400000, 1e4)]
+    for _ in range(20):
+        parts += [1e-2 * sts + noise(160, 1e-4), noise(400, 1e-4)]
+    rx = np.concatenate(parts)
+
+    comparison_ratio = packet_detector(rx)[0]
+    packets = find_packets(rx)
+    assert len(packets) == 20
+    for p in packets:
+        segment = slice(p["rising_edge"], p["falling_edge"])
+        assert p["mean_ratio"] == pytest.approx(np.mean(comparison_ratio[segment]), rel=1e-9)
+        assert p["power"] == pytest.approx(np.mean(np.abs(rx[segment])**2), rel=1e-9)
+
+
+def test_packet_detector_batch_matches_single():
+    """Batch detektor daje istu zadnju ivicu kao packet_detector za svaki red (-1 bez ivice)"""
+    rng = np.random.default_rng(4)
+    sts = np.tile(np.exp(1j * 2 * np.pi * rng.random(16)), 10)
+    rows = []
+    for lead in (100, 357, 800):
+        row = 0.02 * (rng.standard_normal(1500) + 1j * rng.standard_normal(1500))
+        row[lead:lead + 160] += sts
+        rows.append(row)
+    rows.append(np.zeros(1500, dtype=complex))
+    rows = np.array(rows)
+
+    ratio, flag, edges = packet_detector_batch(rows)
+
+    for r, row in enumerate(rows):
+        cr, fl, fe, _ = packet_detector(row)
+        np.testing.assert_allclose(ratio[r], cr, atol=1e-9)
+        np.testing.assert_array_equal(flag[r], fl)
+        assert edges[r] == (-1 if fe is None else fe)
+
+
+def test_packet_detector_batch_matches_single_on_long_capture():
+    """Na dugom snimku sa jakim i vrlo slabim dijelom batch i pojedinačni detektor se slažu"""
+    rng = np.random.default_rng(5)
+    N = 2_000_000
+    row = 1e-3 * (rng.standard_normal(N) + 1j * rng.standard_normal(N))
+    row[:N // 2] = 10 * (rng.standard_normal(N // 2) + 1j * rng.standard_normal(N // 2))
+    sts = np.tile(np.exp(1j * 2 * np.pi * rng.random(16)), 10)
+    row[N // 2 - 160:N // 2] = 10 * sts
+    rows = np.stack([row, row[::-1]])
+
+    ratio, flag, edges = packet_detector_batch(rows)
+
+    for r in range(2):
+        cr, fl, fe, _ = packet_detector(rows[r])
+        np.testing.assert_allclose(ratio[r], cr, atol=1e-6)
+        np.testing.assert_array_equal(flag[r], fl)
+        assert edges[r] == (-1 if fe is None else fe)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+import scipy.signal as sc
+from scipy.special import j0
+from channel.convolution import block_fir_filter
+from channel.Doppler import GetTimeVaryingFilter, sum_of_sinusoids, DOPPLER_BLOCK_SIZE
+from channel.Channel_Model import Channel_Model
+from channel.channel_settings import ChannelSettings
+from channel.channel_mode import ChannelMode
+
+
+def reference_block_filter(x, taps, block_size):
+    """y[n] = sum_k taps[n // block_size, k] * x[n - k], direktno po uzorcima"""
+    N = taps.shape[1]
+    y = np.zeros(len(x), dtype=complex)
+    for n in range(len(x)):
+        for k in range(min(N, n + 1)):
+            y[n] += taps[n // block_size, k] * x[n - k]
+    return y
+
+
+@pytest.mark.parametrize("L, N, B", [(1, 1, 4), (100, 7, 16), (257, 20, 8), (300, 3, 64)])
+def test_block_fir_filter_matches_reference(L, N, B):
+    """Blokovska overlap-save filtracija odgovara direktnoj vremenski promjenljivoj sumi"""
+    rng = np.random.default_rng(L + N + B)
+    x = rng.normal(size=L) + 1j * rng.normal(size=L)
+    taps = rng.normal(size=(-(-L // B), N)) + 1j * rng.normal(size=(-(-L // B), N))
+    np.testing.assert_allclose(block_fir_filter(x, taps, B), reference_block_filter(x, taps, B), atol=1e-10)
+
+
+def test_block_fir_filter_constant_taps_equal_lfilter_and_batch():
+    """Isti tapovi u svim blokovima daju lfilter; vodeće dimenzije se obrađuju po redu"""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(3, 1000)) + 1j * rng.normal(size=(3, 1000))
+    h = rng.normal(size=(3, 12)) + 1j * rng.normal(size=(3, 12))
+    taps = np.repeat(h[:, None, :], -(-1000 // 64), axis=1)
+    y = block_fir_filter(x, taps, 64)
+    for r in range(3):
+        np.testing.assert_allclose(y[r], sc.lfilter(h[r], 1, x[r]), atol=1e-10)
+    with pytest.raises(ValueError):
+        block_fir_filter(x[0], taps[0, :-1], 64)
+
+
+def test_sum_of_sinusoids_matches_direct_formula():
+    """Razlaganje vremenske ose daje isto što i direktna suma sinusoida"""
+    M, T, dt, t0, fd = 8, 50, 1e-4, 2e-5, 200.0
+    g = sum_of_sinusoids(T, dt, fd, (3,), np.random.default_rng(3), M, t0=t0)
+
+    rng = np.random.default_rng(3)
+    theta = rng.uniform(-np.pi, np.pi, (3, 1))
+    phi = rng.uniform(-np.pi, np.pi, (3, M))
+    w = 2 * np.pi * fd * np.cos((2 * np.pi * np.arange(1, M + 1) - np.pi + theta) / M)
+    t = t0 + dt * np.arange(T)
+    expected = np.exp(1j * (np.multiply.outer(t, w) + phi)).sum(-1) / np.sqrt(M)
+
+    assert g.shape == (T, 3)
+    np.testing.assert_allclose(g, expected, atol=1e-12)
+
+
+def test_sum_of_sinusoids_jakes_statistics():
+    """Jedinična snaga, autokorelacija ~ J0(2*pi*fD*tau), a bez Dopplera proces je konstantan"""
+    dt, fd = 1e-4, 100.0
+    g = sum_of_sinusoids(2000, dt, fd, (400,), np.random.default_rng(0))
+    assert np.mean(np.abs(g)**2) == pytest.approx(1.0, abs=0.05)
+    for lag in (5, 10, 20):
+        corr = np.mean(g[lag:] * g[:-lag].conj()).real
+        assert corr == pytest.approx(j0(2 * np.pi * fd * lag * dt), abs=0.05)
+
+    static = sum_of_sinusoids(100, dt, 0.0, (4,), np.random.default_rng(1))
+    np.testing.assert_allclose(static, np.broadcast_to(static[0], static.shape))
+
+
+def test_time_varying_filter_shapes():
+    """Trajektorije imaju ceil(L / blok) redova, i za više realizacija"""
+    taps = GetTimeVaryingFilter(40e6, 50e-9, 6, 300.0, 1000, rng=1)
+    assert taps.shape == (-(-1000 // DOPPLER_BLOCK_SIZE), 6)
+    batch = GetTimeVaryingFilter(40e6, 50e-9, 6, 300.0, 1000, rng=1, num_realizations=4)
+    assert batch.shape == (4, -(-1000 // DOPPLER_BLOCK_SIZE), 6)
+
+
+def test_channel_model_doppler_apply():
+    """Doppler režim vraća trajektorije tapova, ponovljiv je i primjenjuje ih po blokovima"""
+    settings = ChannelSettings(number_of_taps=5, delay_spread=50e-9, max_doppler=500.0, seed=3)
+    mode = ChannelMode(multipath=1, thermal_noise=0, doppler=1)
+    x = np.exp(1j * np.arange(2000) / 9)
+
+    out, taps = Channel_Model(settings, mode).apply(x)
+    out_again, taps_again = Channel_Model(settings, mode).apply(x)
+    assert out.shape == x.shape
+    assert taps.shape == (-(-2000 // DOPPLER_BLOCK_SIZE), 5)
+    np.testing.assert_array_equal(taps, taps_again)
+
+    expected = reference_block_filter(x, taps, DOPPLER_BLOCK_SIZE)
+    np.testing.assert_allclose(out, expected / np.sqrt(np.var(expected)), atol=1e-10)
+
+
+def test_channel_model_doppler_apply_batch_rows():
+    """apply_batch u Doppler režimu filtrira svaki red svojom trajektorijom"""
+    settings = ChannelSettings(number_of_taps=4, delay_spread=50e-9, max_doppler=1000.0, seed=0)
+    model = Channel_Model(settings, ChannelMode(multipath=1, thermal_noise=0, doppler=1))
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=(3, 500)) + 1j * rng.normal(size=(3, 500))
+
+    out, taps = model.apply_batch(x)
+    assert taps.shape == (3, -(-500 // DOPPLER_BLOCK_SIZE), 4)
+    for r in range(3):
+        y = reference_block_filter(x[r], taps[r], DOPPLER_BLOCK_SIZE)
+        np.testing.assert_allclose(out[r], y / np.sqrt(np.var(y)), atol=1e-10)
+
+
+def test_doppler_settings_validation():
+    """Doppler zastavica i parametri odbijaju nevalidne vrijednosti"""
+    assert ChannelMode().Doppler == 0
+    assert ChannelSettings().MaxDoppler == 0.0
+    with pytest.raises(ValueError):
+        ChannelMode(doppler=2)
+    with pytest.raises(ValueError):
+        ChannelSettings(max_doppler=-1.0)
+    with pytest.raises(ValueError):
+        ChannelSettings(number_of_sinusoids=0)
@@ -5,11 +5,7 @@ from tx.OFDM_TX_802_11 import Transmitter80211a
 from channel.Channel_Model import Channel_Model
 from channel.channel_settings import ChannelSettings
 from channel.channel_mode import ChannelMode
-
-# ---------------- helper functions ----------------
-def apply_cfo(x, cfo_hz, fs):
-    n = np.arange(len(x))
-    return x * np.exp(1j * 2 * np.pi * cfo_hz * n / fs)
+from channel.impairments import apply_cfo
 
 # ------------------ E2E TEST -----------------------
 @pytest.mark.parametrize("snr_db", [10, 20, 35])
@@ -38,7 +34,8 @@ def test_e2e_rx(snr_db):
         sample_rate=fs40,
         number_of_taps=2,
         delay_spread=10e-9,
-        snr_db=snr_db
+        snr_db=snr_db,
+        seed=0  # fiksna realizacija šuma
     )
     mode = ChannelMode(multipath=0, thermal_noise=1)
     channel = Channel_Model(settings, mode)
@@ -4,7 +4,9 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from rx.estimacija_kanala import channel_estimate_and_equalizer
+from rx.estimacija_kanala import channel_estimate_and_equalizer, estimate_channel, ls_estimate, USED_TONES
+from tx.long_sequence import get_lts_reference_64
+from channel.channel_settings import ChannelSettings
 
 def generate_synthetic_signal(length=128):
     """Generiše kompleksan signal od zadate dužine."""
@@ -52,3 +54,58 @@ def test_channel_estimate_short_signal_raises():
     lts_start = 0
     with pytest.raises(ValueError):
         channel_estimate_and_equalizer(signal, lts_start)
+
+
+
+def lts_batch(num_packets=400, snr_db=5, seed=1):
+    """Dva LTS simbola kroz slučajne višeputne kanale (4 tapa) uz AWGN."""
+    rng = np.random.default_rng(seed)
+    lts = get_lts_reference_64()
+    taps = (rng.standard_normal((num_packets, 4)) + 1j * rng.standard_normal((num_packets, 4))) * np.exp(-np.arange(4) / 2)
+    # ciklično proširen LTS, pa je prijem kružna konvolucija
+    clean = np.array([np.convolve(np.tile(lts, 3), h)[64:192] for h in taps])
+    noise_var = np.mean(np.abs(lts)**2) * 10**(-snr_db / 10)
+    noise = np.sqrt(noise_var / 2) * (rng.standard_normal(clean.shape) + 1j * rng.standard_normal(clean.shape))
+    return clean + noise, np.fft.fft(taps, 64)[:, USED_TONES]
+
+
+def test_ls_method_matches_single_packet_and_batch():
+    """Batch procjena je ista kao procjena paket po paket (default 'ls')."""
+    rx, _ = lts_batch(num_packets=5)
+    ch_batch, eq_batch = estimate_channel(rx)
+    assert ch_batch.shape == (5, 64)
+    for i in range(5):
+        ch, eq = channel_estimate_and_equalizer(np.r_[np.zeros(7), rx[i]], 7)
+        np.testing.assert_allclose(ch, ch_batch[i])
+        np.testing.assert_allclose(eq, eq_batch[i])
+    assert np.all(ch_batch[:, [0, 27, 37]] == 0)
+
+
+def test_noise_variance_estimate():
+    """Varijansa šuma iz razlike dva LTS simbola odgovara stvarnoj."""
+    rx, H = lts_batch(snr_db=10)
+    H_ls, noise_var = ls_estimate(rx)
+    assert np.mean(noise_var) == pytest.approx(np.mean(np.abs(H_ls - H)**2), rel=0.1)
+
+
+def test_dft_and_mmse_reduce_estimation_error():
+    """Na niskom SNR-u DFT i MMSE procjena imaju manju grešku od LS."""
+    rx, H = lts_batch(snr_db=5)
+    mse = {}
+    for method, kwargs in [("ls", {}), ("dft", {}), ("mmse", {"delay_spread": ChannelSettings(delay_spread=100e-9)})]:
+        ch, _ = estimate_channel(rx, method, **kwargs)
+        mse[method] = 10 * np.log10(np.mean(np.abs(ch[:, USED_TONES] - H)**2))
+    assert mse["dft"] < mse["ls"] - 3
+    assert mse["mmse"] < mse["dft"]
+
+
+def test_custom_and_invalid_method():
+    """Metoda može biti funkcija; nepoznata metoda i pogrešna dužina daju ValueError."""
+    rx, _ = lts_batch(num_packets=3)
+    ch, eq = estimate_channel(rx, lambda H_ls, noise_var: np.ones_like(H_ls))
+    np.testing.assert_array_equal(ch[:, USED_TONES], 1)
+    np.testing.assert_array_equal(eq[:, USED_TONES], 1)
+    with pytest.raises(ValueError):
+        estimate_channel(rx, "wiener")
+    with pytest.raises(ValueError):
+        estimate_channel(rx[:, :100])
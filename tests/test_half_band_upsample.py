@@ -62,3 +62,49 @@ def test_plot_branch_executes():
 
     assert isinstance(result, np.ndarray)
     assert isinstance(h, np.ndarray)
+
+
+@pytest.mark.parametrize("length", [1, 4, 15, 16, 17, 500])
+@pytest.mark.parametrize("up_factor", [1, 2, 3, 4])
+def test_polyphase_matches_zero_stuff_convolution(length, up_factor):
+    """Polifazna implementacija mora dati isto što i zero-stuffing + np.convolve."""
+    from tx.utilities import zero_stuffing
+
+    rng = np.random.default_rng(length + up_factor)
+    signal = rng.normal(size=length) + 1j * rng.normal(size=length)
+    result, h = half_band_upsample(signal, up_factor=up_factor)
+
+    expected = np.convolve(zero_stuffing(signal, up_factor), h, mode='same')
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+def test_filter_cached_and_half_band_structure():
+    """Filter se kešira; neparna polifazna komponenta je čisto kašnjenje."""
+    from tx.filters import design_nyquist_filter, polyphase_bank
+
+    _, h1 = half_band_upsample(np.ones(8))
+    _, h2 = half_band_upsample(np.ones(8))
+    assert h1 is h2 is design_nyquist_filter(31, 2)
+
+    kinds = [vrsta for vrsta, _, _ in polyphase_bank(31, 2, 2)]
+    assert kinds == ["fir", "delay"]
+
+
+def test_cascaded_upsample():
+    """Kaskada za faktor 2 odgovara half-band upsamplingu, a ostali faktori daju ispravnu dužinu."""
+    from tx.filters import cascaded_upsample
+
+    signal = np.exp(1j * 2 * np.pi * 0.05 * np.arange(200))
+    np.testing.assert_allclose(cascaded_upsample(signal, 2),
+                               half_band_upsample(signal, 2)[0])
+
+    for up_factor in (3, 4, 6):
+        out = cascaded_upsample(signal, up_factor)
+        assert len(out) == len(signal) * up_factor
+        # Sporo rotirajući fazor se zadržava u sredini signala
+        mid = out[200:-200]
+        assert np.allclose(np.abs(mid), 1, atol=0.05)
+
+    with pytest.raises(ValueError):
+        cascaded_upsample(signal, 0)
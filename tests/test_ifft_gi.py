@@ -168,3 +168,33 @@ def test_ifft_gi_empty_input():
 
     with pytest.raises(ValueError):
         IFFT_GI(data)
+
+def test_ifft_gi_batched_matches_per_symbol_reference():
+    """Provjerava da batch IFFT daje iste uzorke kao obrada simbol po simbol."""
+    from tx.ifft_ofdm_symbol import IFFT_INDEX, PILOT_INDEX
+
+    rng = np.random.default_rng(7)
+    num_symbols = 6
+    stream = rng.normal(size=num_symbols * 48) + 1j * rng.normal(size=num_symbols * 48)
+
+    expected = np.zeros(num_symbols * 80, dtype=complex)
+    for i in range(num_symbols):
+        grid = np.zeros(64, dtype=complex)
+        grid[IFFT_INDEX] = stream[i * 48:(i + 1) * 48]
+        grid[PILOT_INDEX] = 1
+        t = np.fft.ifft(grid)
+        expected[i * 80:(i + 1) * 80] = np.hstack([t[48:64], t])
+
+    np.testing.assert_allclose(IFFT_GI(stream), expected, rtol=0, atol=1e-15)
+
+def test_ifft_gi_writes_into_preallocated_output():
+    """Provjerava upis u unaprijed alocirani izlazni niz."""
+    stream = np.ones(2 * 48, dtype=complex)
+    out = np.empty(2 * 80, dtype=complex)
+    payload = IFFT_GI(stream, out=out)
+
+    assert payload is out
+    np.testing.assert_array_equal(out, IFFT_GI(stream))
+
+    with pytest.raises(ValueError):
+        IFFT_GI(stream, out=np.empty(80, dtype=complex))
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from channel.impairments import apply_cfo, apply_impairments, farrow_cubic, iq_imbalance_coefficients
+from channel.Channel_Model import Channel_Model
+from channel.channel_settings import ChannelSettings
+from channel.channel_mode import ChannelMode
+
+
+def test_apply_cfo_matches_full_exponential():
+    """Blokovska CFO rotacija daje isto što i exp nad cijelim signalom, i za više paketa"""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(2, 10000)) + 1j * rng.normal(size=(2, 10000))
+    n = np.arange(10000)
+    expected = x * np.exp(1j * 2 * np.pi * 2500.0 * n / 40e6)
+    np.testing.assert_allclose(apply_cfo(x, 2500.0, 40e6, chunk_size=777), expected, atol=1e-10)
+    np.testing.assert_allclose(apply_cfo(x[0], 2500.0, 40e6), expected[0], atol=1e-10)
+
+
+def test_apply_cfo_per_packet_offsets():
+    """Niz CFO-a daje svakom paketu njegov ofset; korekcija je rotacija za -cfo"""
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(3, 5000)) + 1j * rng.normal(size=(3, 5000))
+    cfo = np.array([2500.0, -13000.0, 0.0])
+    n = np.arange(5000)
+    expected = x * np.exp(1j * 2 * np.pi * cfo[:, None] * n / 20e6)
+    shifted = apply_cfo(x, cfo, 20e6, chunk_size=999)
+    np.testing.assert_allclose(shifted, expected, atol=1e-10)
+    np.testing.assert_allclose(apply_cfo(shifted, -cfo, 20e6), x, atol=1e-10)
+
+
+def test_farrow_cubic_exact_for_cubic_polynomial():
+    """Kubna interpolacija je tačna za polinome do trećeg stepena"""
+    p = lambda t: 0.3 * t**3 - 2 * t**2 + t + 5
+    tau = np.linspace(1, 16, 61)
+    np.testing.assert_allclose(farrow_cubic(p(np.arange(20.0)), tau), p(tau), atol=1e-9)
+
+
+def test_sfo_resamples_tone():
+    """SFO od +100 ppm uzorkuje ton u trenucima n/(1 + 1e-4)"""
+    n = np.arange(5000)
+    x = np.exp(1j * 2 * np.pi * 0.01 * n)
+    y = apply_impairments(x, 1.0, sfo_ppm=100.0, chunk_size=1000)
+    expected = np.exp(1j * 2 * np.pi * 0.01 * n / (1 + 1e-4))
+    np.testing.assert_allclose(y[2:-3], expected[2:-3], atol=1e-5)
+
+
+def test_phase_noise_wiener_increments():
+    """Priraštaji faznog šuma imaju varijansu 2*pi*linewidth/fs i nastavljaju se preko blokova"""
+    fs, linewidth = 20e6, 100.0
+    y = apply_impairments(np.ones(200000, dtype=complex), fs, phase_noise_hz=linewidth,
+                          rng=0, chunk_size=1000)
+    increments = np.diff(np.unwrap(np.angle(y)))
+    assert np.var(increments) == pytest.approx(2 * np.pi * linewidth / fs, rel=0.05)
+    # nema skoka na granici blokova
+    assert np.max(np.abs(increments)) < 10 * np.sqrt(2 * np.pi * linewidth / fs)
+    np.testing.assert_allclose(np.abs(y), 1.0)
+
+
+def test_iq_imbalance_image():
+    """IQ debalans stvara sliku tona na -f sa odnosom |nu/mu|"""
+    mu, nu = iq_imbalance_coefficients(0.0, 0.0)
+    assert (mu, nu) == (1, 0)
+
+    n = np.arange(4096)
+    x = np.exp(1j * 2 * np.pi * 64 * n / 4096)
+    y = apply_impairments(x, 1.0, iq_gain_db=1.0, iq_phase_deg=3.0)
+    spectrum = np.abs(np.fft.fft(y))
+    mu, nu = iq_imbalance_coefficients(1.0, 3.0)
+    assert spectrum[-64] / spectrum[64] == pytest.approx(abs(nu / mu), rel=1e-6)
+
+
+def test_no_impairments_is_identity_and_validation():
+    """Bez parametara izlaz je jednak ulazu; nevalidni parametri daju ValueError"""
+    x = np.arange(10) + 1j
+    np.testing.assert_array_equal(apply_impairments(x, 1.0), x)
+    with pytest.raises(ValueError):
+        apply_impairments(x, 1.0, phase_noise_hz=-1.0)
+    with pytest.raises(ValueError):
+        apply_impairments(x, 1.0, chunk_size=0)
+
+
+def test_channel_model_applies_impairments():
+    """Impairments režim primjenjuje CFO iz ChannelSettings nakon normalizacije"""
+    settings = ChannelSettings(cfo_hz=5000.0, sample_rate=20e6)
+    x = np.exp(1j * np.arange(3000) / 4)
+    plain, _ = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=0)).apply(x)
+    impaired, _ = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=0, impairments=1)).apply(x)
+    np.testing.assert_allclose(impaired, apply_cfo(plain, 5000.0, 20e6), atol=1e-12)
+
+    batch, _ = Channel_Model(settings, ChannelMode(multipath=0, thermal_noise=0, impairments=1)).apply_batch(x[None, :])
+    np.testing.assert_allclose(batch[0], impaired, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        ChannelMode(impairments=2)
+    with pytest.raises(ValueError):
+        ChannelSettings(phase_noise_linewidth=-1.0)
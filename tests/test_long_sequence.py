@@ -55,3 +55,26 @@ def test_energy_positive():
 
     assert energy > 0
     assert not np.isnan(energy)
+
+def test_cached_read_only():
+    """Provjerava da se sekvenca kešira po step-u i da je read-only."""
+    import pytest
+    lts1 = get_long_training_sequence()
+    lts2 = get_long_training_sequence()
+    assert lts1 is lts2
+    with pytest.raises(ValueError):
+        lts1[0] = 0
+
+def test_derived_reference_artefacts():
+    """Provjerava 64-uzoraka referencu, njen spektar i tapove korelatora."""
+    from tx.long_sequence import (get_lts_reference_64, get_lts_reference_fft,
+                                  get_lts_correlator_taps)
+    seq = get_long_training_sequence(step=1)
+    ref = get_lts_reference_64()
+    assert np.array_equal(ref, seq[32:96])
+    np.testing.assert_allclose(get_lts_reference_fft(), np.fft.fft(ref) / 64)
+
+    taps = get_lts_correlator_taps()
+    L = np.sign(ref.real) + 1j * np.sign(ref.imag)
+    assert np.array_equal(taps, np.conj(L[::-1]))
+    assert not taps.flags.writeable
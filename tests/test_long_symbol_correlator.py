@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from rx.long_symbol_correlator import long_symbol_correlator
+from rx.long_symbol_correlator import correlator_taps, long_symbol_correlator, long_symbol_correlator_batch
 
 def test_peak_detection_exact_position():
     """Provjera da funkcija detektuje peak tačno na poziciji LTS-a"""
@@ -58,3 +58,69 @@ def test_normalized_lts_correlation():
     L_expected = np.sign(np.real(lts)) + 1j*np.sign(np.imag(lts))
     allowed_values = np.array([1+1j, 1-1j, -1+1j, -1-1j])
     assert np.all(np.isin(L_expected, allowed_values))
+
+def test_windowed_search_matches_full_trace():
+    """Peak iz prozora mora odgovarati maksimumu punog traga unutar istog prozora"""
+    rng = np.random.default_rng(2)
+    lts = np.exp(1j*2*np.pi*rng.random(64))
+    rx_signal = 0.3*(rng.normal(size=600) + 1j*rng.normal(size=600))
+    rx_signal[200:264] += lts
+    falling_edge = 150
+
+    peak_val, peak_pos, output_long = long_symbol_correlator(lts, rx_signal, falling_edge)
+    fast_val, fast_pos, no_trace = long_symbol_correlator(lts, rx_signal, falling_edge,
+                                                          return_trace=False)
+
+    window = np.arange(falling_edge + 55, falling_edge + 118)
+    expected_pos = window[np.argmax(np.abs(output_long[window]))]
+    assert peak_pos == fast_pos == expected_pos == 263
+    assert np.isclose(peak_val, output_long[expected_pos])
+    assert fast_val == peak_val
+    assert no_trace is None
+
+def test_full_trace_matches_shift_register_definition():
+    """Puni trag mora odgovarati definiciji shift registra: sum_k rx[i-k] * conj(L[63-k])"""
+    rng = np.random.default_rng(4)
+    lts = rng.normal(size=64) + 1j*rng.normal(size=64)
+    rx_signal = rng.normal(size=150) + 1j*rng.normal(size=150)
+    L = np.sign(lts.real) + 1j*np.sign(lts.imag)
+
+    _, _, output_long = long_symbol_correlator(lts, rx_signal, 0)
+
+    padded = np.concatenate((np.zeros(63), rx_signal))
+    expected = [np.dot(padded[i:i+64][::-1], np.conj(L[::-1])) for i in range(len(rx_signal))]
+    np.testing.assert_allclose(output_long, expected, atol=1e-12)
+
+
+def test_batch_matches_single_correlator():
+    """Batch korelator daje isti peak kao long_symbol_correlator za svaki red, i na rubovima"""
+    rng = np.random.default_rng(7)
+    lts = np.exp(1j*2*np.pi*rng.random(64))
+    rows = np.zeros((4, 300), dtype=complex)
+    rows[0, 120:184] = lts
+    rows[1, 40:104] = lts
+    rows[2] = rng.standard_normal(300)
+    edges = np.array([70, -30, 250, 10])
+
+    values, positions = long_symbol_correlator_batch(lts, rows, edges)
+
+    for r in range(len(rows)):
+        value, position, _ = long_symbol_correlator(lts, rows[r], edges[r], return_trace=False)
+        assert positions[r] == position
+        assert values[r] == pytest.approx(value)
+
+def test_reference_copy_uses_cached_taps():
+    """Kopija standardnog LTS-a se prepoznaje po vrijednosti i daje iste tapove i peak"""
+    from tx.long_sequence import get_lts_reference_64, get_lts_correlator_taps
+    reference = get_lts_reference_64()
+    copy = np.array(reference)
+    assert correlator_taps(copy) is get_lts_correlator_taps()
+    assert correlator_taps(list(reference)) is get_lts_correlator_taps()
+
+    other = copy.copy()
+    other[0] = -other[0]
+    L = np.sign(np.real(other)) + 1j*np.sign(np.imag(other))
+    np.testing.assert_array_equal(correlator_taps(other), np.conj(L[::-1]))
+
+    rx_signal = np.concatenate([np.zeros(120), reference, np.zeros(100)])
+    assert long_symbol_correlator(copy, rx_signal, 70)[:2] == long_symbol_correlator(reference, rx_signal, 70)[:2]
@@ -0,0 +1,131 @@
+import math
+import numpy as np
+import pytest
+from simulation.monte_carlo import (
+    PointStatistics, ber_upper_bound_zero_errors, parameter_grid, run_point, run_simulation, run_trial, run_trials_batch, trial_seed,
+    wilson_interval
+)
+
+
+def test_parameter_grid_product_and_defaults():
+    """Mreža je Kartezijev proizvod, ostali parametri imaju default vrijednost"""
+    grid = parameter_grid(snr_db=[5, 10], bits_per_symbol=[2, 4, 6])
+    assert len(grid) == 6
+    assert {p["snr_db"] for p in grid} == {5, 10}
+    assert all(p["cfo_hz"] == 0.0 for p in grid)
+    with pytest.raises(ValueError):
+        parameter_grid(snr=[1])
+
+
+def test_wilson_interval_contains_estimate():
+    """Wilsonov interval sadrži procjenu i sužava se sa brojem uzoraka"""
+    low, high = wilson_interval(10, 100)
+    assert low < 0.1 < high
+    low2, high2 = wilson_interval(100, 1000)
+    assert high2 - low2 < high - low
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_trial_seed_is_deterministic_and_distinct():
+    """Sjeme pokušaja zavisi samo od (seed, tačka, pokušaj)"""
+    assert trial_seed(0, 1, 2) == trial_seed(0, 1, 2)
+    assert len({trial_seed(0, p, t) for p in range(3) for t in range(50)}) == 150
+
+
+def test_run_trial_high_snr_is_error_free():
+    """Pri visokom SNR-u paket se detektuje bez grešaka i sa niskim EVM-om"""
+    point = {"snr_db": 40, "bits_per_symbol": 4, "delay_spread": 0.0, "cfo_hz": 1000.0, "num_symbols": 5}
+    trial = run_trial(point, seed=3)
+    assert trial["detected"]
+    assert trial["bit_errors"] == 0
+    assert trial["num_bits"] > 0
+    assert 10 * math.log10(trial["error_power"] / trial["num_symbols"]) < -25
+
+
+def test_run_trial_with_doppler_fading():
+    """Uz Doppler i bez delay spreada kanal je ravni fading tap; paket se i dalje dekodira"""
+    point = {"snr_db": 35, "bits_per_symbol": 2, "delay_spread": 0.0, "cfo_hz": 0.0,
+             "num_symbols": 20, "doppler_hz": 200.0}
+    trial = run_trial(point, seed=1)
+    assert trial["detected"]
+    assert trial["bit_errors"] == 0
+
+
+def test_batch_trials_match_single_trials():
+    """Grupa pokušaja kroz run_rx_batch daje iste rezultate kao run_trial po pokušaju"""
+    point = {"snr_db": 3, "bits_per_symbol": 2, "delay_spread": 50e-9, "cfo_hz": 2000.0,
+             "num_symbols": 6, "doppler_hz": 0.0}
+    seeds = list(range(12))
+    batch = run_trials_batch(point, seeds)
+    for seed, trial in zip(seeds, batch):
+        single = run_trial(point, seed)
+        assert trial["detected"] == single["detected"]
+        assert trial["bit_errors"] == single["bit_errors"]
+        assert trial["error_power"] == pytest.approx(single["error_power"])
+
+
+def test_point_statistics_counts_missed_packets():
+    """Nedetektovani paketi ulaze u vjerovatnoću detekcije, ali ne i u BER"""
+    stats = PointStatistics()
+    stats.add({"detected": True, "bit_errors": 5, "num_bits": 100, "error_power": 1.0, "num_symbols": 10})
+    stats.add({"detected": False, "bit_errors": 0, "num_bits": 0, "error_power": 0.0, "num_symbols": 0})
+    summary = stats.summary()
+    assert summary["detect_rate"] == 0.5
+    assert summary["ber"] == 0.05
+    assert summary["evm_db"] == pytest.approx(-10.0)
+
+
+def test_run_point_stops_early_when_converged():
+    """Kad je interval dovoljno uzak, simulacija staje prije max_trials"""
+    point = {"snr_db": 8, "bits_per_symbol": 6, "delay_spread": 0.0, "cfo_hz": 0.0, "num_symbols": 4}
+    result = run_point(point, batch_size=5, min_trials=5, max_trials=200, rel_precision=0.2)
+    assert result["stopped_early"]
+    assert result["trials"] < 200
+    assert result["ber_ci"][0] <= result["ber"] <= result["ber_ci"][1]
+
+
+def test_error_free_point_converges_below_ber_floor():
+    """Tačka bez grešaka staje kad gornja granica BER-a (≈3/num_bits) padne ispod praga"""
+    stats = PointStatistics()
+    trial = {"detected": True, "bit_errors": 0, "num_bits": 1000, "error_power": 0.01, "num_symbols": 10}
+    for _ in range(20):
+        stats.add(trial)
+    assert ber_upper_bound_zero_errors(20000) == pytest.approx(3 / 20000, rel=0.01)
+    assert not stats.converged(0.1, 0.05, 0.95)
+    assert not stats.converged(0.1, 0.05, 0.95, ber_floor=1e-4)
+    for _ in range(20):
+        stats.add(trial)
+    assert stats.converged(0.1, 0.05, 0.95, ber_floor=1e-4)
+
+
+def test_run_point_stops_early_without_errors():
+    """Pri visokom SNR-u nema grešaka, a simulacija ipak staje prije max_trials"""
+    point = {"snr_db": 35, "bits_per_symbol": 2, "delay_spread": 0.0, "cfo_hz": 0.0, "num_symbols": 10}
+    result = run_point(point, batch_size=10, min_trials=10, max_trials=200, ber_floor=1e-4)
+    assert result["bit_errors"] == 0
+    assert result["stopped_early"]
+    assert result["num_bits"] * 1e-4 > 3
+
+
+def test_run_simulation_is_reproducible():
+    """Isto sjeme daje iste rezultate bez obzira na veličinu grupe, redoslijed prati mrežu"""
+    grid = parameter_grid(snr_db=[8, 30], num_symbols=[3])
+    a = run_simulation(grid, seed=1, batch_size=3, min_trials=6, max_trials=6)
+    b = run_simulation(grid, seed=1, batch_size=2, min_trials=6, max_trials=6)
+    assert [r["snr_db"] for r in a] == [8, 30]
+    assert a == b
+
+
+def test_parallel_run_matches_serial():
+    """Rezultat sa više procesa je identičan serijskom izvršavanju"""
+    grid = parameter_grid(snr_db=[6, 20], bits_per_symbol=[4], num_symbols=[3])
+    kwargs = dict(seed=7, batch_size=4, min_trials=4, max_trials=8)
+    serial = run_simulation(grid, workers=1, **kwargs)
+    parallel = run_simulation(grid, workers=2, chunk_size=3, **kwargs)
+    assert parallel == serial
+
+
+def test_run_simulation_invalid_workers():
+    """Broj procesa mora biti pozitivan cijeli broj"""
+    with pytest.raises(ValueError):
+        run_simulation(parameter_grid(), workers=0)
@@ -1,5 +1,5 @@
 import numpy as np
-from channel.Multipath import GetMultipathFilter
+from channel.Multipath import GetMultipathFilter, power_delay_profile
 import pytest
 
 # Basic parameter set used across tests
@@ -69,3 +69,37 @@ def test_multipath_delay_spread_effect():
     ratio_large = np.mean(power_large[-8:]) / power_large[0]
 
     assert ratio_large > ratio_small
+
+
+def test_multipath_batch_realizations_shape():
+    """Many realisations can be drawn at once as an (R, N) array."""
+    h = GetMultipathFilter(FS, TRMS, N, rng=0, num_realizations=500)
+    assert h.shape == (500, N)
+    assert not np.array_equal(h[0], h[1])
+
+
+def test_multipath_average_power_matches_profile():
+    """Average tap power over many realisations follows 2*exp(-n*Ts/Trms)."""
+    h = GetMultipathFilter(FS, TRMS, 8, rng=1, num_realizations=20000)
+    expected = 2 * power_delay_profile(FS, TRMS, 8) ** 2
+    np.testing.assert_allclose(np.mean(np.abs(h) ** 2, axis=0), expected, rtol=0.05, atol=1e-3)
+
+
+def test_power_delay_profile_is_cached_and_read_only():
+    """The profile is computed once per (SampleRate, DelaySpread, N) and is immutable."""
+    p1 = power_delay_profile(FS, TRMS, N)
+    assert power_delay_profile(FS, TRMS, N) is p1
+    with pytest.raises(ValueError):
+        p1[0] = 2.0
+
+
+def test_multipath_zero_delay_spread_single_path():
+    """With zero delay spread all power is in the first tap."""
+    h = GetMultipathFilter(FS, 0.0, 4, rng=2)
+    assert np.all(np.isfinite(h))
+    assert np.all(h[1:] == 0)
+
+
+def test_multipath_reproducible_with_seed():
+    """Same seed gives the same taps."""
+    np.testing.assert_array_equal(GetMultipathFilter(FS, TRMS, N, rng=5), GetMultipathFilter(FS, TRMS, N, rng=5))
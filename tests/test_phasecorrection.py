@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from rx.PhaseCorrection_80211a import phase_correction_80211a
+from rx.PhaseCorrection_80211a import phase_correction_80211a, phase_correction_80211a_batch
 
 
 
@@ -116,3 +116,55 @@ def test_output_is_independent_copies():
     rx_signal, num_symbols, ltpeak, channel_est, eq = generate_valid_inputs(2)
     result = phase_correction_80211a(rx_signal, num_symbols, ltpeak, channel_est, eq)
     assert not np.shares_memory(result[0], result[1])
+
+
+def reference_phase_correction(rx_signal, num_symbols, ltpeak, channel_est, equalizer_coeffs, L=8):
+    """Referentna petlja simbol po simbol (lstsq + shift register filtar)"""
+    pilot_bins = np.array([11, 25, 38, 52])
+    k_vec = np.fft.fftfreq(64) * 64
+    pilot_k = k_vec[pilot_bins]
+    C = np.abs(channel_est[pilot_bins]) / np.sum(np.abs(channel_est[pilot_bins]))
+    data = np.setdiff1d(np.arange(6, 58), pilot_bins)
+    average_slope_filter = np.zeros(L)
+    out = []
+    for i in range(num_symbols):
+        start = ltpeak + 128 + i*80 + 16
+        eq_sym = 1/64 * np.fft.fft(rx_signal[start:start+64]) * equalizer_coeffs
+        avg = C @ eq_sym[pilot_bins]
+        phase = np.unwrap(np.angle(eq_sym[pilot_bins] * np.conj(avg)))
+        A = np.vstack([pilot_k, np.ones(4)]).T
+        slope = np.linalg.lstsq(A, phase, rcond=None)[0][0]
+        average_slope_filter[1:] = average_slope_filter[:-1]
+        average_slope_filter[0] = slope
+        corr = np.sum(average_slope_filter) / L * k_vec
+        out.append((eq_sym * np.exp(-1j*np.angle(avg)) * np.exp(-1j*corr))[data])
+        equalizer_coeffs = equalizer_coeffs * np.exp(-1j*corr/L)
+    return np.array(out)
+
+
+@pytest.mark.parametrize("noise", [0.01, 1.0])
+def test_batch_matches_sequential_reference(noise):
+    """Vektorska verzija mora reprodukovati sekvencijalni drift ekvilajzera (i kada se faze premotavaju)"""
+    rng = np.random.default_rng(5)
+    num_symbols = 40
+    tones = np.exp(1j*np.pi/2*rng.integers(0, 4, size=(num_symbols, 64)))
+    symbols = np.fft.ifft(tones, axis=1) * 64
+    payload = np.concatenate((symbols[:, 48:], symbols), axis=1).ravel()
+    rx_signal = np.concatenate((np.zeros(128), payload))
+    rx_signal = rx_signal * np.exp(1j*2*np.pi*2e-4*np.arange(len(rx_signal)))
+    rx_signal = rx_signal + noise*(rng.normal(size=len(rx_signal)) + 1j*rng.normal(size=len(rx_signal)))
+    channel_est = rng.normal(size=64) + 1j*rng.normal(size=64)
+    eq = 1 / channel_est
+
+    expected = reference_phase_correction(rx_signal, num_symbols, 0, channel_est, eq, L=6)
+    result = phase_correction_80211a_batch(rx_signal, num_symbols, 0, channel_est, eq, L=6)
+
+    assert result.shape == (num_symbols, 48)
+    np.testing.assert_allclose(result, expected, atol=1e-10)
+    np.testing.assert_allclose(np.array(phase_correction_80211a(rx_signal, num_symbols, 0, channel_est, eq, L=6)), expected, atol=1e-10)
+
+
+def test_batch_zero_symbols_shape():
+    """Za 0 simbola batch verzija vraća prazan (0, 48) niz"""
+    rx_signal, _, ltpeak, channel_est, eq = generate_valid_inputs(0)
+    assert phase_correction_80211a_batch(rx_signal, 0, ltpeak, channel_est, eq).shape == (0, 48)
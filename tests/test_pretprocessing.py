@@ -73,3 +73,40 @@ def test_mismatched_lengths():
     rx_out, fs_out = iq_preprocessing(rx, tx, fs)
     assert len(rx_out) == 500
     assert fs_out == fs / 2
+
+
+def test_input_not_mutated_and_integer_input():
+    rx = np.arange(1000)
+    rx_copy = rx.copy()
+    rx_out, _ = iq_preprocessing(rx, np.ones(1000), 10e6)
+    np.testing.assert_array_equal(rx, rx_copy)
+    assert np.all(np.isfinite(rx_out))
+
+    shared = np.random.randn(1000) + 1j * np.random.randn(1000)
+    shared_copy = shared.copy()
+    iq_preprocessing(shared)
+    np.testing.assert_array_equal(shared, shared_copy)
+
+
+def test_agc_without_tx_normalizes_sts_power():
+    rng = np.random.default_rng(0)
+    noise = 0.01 * (rng.standard_normal(2000) + 1j * rng.standard_normal(2000))
+    burst = 3.0 * np.exp(1j * 2 * np.pi * rng.random(640))
+    rx = noise.copy()
+    rx[800:1440] += burst  # 320 uzoraka nakon decimacije
+
+    rx_out, fs_out = iq_preprocessing(rx, fs=40e6, target_power=2.0)
+
+    assert fs_out == 20e6
+    assert np.mean(np.abs(rx_out[400:560])**2) == pytest.approx(2.0, rel=0.05)
+
+
+def test_agc_without_burst_uses_mean_power():
+    rx = np.random.randn(1000) + 1j * np.random.randn(1000)
+    rx_out, _ = iq_preprocessing(rx, fs=20e6)
+    assert np.mean(np.abs(rx_out)**2) == pytest.approx(1.0, rel=0.1)
+
+
+def test_agc_zero_signal_stays_zero():
+    rx_out, _ = iq_preprocessing(np.zeros(1000), fs=10e6)
+    assert np.all(rx_out == 0)
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from rx.prijemnik import run_rx
+from rx.prijemnik import run_rx, run_rx_multi, run_rx_batch, packet_windows
 
 
 def test_run_rx_happy_path(monkeypatch):
@@ -22,11 +22,11 @@ def test_run_rx_happy_path(monkeypatch):
     )
     monkeypatch.setattr(
         "rx.prijemnik.long_symbol_correlator",
-        lambda ref, rx, fe: (None, 200, None),
+        lambda ref, rx, fe, **kwargs: (None, 200, None),
     )
     monkeypatch.setattr(
         "rx.prijemnik.channel_estimate_and_equalizer",
-        lambda rx, lts: (np.ones(64, complex), np.ones(64, complex)),
+        lambda rx, lts, **kwargs: (np.ones(64, complex), np.ones(64, complex)),
     )
     monkeypatch.setattr(
         "rx.prijemnik.phase_correction_80211a",
@@ -81,11 +81,11 @@ def test_run_rx_zero_payload_symbols(monkeypatch):
     )
     monkeypatch.setattr(
         "rx.prijemnik.long_symbol_correlator",
-        lambda ref, rx, fe: (None, 60, None),
+        lambda ref, rx, fe, **kwargs: (None, 60, None),
     )
     monkeypatch.setattr(
         "rx.prijemnik.channel_estimate_and_equalizer",
-        lambda rx, lts: (np.ones(64, complex), np.ones(64, complex)),
+        lambda rx, lts, **kwargs: (np.ones(64, complex), np.ones(64, complex)),
     )
     monkeypatch.setattr(
         "rx.prijemnik.phase_correction_80211a",
@@ -96,3 +96,135 @@ def test_run_rx_zero_payload_symbols(monkeypatch):
 
     assert result["max_symbols_in_buffer"] == 0
     assert result["corrected_symbols"] == []
+
+
+def test_decode_packet_uses_given_falling_edge(monkeypatch):
+    from rx.prijemnik import decode_packet
+
+    rx = np.random.randn(2000) + 1j * np.random.randn(2000)
+
+    def detector_must_not_run(rx):
+        raise AssertionError("packet_detector ne treba pozivati kada je ivica zadana")
+
+    monkeypatch.setattr("rx.prijemnik.packet_detector", detector_must_not_run)
+    monkeypatch.setattr(
+        "rx.prijemnik.detect_frequency_offsets",
+        lambda rx, idx, plot=False, fs=None: (0.0, 0.0),
+    )
+    monkeypatch.setattr(
+        "rx.prijemnik.long_symbol_correlator",
+        lambda ref, rx, fe, **kwargs: (None, fe + 100, None),
+    )
+    monkeypatch.setattr(
+        "rx.prijemnik.channel_estimate_and_equalizer",
+        lambda rx, lts, **kwargs: (np.ones(64, complex), np.ones(64, complex)),
+    )
+    monkeypatch.setattr(
+        "rx.prijemnik.phase_correction_80211a",
+        lambda **kwargs: [np.zeros(48, complex)] * kwargs["num_symbols"],
+    )
+
+    result = decode_packet(rx, 20e6, num_symbols_req=3, falling_edge=400)
+
+    assert result["falling_edge"] == 400
+    assert result["lts_start"] == 437
+    assert len(result["corrected_symbols"]) == 3
+
+
+def test_run_rx_multi_decodes_every_packet(make_capture):
+    capture, frames, symbols = make_capture(num_frames=6)
+
+    packets = run_rx_multi(capture, frames[0], num_symbols_req=12)
+
+    assert [p["packet_index"] for p in packets] == list(range(6))
+    spacing = np.diff([p["capture_lts_start"] for p in packets])
+    assert np.all(spacing == len(frames[0]) // 2)
+    for packet, tx_symbols in zip(packets, symbols):
+        corrected = np.concatenate(packet["corrected_symbols"])
+        mask = np.abs(corrected) > 1e-6
+        evm = 10 * np.log10(np.mean(np.abs(corrected[mask] - tx_symbols[mask])**2))
+        assert evm < -20
+        assert packet["detection"]["plateau_length"] >= 48
+
+
+def test_run_rx_multi_parallel_matches_serial(make_capture):
+    capture, frames, _ = make_capture(num_frames=3)
+
+    serial = run_rx_multi(capture, frames[0], num_symbols_req=12)
+    parallel = run_rx_multi(capture, frames[0], num_symbols_req=12, workers=2)
+
+    assert len(serial) == len(parallel) == 3
+    for a, b in zip(serial, parallel):
+        assert a["capture_lts_start"] == b["capture_lts_start"]
+        np.testing.assert_allclose(np.concatenate(a["corrected_symbols"]),
+                                   np.concatenate(b["corrected_symbols"]))
+    with pytest.raises(ValueError):
+        run_rx_multi(capture, frames[0], workers=0)
+
+
+def test_packet_windows_stop_before_next_packet():
+    segments = [{"rising_edge": 400, "falling_edge": 530}, {"rising_edge": 2000, "falling_edge": 2130}]
+
+    assert packet_windows(segments, 5000) == [(210, 2000), (1810, 5000)]
+    assert packet_windows(segments, 5000, num_symbols_req=2) == [(210, 530 + 182 + 240), (1810, 2130 + 182 + 240)]
+
+
+def test_run_rx_without_tx_reference_matches_reference_run(make_capture):
+    capture, (tx_40,), _ = make_capture(gap=0, lead=300, seed=1)
+
+    with_tx = run_rx(capture, tx_40, num_symbols_req=12)
+    without_tx = run_rx(capture, num_symbols_req=12)
+
+    assert without_tx["lts_start"] == with_tx["lts_start"]
+    np.testing.assert_allclose(np.concatenate(without_tx["corrected_symbols"]),
+                               np.concatenate(with_tx["corrected_symbols"]), atol=1e-9)
+
+
+def _batch_captures(make_capture, num_captures=6):
+    # Isti paket u svim redovima, sa različitim CFO-om i nivoom šuma po redu
+    capture, (tx_40,), _ = make_capture(gap=0, lead=300, noise_std=0)
+    rng = np.random.default_rng(2)
+    captures = np.tile(capture, (num_captures, 1))
+    captures *= np.exp(1j * 2 * np.pi * 1e3 * np.arange(num_captures)[:, None] * np.arange(captures.shape[1]) / 40e6)
+    noise_std = np.linspace(1e-3, 0.02, num_captures)[:, None]
+    captures += noise_std * (rng.standard_normal(captures.shape) + 1j * rng.standard_normal(captures.shape))
+    return captures, tx_40
+
+
+@pytest.mark.parametrize("with_tx, num_symbols_req", [(True, 12), (False, None)])
+def test_run_rx_batch_matches_run_rx_per_capture(with_tx, num_symbols_req, make_capture):
+    captures, tx_40 = _batch_captures(make_capture)
+    tx_ref = tx_40 if with_tx else None
+
+    batch = run_rx_batch(captures, tx_ref, num_symbols_req=num_symbols_req)
+
+    assert batch["corrected_symbols"].shape[0] == len(captures)
+    assert np.all(batch["decoded"])
+    for r, capture in enumerate(captures):
+        single = run_rx(capture, tx_ref, num_symbols_req=num_symbols_req)
+        for key in ("falling_edge", "lt_peak_pos", "lts_start", "max_symbols_in_buffer"):
+            assert batch[key][r] == single[key]
+        assert batch["cfo_fine_hz"][r] == pytest.approx(single["cfo_fine_hz"])
+        n = batch["num_symbols"][r]
+        assert n == len(single["corrected_symbols"])
+        np.testing.assert_allclose(batch["corrected_symbols"][r, :n],
+                                   np.array(single["corrected_symbols"]), atol=1e-9)
+        np.testing.assert_allclose(batch["channel_est"][r], single["channel_est"], atol=1e-9)
+
+
+def test_run_rx_batch_marks_undetected_rows(make_capture):
+    captures, tx_40 = _batch_captures(make_capture, num_captures=2)
+    captures[1] = np.random.default_rng(3).standard_normal(captures.shape[1])
+
+    batch = run_rx_batch(captures, tx_40, num_symbols_req=12)
+
+    assert batch["decoded"].tolist() == [True, False]
+    assert batch["num_symbols"][0] == len(run_rx(captures[0], tx_40, num_symbols_req=12)["corrected_symbols"])
+    assert batch["num_symbols"][1] == 0
+    assert batch["lts_start"][1] == -1
+    assert np.isnan(batch["cfo_coarse_hz"][1])
+    assert np.all(np.isnan(batch["corrected_symbols"][1]))
+    assert not np.any(np.isnan(batch["corrected_symbols"][0, :batch["num_symbols"][0]]))
+    assert np.all(np.isnan(batch["corrected_symbols"][0, batch["num_symbols"][0]:]))
+    with pytest.raises(ValueError):
+        run_rx_batch(captures[0], tx_40)
@@ -122,3 +122,28 @@ def test_large_step_truncates_length():
     seq = get_short_training_sequence(step=step)
     expected_length = int(160 / step)
     assert len(seq) == expected_length
+
+def test_matches_per_sample_idft():
+    """Provjerava da keširana vektorizovana sekvenca odgovara IDFT formuli uzorak po uzorak."""
+    Positive = np.array([
+        0,0,0,0,   -1-1j,0,0,0,   -1-1j,0,0,0,   1+1j,0,0,0,
+        1+1j,0,0,0, 1+1j,0,0,0,  1+1j,0,0,0,  0,0,0,0
+    ], dtype=complex)
+    Negative = np.array([
+        0,0,0,0,   0,0,0,0,   1+1j,0,0,0,   -1-1j,0,0,0,
+        1+1j,0,0,0,  -1-1j,0,0,0,  -1-1j,0,0,0,  1+1j,0,0,0
+    ], dtype=complex)
+    Total = np.sqrt(13/6) * np.concatenate((Negative, Positive))
+    m = np.arange(-32, 32)
+
+    step = 0.5
+    seq = get_short_training_sequence(step=step)
+    expected = [np.dot(Total, np.exp(1j*2*np.pi*n*step*m/64)) for n in range(len(seq))]
+    np.testing.assert_allclose(seq, expected, atol=1e-12)
+
+def test_cached_read_only():
+    """Provjerava da se STS kešira i da vraćeni niz nije moguće mijenjati."""
+    sts = get_short_training_sequence(step=1)
+    assert sts is get_short_training_sequence(step=1)
+    with pytest.raises(ValueError):
+        sts[0] = 0
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from rx.streaming import StreamingReceiver, STS_CONTEXT
+
+NUM_SYMBOLS = 12
+
+
+def evm_db(packet, tx_symbols):
+    corrected = np.concatenate(packet["corrected_symbols"])
+    reference = tx_symbols[:len(corrected)]
+    mask = np.abs(corrected) > 1e-6
+    return 10 * np.log10(np.mean(np.abs(corrected[mask] - reference[mask])**2))
+
+
+@pytest.mark.parametrize("chunk_size", [137, 1000, 100000])
+def test_streaming_decodes_all_packets_independent_of_chunking(chunk_size, make_capture):
+    """Svi paketi se dekodiraju na istim pozicijama bez obzira na veličinu blokova"""
+    stream, frames, symbols = make_capture(num_frames=3, num_symbols=NUM_SYMBOLS, tail=5000)
+    frame_len = len(frames[0])
+    receiver = StreamingReceiver(NUM_SYMBOLS)
+    chunks = (stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size))
+    packets = list(receiver.run(chunks))
+
+    assert len(packets) == 3
+    assert [p["packet_index"] for p in packets] == [0, 1, 2]
+    starts = [p["stream_lts_start"] for p in packets]
+    # razmak paketa na 20 MHz je pola dužine okvira (sa razmakom)
+    assert np.diff(starts).tolist() == [frame_len // 2] * 2
+    for packet, tx_symbols in zip(packets, symbols):
+        assert len(packet["corrected_symbols"]) == NUM_SYMBOLS
+        assert evm_db(packet, tx_symbols) < -20
+
+
+def test_streaming_callback_and_bounded_buffer(make_capture):
+    """Callback dobija svaki paket, a bafer ostaje ograničen na ~jedan paket + blok"""
+    stream, _, _ = make_capture(num_frames=4, num_symbols=NUM_SYMBOLS, tail=5000)
+    seen = []
+    receiver = StreamingReceiver(NUM_SYMBOLS, callback=seen.append)
+    chunk_size = 500
+    max_buffer = 0
+    for i in range(0, len(stream), chunk_size):
+        receiver.push(stream[i:i + chunk_size])
+        max_buffer = max(max_buffer, receiver.buffered_samples)
+    receiver.flush()
+
+    assert len(seen) == 4
+    assert max_buffer <= STS_CONTEXT + receiver.packet_span + chunk_size // 2
+    assert receiver.buffered_samples == 0
+
+
+def test_streaming_noise_only_keeps_short_tail():
+    """Bez paketa se ništa ne dekodira i bafer zadržava samo kontekst za STS"""
+    rng = np.random.default_rng(1)
+    receiver = StreamingReceiver(NUM_SYMBOLS)
+    for _ in range(5):
+        noise = rng.standard_normal(4000) + 1j * rng.standard_normal(4000)
+        assert receiver.push(noise) == []
+        assert receiver.buffered_samples <= STS_CONTEXT
+
+
+def test_streaming_invalid_arguments():
+    """Nevalidan broj simbola ili oblik bloka daju ValueError"""
+    with pytest.raises(ValueError):
+        StreamingReceiver(0)
+    with pytest.raises(ValueError):
+        StreamingReceiver(NUM_SYMBOLS).push(np.zeros((2, 10)))
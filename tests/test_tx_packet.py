@@ -86,3 +86,57 @@ def test_transmitter_invalid_upsampling_factor():
     with pytest.raises(ValueError):
         tx = Transmitter80211a(num_ofdm_symbols=1, bits_per_symbol=2, up_factor=0)
         tx.generate_frame()
+
+def test_transmitter_stream_frames_match_tx_chain():
+    """Svaki paket iz streama odgovara TX lancu primijenjenom na njegove simbole"""
+    from tx.filters import half_band_upsample
+    from tx.ifft_ofdm_symbol import IFFT_GI
+    from tx.short_sequence import get_short_training_sequence
+    from tx.long_sequence import get_long_training_sequence
+
+    tx = Transmitter80211a(num_ofdm_symbols=3, bits_per_symbol=4, seed=5)
+    gap = 50
+    frames = [(f.copy(), s) for f, s in tx.generate_stream(num_frames=3, gap=gap)]
+
+    assert len(frames) == 3
+    assert not np.array_equal(frames[0][1], frames[1][1])
+    for frame, symbols in frames:
+        packet = np.concatenate((get_short_training_sequence() / 64,
+                                 get_long_training_sequence() / 64,
+                                 IFFT_GI(symbols)))
+        expected, _ = half_band_upsample(packet, up_factor=2)
+        np.testing.assert_allclose(frame[:-gap], expected, atol=1e-12)
+        assert np.all(frame[-gap:] == 0)
+
+def test_transmitter_stream_reuses_ring_buffers():
+    """Paketi se upisuju u prsten unaprijed alociranih bafera zadanog tipa"""
+    tx = Transmitter80211a(num_ofdm_symbols=2, bits_per_symbol=2)
+    stream = tx.generate_stream(ring_size=2, dtype=np.complex64)
+
+    f0, _ = next(stream)
+    f1, _ = next(stream)
+    f2, _ = next(stream)
+
+    assert f0.dtype == np.complex64
+    assert np.shares_memory(f0, f2)
+    assert not np.shares_memory(f0, f1)
+
+def test_transmitter_stream_invalid_arguments():
+    """Nevažeći parametri streama"""
+    tx = Transmitter80211a(num_ofdm_symbols=1, bits_per_symbol=2)
+    with pytest.raises(ValueError):
+        next(tx.generate_stream(gap=-1))
+    with pytest.raises(ValueError):
+        next(tx.generate_stream(dtype=np.float64))
+
+def test_transmitter_generator_seed_gives_new_bits_per_frame():
+    """Sa np.random.Generator kao sjemenom svaki paket ima nove bite, a prvi paket streama je isti kao generate_frame"""
+    tx = Transmitter80211a(num_ofdm_symbols=2, bits_per_symbol=2, seed=np.random.default_rng(9))
+    _, s1 = tx.generate_frame()
+    _, s2 = tx.generate_frame()
+    assert not np.array_equal(s1, s2)
+
+    frame, symbols = next(Transmitter80211a(num_ofdm_symbols=2, bits_per_symbol=2, seed=4).generate_stream(num_frames=1))
+    ref_frame, ref_symbols = Transmitter80211a(num_ofdm_symbols=2, bits_per_symbol=2, seed=4).generate_frame()
+    np.testing.assert_array_equal(symbols, ref_symbols)
+    np.testing.assert_allclose(frame, ref_frame, atol=1e-12)
@@ -4,7 +4,7 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import pytest
 from unittest.mock import patch
-from tx.utilities import zero_stuffing, spektar, plot_konstelaciju
+from tx.utilities import zero_stuffing, spektar, plot_konstelaciju, bit_sequence
 
 def test_zero_stuffing_basic():
     """Provjerava osnovno zero-stuffing upsampliranje sa faktorom 2."""
@@ -154,4 +154,22 @@ def test_plot_konstelaciju_real_input_raises():
     # Funkcija crtanja neće automatski baciti grešku,
     # ali možemo assert provjeriti da su simboli kompleksni
     with pytest.raises(AssertionError):
-        assert np.iscomplexobj(symbols), "Input must be complex"
\ No newline at end of file
+        assert np.iscomplexobj(symbols), "Input must be complex"
+
+def test_bit_sequence_does_not_touch_global_rng():
+    """bit_sequence koristi vlastiti Generator i ne mijenja globalni np.random"""
+    np.random.seed(5)
+    expected = np.random.rand(3)
+    np.random.seed(5)
+    bits = bit_sequence(2, 2, sd=1)
+    assert np.array_equal(np.random.rand(3), expected)
+    assert set(np.unique(bits)) <= {0, 1}
+    assert np.array_equal(bits, bit_sequence(2, 2, sd=1))
+
+def test_bit_sequence_accepts_generator():
+    """Proslijeđeni Generator se koristi direktno i napreduje između poziva"""
+    rng = np.random.default_rng(3)
+    first = bit_sequence(4, 2, sd=rng)
+    second = bit_sequence(4, 2, sd=rng)
+    assert np.array_equal(first, bit_sequence(4, 2, sd=np.random.default_rng(3)))
+    assert not np.array_equal(first, second)
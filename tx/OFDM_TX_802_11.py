@@ -4,7 +4,7 @@ from .long_sequence import get_long_training_sequence
 from .OFDM_mapper import Mapper_OFDM
 from .utilities import bit_sequence
 from .ifft_ofdm_symbol import IFFT_GI
-from .filters import half_band_upsample
+from .filters import half_band_upsample, polyphase_upsample
 
 class Transmitter80211a:
     """
@@ -14,7 +14,8 @@ class Transmitter80211a:
     - num_ofdm_symbols : broj OFDM simbola u paketu
     - bits_per_symbol  : modulacija (1=BPSK, 2=QPSK, 4=16-QAM, 6=64-QAM)
     - up_factor        : faktor upsamplovanja
-    - seed             : sjeme za generator nasumičnih bita
+    - seed             : sjeme (int) ili np.random.Generator za nasumične bite;
+                         sa Generatorom svaki poziv daje nove bite
     - step             : korak za training sekvence
     - plot             : ako je True, prikazuju se svi plotovi
     """
@@ -48,5 +49,70 @@ class Transmitter80211a:
         packet_20MHz=np.concatenate((sts, lts, payload))
         sample_output, _ =half_band_upsample(packet_20MHz, up_factor=self.up_factor, N=31, plot=self.plot)
         return sample_output, symbols
-    
 
+    def generate_stream(self, num_frames=None, gap=0, ring_size=4, dtype=np.complex128):
+        """
+        Generator koji daje pakete jedan za drugim (back-to-back) iz prstena
+        unaprijed alociranih bafera.
+
+        Parametri
+        num_frames : int ili None, opcionalno
+            Broj paketa koji se generišu. Ako je None, generator je beskonačan.
+        gap : int, opcionalno
+            Broj nultih uzoraka (na izlaznoj frekvenciji) nakon svakog paketa.
+        ring_size : int, opcionalno
+            Broj bafera u prstenu. Vraćeni niz je pogled na bafer koji se ponovo
+            koristi nakon 'ring_size' paketa; za duže čuvanje napraviti kopiju.
+        dtype : numpy dtype, opcionalno
+            np.complex128 (default) ili np.complex64 za upola manji memorijski promet.
+
+        Povratna vrijednost (yield)
+        frame : np.ndarray
+            Upsamplirani paket praćen sa 'gap' nula (dužina je ista za sve pakete).
+        symbols : np.ndarray
+            Mapirani data simboli paketa.
+
+        Napomene
+        - Training sekvence i tapovi filtera se računaju jednom i koriste za sve pakete.
+        - Bitovi se uzimaju iz jednog np.random.Generator toka inicijalizovanog sa
+          'seed' (ili iz proslijeđenog Generatora), pa se globalni RNG ne dira i
+          paketi se međusobno razlikuju. Za cjelobrojno sjeme prvi paket je isti
+          kao generate_frame().
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.complex64, np.complex128):
+            raise ValueError("dtype mora biti complex64 ili complex128")
+        if not isinstance(gap, int) or gap < 0:
+            raise ValueError("gap mora biti nenegativan cijeli broj")
+        if not isinstance(ring_size, int) or ring_size < 1:
+            raise ValueError("ring_size mora biti pozitivan cijeli broj")
+        if not isinstance(self.up_factor, int) or self.up_factor <= 0:
+            raise ValueError("up_factor mora biti pozitivan cijeli broj")
+
+        # Preambula se upisuje jednom u 20 MHz bafer paketa, payload se prepisuje
+        sts, lts = self.generate_training_sequences()
+        preamble_len = len(sts) + len(lts)
+        packet_20MHz = np.empty(preamble_len + 80*self.num_ofdm_symbols, dtype=complex)
+        packet_20MHz[:len(sts)] = sts/64
+        packet_20MHz[len(sts):preamble_len] = lts/64
+        payload = packet_20MHz[preamble_len:]
+
+        # Prsten izlaznih bafera; razmak (gap) na kraju ostaje nula
+        N = 31
+        signal_len = max(len(packet_20MHz)*self.up_factor, N)
+        ring = np.zeros((ring_size, signal_len + gap), dtype=dtype)
+
+        rng = np.random.default_rng(self.seed)
+        num_bits = 48*self.bits_per_symbol*self.num_ofdm_symbols
+
+        frame_idx = 0
+        while num_frames is None or frame_idx < num_frames:
+            bits = rng.integers(0, 2, size=num_bits, dtype=np.int8)
+            symbols = Mapper_OFDM(bits, self.bits_per_symbol)
+            IFFT_GI(symbols, out=payload)
+
+            frame = ring[frame_idx % ring_size]
+            polyphase_upsample(packet_20MHz, self.up_factor, N, out=frame[:signal_len])
+
+            yield frame, symbols
+            frame_idx += 1
@@ -1,6 +1,39 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+#LUT tabele po osi (I ili Q)
+BPSK_LUT  = np.array([-1, 1])
+QPSK_LUT  = np.array([-1, 1]) / np.sqrt(2)
+QAM16_LUT = np.array([-3, -1, 1, 3]) / np.sqrt(10)
+QAM64_LUT = np.array([-7, -5, -3, -1, 1, 3, 5, 7]) / np.sqrt(42)
+
+
+def _konstelacija(lut, BitsPerSymbol):
+    """
+    Gradi kompleksnu tabelu konstelacije indeksiranu cijelom grupom bitova.
+
+    Prva polovina bitova (MSB) bira I komponentu, druga polovina Q komponentu.
+    Za BPSK (1 bit) tabela je realna.
+    """
+    if BitsPerSymbol == 1:
+        return lut.astype(complex)
+    half = BitsPerSymbol // 2
+    Index = np.arange(2 ** BitsPerSymbol)
+    I = Index >> half
+    Q = Index & ((1 << half) - 1)
+    return lut[I] + 1j * lut[Q]
+
+
+#Unaprijed izračunate tabele konstelacija i težine bitova za BitsPerSymbol
+KONSTELACIJE = {
+    1: _konstelacija(BPSK_LUT, 1),
+    2: _konstelacija(QPSK_LUT, 2),
+    4: _konstelacija(QAM16_LUT, 4),
+    6: _konstelacija(QAM64_LUT, 6),
+}
+TEZINE_BITA = {bps: 1 << np.arange(bps - 1, -1, -1) for bps in KONSTELACIJE}
+
+
 def Mapper_OFDM(InputBits, BitsPerSymbol, plot=False):
     """
     Mapira ulazne bitove u kompleksne QAM simbole za OFDM modulaciju.
@@ -32,6 +65,9 @@ def Mapper_OFDM(InputBits, BitsPerSymbol, plot=False):
 
     Napomene
     - Funkcija koristi lookup tabele (LUT) za mapiranje bitova u simbole.
+    - Mapiranje je vektorizovano: bitovi se grupišu u (N, BitsPerSymbol) matricu,
+      indeks simbola se računa skalarnim proizvodom sa težinama bitova, a simboli
+      se očitavaju iz unaprijed izračunate kompleksne tabele jednom operacijom.
     - Plotanje je opciono i služi za vizualizaciju konstelacije.
     """
 
@@ -48,38 +84,16 @@ def Mapper_OFDM(InputBits, BitsPerSymbol, plot=False):
     if not np.issubdtype(InputBits.dtype, np.integer):
         raise IndexError("Biti  moraju biti integeri.")
  
-    #LUT tabele
-    BPSK_LUT  = np.array([-1, 1])
-    QPSK_LUT  = np.array([-1, 1]) / np.sqrt(2)
-    QAM16_LUT = np.array([-3, -1, 1, 3]) / np.sqrt(10)
-    QAM64_LUT = np.array([-7, -5, -3, -1, 1, 3, 5, 7]) / np.sqrt(42)
-
-    NumberOfSymbols = np.floor(len(InputBits) // BitsPerSymbol)
-    OutputSymbols = np.zeros(NumberOfSymbols, dtype=complex)
-
-    for i in range(NumberOfSymbols):
-        bg = InputBits[i * BitsPerSymbol : (i + 1) * BitsPerSymbol]
-
-        if BitsPerSymbol == 1:#BPSK
-            Symbol = BPSK_LUT[bg[0]]
-
-        elif BitsPerSymbol == 2:#QPSK
-            Symbol = QPSK_LUT[bg[0]] + 1j * QPSK_LUT[bg[1]]
-
-        elif BitsPerSymbol == 4:#16-QAM
-            I = bg[0] * 2 + bg[1]
-            Q = bg[2] * 2 + bg[3]
-            Symbol = QAM16_LUT[I] + 1j * QAM16_LUT[Q]
-
-        elif BitsPerSymbol == 6:#64-QAM
-            I = bg[0] * 4 + bg[1] * 2 + bg[2]
-            Q = bg[3] * 4 + bg[4] * 2 + bg[5]
-            Symbol = QAM64_LUT[I] + 1j * QAM64_LUT[Q]
-
-        else:
-            raise ValueError("Broj bita po simbola mora biti 1,2,4 ili 6") #dozvoljene modulacije
-        
-        OutputSymbols[i] = Symbol
+    if BitsPerSymbol not in KONSTELACIJE:
+        raise ValueError("Broj bita po simbola mora biti 1,2,4 ili 6") #dozvoljene modulacije
+
+    #Grupisanje bitova u (N, BitsPerSymbol) matricu, nepotpuni simbol na kraju se ignoriše
+    NumberOfSymbols = len(InputBits) // BitsPerSymbol
+    BitGroups = InputBits[:NumberOfSymbols * BitsPerSymbol].reshape(NumberOfSymbols, BitsPerSymbol)
+
+    #Indeks tačke u konstelaciji (prvi bit je MSB) i očitavanje iz LUT-a
+    Index = BitGroups @ TEZINE_BITA[BitsPerSymbol]
+    OutputSymbols = KONSTELACIJE[BitsPerSymbol][Index]
 
     # Plot grana
     if plot and NumberOfSymbols > 0:
@@ -1,6 +1,134 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from .utilities import zero_stuffing
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def design_nyquist_filter(N=31, band=2):
+    """
+    Dizajnira FIR filter L-tog opsega (Nyquist filter) za interpolaciju.
+
+    Za 'band=2' ovo je half-band filter: sinc funkcija sa korijenom Hanning
+    prozora, kod kojeg je svaki drugi tap (osim centralnog) jednak nuli.
+
+    Parametri
+    N : int, opcionalno
+        Dužina FIR filtera. Podrazumijevana vrijednost je 31.
+    band : int, opcionalno
+        Broj opsega (faktor interpolacije za koji je filter dizajniran).
+
+    Povratna vrijednost
+    h : numpy.ndarray
+        Read-only impulsni odziv filtera (keširan po (N, band)).
+    """
+    n = np.arange(N)
+    Arg = n/band - (N-1)/(2*band)
+    Hann = np.hanning(N+2)[1:-1]
+    h = np.sinc(Arg) * np.sqrt(Hann)
+    h.setflags(write=False)
+    return h
+
+
+@lru_cache(maxsize=32)
+def polyphase_bank(N=31, up_factor=2, band=2):
+    """
+    Razlaže filter na 'up_factor' polifaznih komponenti h[p::up_factor].
+
+    Svaka faza se opisuje najjeftinijim načinom računanja:
+    - 'zero'  : svi tapovi su nula, faza se preskače,
+    - 'delay' : samo jedan nenulti tap (kod half-band filtera neparna faza),
+                izlaz je skalirani i pomjereni ulaz,
+    - 'fir'   : konvolucija sa tapovima faze (kod half-band filtera parna faza,
+                (N+1)/2 tapova umjesto N).
+
+    Parametri
+    N : int
+        Dužina filtera.
+    up_factor : int
+        Broj polifaznih komponenti (faktor upsampliranja).
+    band : int
+        Broj opsega filtera (vidi 'design_nyquist_filter').
+
+    Povratna vrijednost
+    bank : tuple
+        Za svaku fazu trojka (vrsta, tapovi, pomak prvog tapa).
+    """
+    h = design_nyquist_filter(N, band)
+    prag = 1e-12 * np.max(np.abs(h))
+
+    bank = []
+    for p in range(up_factor):
+        taps = h[p::up_factor]
+        nenulti = np.flatnonzero(np.abs(taps) > prag)
+        if nenulti.size == 0:
+            bank.append(("zero", taps[:0], 0))
+            continue
+
+        #Odbacivanje (numerički) nultih tapova na krajevima
+        offset = int(nenulti[0])
+        taps = taps[offset:nenulti[-1] + 1]
+
+        if taps.size == 1:
+            bank.append(("delay", taps, offset))
+        else:
+            bank.append(("fir", taps, offset))
+    return tuple(bank)
+
+
+def polyphase_upsample(signal, up_factor=2, N=31, band=2, out=None):
+    """
+    Upsampliranje polifaznom strukturom, ekvivalentno zero-stuffingu i
+    konvoluciji sa filterom 'design_nyquist_filter(N, band)' u 'same' modu.
+
+    Umjesto množenja ubačenim nulama, svaka polifazna komponenta filtrira
+    originalni signal i upisuje se direktno na svaki 'up_factor'-ti izlazni uzorak.
+
+    Parametri
+    signal : numpy.ndarray
+        Ulazni signal (1D).
+    up_factor : int
+        Faktor upsampliranja.
+    N : int
+        Dužina filtera.
+    band : int
+        Broj opsega filtera.
+    out : numpy.ndarray, opcionalno
+        Unaprijed alociran kompleksni izlazni niz dužine max(len*up_factor, N).
+
+    Povratna vrijednost
+    filtrirano : numpy.ndarray
+        Upsamplirani i filtrirani signal (kompleksan).
+    """
+    x = np.asarray(signal, dtype=complex)
+    L = len(x)
+    M = L * up_factor
+
+    # Isti izrez kao np.convolve(..., mode='same'): puni izlaz od indeksa 'start'
+    start = (min(M, N) - 1) // 2
+    length = max(M, N)
+    if out is None:
+        out = np.zeros(length, dtype=complex)
+    else:
+        out[:] = 0
+
+    for p, (vrsta, taps, offset) in enumerate(polyphase_bank(N, up_factor, band)):
+        if vrsta == "zero":
+            continue
+
+        # Indeks (u izrezu) prvog izlaznog uzorka faze p; uzorci ispred izreza se preskaču
+        k0 = p + offset*up_factor - start
+        i0 = -(k0 // up_factor) if k0 < 0 else 0
+        dst = out[k0 + i0*up_factor::up_factor]
+
+        if vrsta == "delay":
+            n = max(0, min(len(dst), L - i0))
+            np.multiply(x[i0:i0+n], taps[0], out=dst[:n])
+        else:
+            y = np.convolve(x, taps)[i0:]
+            n = min(len(dst), len(y))
+            dst[:n] = y[:n]
+
+    return out
 
 
 def half_band_upsample(signal, up_factor=2, N=31, plot=False):
@@ -39,22 +167,31 @@ def half_band_upsample(signal, up_factor=2, N=31, plot=False):
     - Half-band filteri imaju graničnu frekvenciju na polovini Nyquistove
       frekvencije i često se koriste za interpolaciju sa faktorom dva.
     - Filter je dizajniran korištenjem sinc funkcije sa Hanning (Hann) prozorom.
+    - Zero-stuffing i konvolucija se računaju polifazno ('polyphase_upsample'):
+      množenja ubačenim nulama se preskaču, a neparna faza half-band filtera
+      (svi tapovi nula osim centralnog) svodi se na kašnjenje. Za up_factor=2
+      to je 17 umjesto 62 množenja po ulaznom uzorku, uz isti rezultat
+      (do numeričke tačnosti).
+    - Dizajnirani filter se kešira po N.
     - Prikaz frekvencijskog odziva služi isključivo za analizu i vizualizaciju.
     """
-    # Dizajn half-band filtera
-    n = np.arange(N)
-    Arg = n/2 - (N-1)/4
-    Hann = np.hanning(N+2)[1:-1]
-    h = np.sinc(Arg) * np.sqrt(Hann)
-    
-    # Upsampling
-    upsamplirano = zero_stuffing(signal, up_factor)
-    
-    # Filtriranje konvolucijom sa h
-    filtrirano = np.convolve(upsamplirano, h, mode='same')
+    # Provjera tipa ulaznog signala i faktora upsampliranja
+    if not isinstance(signal, np.ndarray):
+        raise TypeError("Signal mora biti numpy niz.")
+    if not isinstance(up_factor, int):
+        raise TypeError("up_factor mora biti cijeli broj.")
+    if up_factor <= 0:
+        raise ValueError("up_factor mora biti pozitivan cijeli broj.")
+
+    # Dizajn half-band filtera (keširan)
+    h = design_nyquist_filter(N, 2)
+
+    # Upsampling i filtriranje polifaznom strukturom
+    filtrirano = polyphase_upsample(signal, up_factor, N, band=2)
 
     # Crtanje
     if plot:
+        n = np.arange(N)
         # Frekvencijski odziv
         Frezolucija = 0.002
         frekvencije = np.arange(-0.5, 0.5+Frezolucija, Frezolucija)
@@ -93,3 +230,46 @@ def half_band_upsample(signal, up_factor=2, N=31, plot=False):
 
   
     return filtrirano, h
+
+
+def cascaded_upsample(signal, up_factor=2, N=31):
+    """
+    Upsampliranje proizvoljnim cjelobrojnim faktorom kaskadom polifaznih stepena.
+
+    Faktor se rastavlja na stepene ×2 (half-band filter dužine N) i, ako
+    ostane neparan ostatak r > 1, jedan stepen ×r sa Nyquist filterom r-tog
+    opsega. Za up_factor=2 rezultat je isti kao kod 'half_band_upsample'.
+
+    Parametri
+    signal : numpy.ndarray
+        Ulazni signal.
+    up_factor : int, opcionalno
+        Ukupni faktor upsampliranja. Default je 2.
+    N : int, opcionalno
+        Dužina half-band filtera po stepenu. Default je 31.
+
+    Povratna vrijednost
+    filtrirano : numpy.ndarray
+        Upsamplirani signal.
+    """
+    if not isinstance(signal, np.ndarray):
+        raise TypeError("Signal mora biti numpy niz.")
+    if not isinstance(up_factor, int):
+        raise TypeError("up_factor mora biti cijeli broj.")
+    if up_factor <= 0:
+        raise ValueError("up_factor mora biti pozitivan cijeli broj.")
+
+    filtrirano = np.asarray(signal, dtype=complex)
+    ostatak = up_factor
+    while ostatak % 2 == 0:
+        filtrirano = polyphase_upsample(filtrirano, 2, N, band=2)
+        ostatak //= 2
+
+    if ostatak > 1:
+        # Dužina filtera raste sa faktorom; mora biti neparna (centralni tap)
+        N_r = ostatak * ((N + 1) // 2) - 1
+        if N_r % 2 == 0:
+            N_r += 1
+        filtrirano = polyphase_upsample(filtrirano, ostatak, N_r, band=ostatak)
+
+    return filtrirano
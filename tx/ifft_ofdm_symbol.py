@@ -1,7 +1,19 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-def IFFT_GI(symbol_stream, plot=False):
+#Indeksi data podnosioca 
+IFFT_INDEX = np.array([
+    6,7,8,9,10,
+    12,13,14,15,16,17,18,19,20,21,22,23,24,
+    26,27,28,29,30,31,32,33,34,35,36,37,39,
+    40,41,42,43,44,45,46,47,48,49,50,51,
+    53,54,55,56,57
+])
+
+#Indeksi 4 pilot-nosioca
+PILOT_INDEX = np.array([11, 25, 38, 52])
+
+
+def IFFT_GI(symbol_stream, plot=False, out=None):
     """
     Generiše OFDM simbole primjenom IFFT-a i dodavanjem zaštitnog intervala (GI).
 
@@ -16,12 +28,22 @@ def IFFT_GI(symbol_stream, plot=False):
         'N * 48', gdje je 'N' broj OFDM simbola.
     plot : bool, optional
         Ako je True, prikazuju se grafovi različitih faza obrade.
+    out : np.ndarray, optional
+        Unaprijed alociran kompleksni niz dužine 'N * 80' u koji se upisuje
+        rezultat. Ako nije zadan, alocira se novi niz.
 
     Povratna vrijednost
     payload : np.ndarray
         Kompleksni niz u vremenskom domenu dužine 'N * 80', gdje je:
         - 64 uzorka IFFT izlaz (OFDM simbol),
         - 16 uzoraka ciklički prefiks (GI).
+
+    Napomene
+    - Svi OFDM simboli se obrađuju odjednom: ulaz se preoblikuje u (N, 48),
+      upisuje u (N, 64) frekvencijsku mrežu sa pilot kolonama, i radi se jedan
+      'np.fft.ifft' po osi 1. GI i simbol se upisuju direktno u (N, 80) pogled
+      na izlazni niz.
+    - Crtanje je izdvojeno iz glavnog dijela obrade i ne utiče na brzu putanju.
     """
     if not isinstance(symbol_stream, np.ndarray):
         raise ValueError("Ulaz mora biti numpy array.")
@@ -36,143 +58,132 @@ def IFFT_GI(symbol_stream, plot=False):
     num_symbols=len(symbol_stream)//48
 
     #Rezervacija prostora za završni niz (svaki simbol ima 80 uzoraka)
-    payload=np.zeros(num_symbols*80,dtype=complex)
-
-    #Indeksi data podnosioca 
-    IFFT_index=np.array([
-        6,7,8,9,10,
-        12,13,14,15,16,17,18,19,20,21,22,23,24,
-        26,27,28,29,30,31,32,33,34,35,36,37,39,
-        40,41,42,43,44,45,46,47,48,49,50,51,
-        53,54,55,56,57
-    ])
-
-    #Indeksi 4 pilot-nosioca
-    pilot_idx=np.array([11, 25, 38, 52])
-
-    #Procesiranje svakog OFDM simbola
-    for i in range(num_symbols):
-        # Izdvajanje 48 ulaznih simbola za tekući OFDM simbol
-        start = i * 48
-        stop = start + 48
-        current_input = symbol_stream[start:stop]
+    if out is None:
+        payload=np.empty(num_symbols*80,dtype=complex)
+    else:
+        if out.shape != (num_symbols*80,):
+            raise ValueError("Izlazni niz mora imati dužinu N * 80.")
+        payload=out
+
+    #Frekvencijska mreža (N, 64): data simboli na svoje podnosioce, piloti kolone
+    IFFT_input=np.zeros((num_symbols, 64), dtype=complex)
+    IFFT_input[:, IFFT_INDEX]=symbol_stream[:num_symbols*48].reshape(num_symbols, 48)
+    IFFT_input[:, PILOT_INDEX]=1+0j
+
+    #IFFT svih simbola odjednom: prelazak u vremensku domenu
+    IFFT_output=np.fft.ifft(IFFT_input, axis=1)
+
+    #GI (zadnjih 16 uzoraka) + 64 uzorka, upis direktno u (N, 80) pogled
+    blocks=payload.reshape(num_symbols, 80)
+    blocks[:, :16]=IFFT_output[:, 48:64]
+    blocks[:, 16:]=IFFT_output
+
+    if plot:
+        _plot_ifft_gi(symbol_stream, IFFT_input, IFFT_output, payload)
+
+    return payload
+
+
+def _plot_ifft_gi(symbol_stream, IFFT_input, IFFT_output, payload):
+    """
+    Prikazuje faze obrade IFFT_GI za svaki OFDM simbol.
+
+    Parametri
+    symbol_stream : np.ndarray
+        Ulazni niz data simbola.
+    IFFT_input : np.ndarray (N, 64)
+        Frekvencijska mreža sa data simbolima i pilotima.
+    IFFT_output : np.ndarray (N, 64)
+        OFDM simboli u vremenskoj domeni.
+    payload : np.ndarray
+        Izlazni niz sa dodanim GI.
+    """
+    import matplotlib.pyplot as plt
+
+    for i in range(IFFT_input.shape[0]):
+        current_input = symbol_stream[i*48:(i+1)*48]
 
         #Crtanje ulaznih simbola
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.subplot(2,1,1)
-            plt.stem(np.real(current_input))
-            plt.title("Ulazni stream - realni dio")
-            plt.grid(True)
-            plt.subplot(2,1,2)
-            plt.stem(np.imag(current_input))
-            plt.grid(True)
-            plt.title("Ulazni stream - imaginarni dio")
-            plt.show(block=False)
-            plt.close("all")
-
-
-        #Frekvencijski OFDM okvir (64 podnosioca)
-        IFFT_input=np.zeros(64, dtype=complex)
-
-        #Upis 48 data simbola na odgovarajuće podnosioce
-        IFFT_input[IFFT_index]=current_input
-        proba=IFFT_input.copy()  #kopija za prikaz pilota
+        plt.figure(figsize=(12,4))
+        plt.subplot(2,1,1)
+        plt.stem(np.real(current_input))
+        plt.title("Ulazni stream - realni dio")
+        plt.grid(True)
+        plt.subplot(2,1,2)
+        plt.stem(np.imag(current_input))
+        plt.grid(True)
+        plt.title("Ulazni stream - imaginarni dio")
+        plt.show(block=False)
+        plt.close("all")
 
         #Prikaz smještanja data simbola
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.subplot(2,1,1)
-            plt.stem(np.real(IFFT_input))
-            plt.title("Podaci na pozicijama - realni dio")
-            plt.grid(True)
-            plt.subplot(2,1,2)
-            plt.stem(np.imag(IFFT_input))
-            plt.title("Podaci na pozicijama - imaginarni dio")
-            plt.grid(True)
-            plt.show(block=False)
-            plt.close("all")
-
-
-        #Ubacivanje pilot-nosioca 
-        IFFT_input[pilot_idx]=1+0j
-        provjera=IFFT_input-proba  #razlika je samo na mjestima pilota
-
-        #Prikaz samo pilot simbola
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.subplot(2,1,1)
-            plt.axhline(y=1, color='green', linestyle='--')
-            plt.stem(np.real(provjera))
-            plt.title("Samo piloti na pozicijama - realni dio")
-            plt.grid(True)
-            plt.subplot(2,1,2)
-            plt.stem(np.imag(provjera))
-            plt.title("Samo piloti na pozicijama - imaginarni dio")
-            plt.grid(True)
-            plt.show(block=False)
-            plt.close("all")
-
+        proba=np.zeros(64, dtype=complex)
+        proba[IFFT_INDEX]=IFFT_input[i, IFFT_INDEX]
+        plt.figure(figsize=(12,4))
+        plt.subplot(2,1,1)
+        plt.stem(np.real(proba))
+        plt.title("Podaci na pozicijama - realni dio")
+        plt.grid(True)
+        plt.subplot(2,1,2)
+        plt.stem(np.imag(proba))
+        plt.title("Podaci na pozicijama - imaginarni dio")
+        plt.grid(True)
+        plt.show(block=False)
+        plt.close("all")
+
+        #Prikaz samo pilot simbola (razlika je samo na mjestima pilota)
+        provjera=IFFT_input[i]-proba
+        plt.figure(figsize=(12,4))
+        plt.subplot(2,1,1)
+        plt.axhline(y=1, color='green', linestyle='--')
+        plt.stem(np.real(provjera))
+        plt.title("Samo piloti na pozicijama - realni dio")
+        plt.grid(True)
+        plt.subplot(2,1,2)
+        plt.stem(np.imag(provjera))
+        plt.title("Samo piloti na pozicijama - imaginarni dio")
+        plt.grid(True)
+        plt.show(block=False)
+        plt.close("all")
 
         #Prikaz kompletnog OFDM frekvencijskog okvira
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.subplot(2,1,1)
-            plt.axhline(y=1, color='green', linestyle='--')
-            plt.stem(np.real(IFFT_input))
-            plt.title("Cijeli OFDM signal u frekvencijskoj domeni - realni dio")
-            plt.grid(True)
-            plt.subplot(2,1,2)
-            plt.stem(np.imag(IFFT_input))
-            plt.title("Cijeli OFDM signal u frekvencijskoj domeni - imaginarni dio")
-            plt.grid(True)
-            plt.show(block=False)
-            plt.close("all")
-
-
-        #IFFT: prelazak u vremensku domenu
-        IFFT_output=np.fft.ifft(IFFT_input)
+        plt.figure(figsize=(12,4))
+        plt.subplot(2,1,1)
+        plt.axhline(y=1, color='green', linestyle='--')
+        plt.stem(np.real(IFFT_input[i]))
+        plt.title("Cijeli OFDM signal u frekvencijskoj domeni - realni dio")
+        plt.grid(True)
+        plt.subplot(2,1,2)
+        plt.stem(np.imag(IFFT_input[i]))
+        plt.title("Cijeli OFDM signal u frekvencijskoj domeni - imaginarni dio")
+        plt.grid(True)
+        plt.show(block=False)
+        plt.close("all")
 
         #Prikaz vremenske domene
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.plot(np.real(IFFT_output))
-            plt.grid(True)
-            plt.plot(np.imag(IFFT_output))
-            plt.title("OFDM simbol u vremenskoj domeni")
-            plt.show(block=False)
-            plt.close("all")
-
-
-        #Dodavanje cikličkog prefiksa dužine 16
-        #GI se uzima iz zadnjeg dijela IFFT izlaza (48–63)
-        GI=IFFT_output[48:64]
-
-        #Formiranje jednog OFDM bloka: GI + 64 uzorka
-        block=np.hstack([GI, IFFT_output])
-
-        #Upis u finalni izlazni stream
-        payload[i*80:(i+1)*80]=block
-
-        #Prikaz cijelog payload-a
-        if plot:
-            plt.figure(figsize=(12,4))
-            plt.subplot(3,1,1)
-            plt.title(f"OFDM simbola broj {i+1} - realni dio")
-            plt.stem(np.real(payload))
-            plt.grid(True)
-            plt.subplot(3,1,2)
-            plt.stem(np.real(payload))
-            plt.xlim(-1,17)
-            plt.title("Dodani ciklički prefiks (GI) - realni dio")
-            plt.grid(True)
-            plt.subplot(3,1,3)
-            plt.stem(np.real(payload))
-            plt.xlim(63,81)
-            plt.title("Zadnji dio OFDM simbola - realni dio")
-            plt.grid(True)
-            plt.show(block=False)
-            plt.close("all")
-
-
-    return payload
+        plt.figure(figsize=(12,4))
+        plt.plot(np.real(IFFT_output[i]))
+        plt.grid(True)
+        plt.plot(np.imag(IFFT_output[i]))
+        plt.title("OFDM simbol u vremenskoj domeni")
+        plt.show(block=False)
+        plt.close("all")
+
+        #Prikaz payload-a do tekućeg simbola
+        plt.figure(figsize=(12,4))
+        plt.subplot(3,1,1)
+        plt.title(f"OFDM simbola broj {i+1} - realni dio")
+        plt.stem(np.real(payload[:(i+1)*80]))
+        plt.grid(True)
+        plt.subplot(3,1,2)
+        plt.stem(np.real(payload[:(i+1)*80]))
+        plt.xlim(-1,17)
+        plt.title("Dodani ciklički prefiks (GI) - realni dio")
+        plt.grid(True)
+        plt.subplot(3,1,3)
+        plt.stem(np.real(payload[:(i+1)*80]))
+        plt.xlim(63,81)
+        plt.title("Zadnji dio OFDM simbola - realni dio")
+        plt.grid(True)
+        plt.show(block=False)
+        plt.close("all")
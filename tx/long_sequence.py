@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 
 def get_long_training_sequence(step=1):
     """
@@ -23,8 +24,17 @@ def get_long_training_sequence(step=1):
     - 'Positive' i 'Negative' predstavljaju pozitivne i negativne frekvencijske tonove LTS.
     - Cyclic Prefix (CP) se dodaje kako bi se olakšala sinhronizacija i zaštita od inter-symbol interference (ISI).
     - Funkcija vraća kompleksnu vremensku sekvencu čija dužina zavisi od parametra 'step'.
+    - Sekvenca se računa jednom po vrijednosti 'step' i kešira; vraćeni niz je
+      read-only (za izmjene napraviti kopiju).
     """
+    return _long_training_sequence(step)
 
+
+@lru_cache(maxsize=32)
+def _long_training_sequence(step):
+    """
+    Računa LTS za zadani 'step' samo jednom; rezultat je keširan i read-only.
+    """
     #Definisanje pozitivnih frekvencijskih komponenti LTS
     Positive = np.array([
        0, 1,-1,-1,   1, 1,-1, 1,  -1, 1,-1,-1,  -1,-1,-1, 1,
@@ -44,23 +54,66 @@ def get_long_training_sequence(step=1):
     N = 64
     m = np.arange(-32, 32)  # MATLAB m = -32:31
 
-    #Kreiranje praznog niza za vremensku sekvencu
+    #Vremenski trenuci uzoraka
     length = int(64/step)
-    LongTrainingSymbol = np.zeros(length, dtype=complex)
+    t = np.arange(length) * step
 
-    #IDFT petlja
-    for n in range(length):
-        t=n*step
-        E=np.exp(1j*2*np.pi*t*m/N)
-        LongTrainingSymbol[n] = np.dot(AllTones,E) 
+    #IDFT (vektorizovano, vanjski proizvod t x m)
+    E = np.exp(1j*2*np.pi*t[:, None]*m/N)
+    LongTrainingSymbol = E @ AllTones
 
     double_long = np.concatenate((LongTrainingSymbol, LongTrainingSymbol))
 
     #Dodavanje Cyclic Prefix (CP) prema step-u
     if step == 1:
         cp = double_long[32:64] #uzimanje zadnja 32 uzorka
-        return np.concatenate((cp, double_long))
-
     else:
         cp = double_long[64:128] #uzimanje zadnja 64 uzorka
-        return np.concatenate((cp, double_long))
+
+    sequence = np.concatenate((cp, double_long))
+    sequence.setflags(write=False)
+    return sequence
+
+
+@lru_cache(maxsize=1)
+def get_lts_reference_64():
+    """
+    Vraća jedan LTS simbol (64 uzorka, bez CP) za step=1.
+
+    Povratna vrijednost
+    lts_64 : numpy.ndarray
+        Read-only referentni LTS simbol koji koriste korelator i estimacija kanala.
+    """
+    lts_64 = get_long_training_sequence(step=1)[32:32+64].copy()
+    lts_64.setflags(write=False)
+    return lts_64
+
+
+@lru_cache(maxsize=1)
+def get_lts_reference_fft():
+    """
+    Vraća normalizovani spektar referentnog LTS simbola: (1/64) * FFT(lts_64).
+
+    Povratna vrijednost
+    lts_fd : numpy.ndarray
+        Read-only niz od 64 frekvencijska tona (FFT redoslijed binova).
+    """
+    lts_fd = 1/64 * np.fft.fft(get_lts_reference_64())
+    lts_fd.setflags(write=False)
+    return lts_fd
+
+
+@lru_cache(maxsize=1)
+def get_lts_correlator_taps():
+    """
+    Vraća tapove LTS korelatora: konjugovani i obrnuti sign-kvantizovani LTS (±1 ± j).
+
+    Povratna vrijednost
+    taps : numpy.ndarray
+        Read-only niz od 64 tapa; izlaz korelatora je 'sum(rx[i-k] * taps[k])'.
+    """
+    lts_64 = get_lts_reference_64()
+    quantized = np.sign(np.real(lts_64)) + 1j * np.sign(np.imag(lts_64))
+    taps = np.conj(quantized[::-1])
+    taps.setflags(write=False)
+    return taps
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 
 def get_short_training_sequence(step=1):
     """
@@ -22,12 +23,22 @@ def get_short_training_sequence(step=1):
     - 'Positive' i 'Negative' predstavljaju pozitivne i negativne frekvencijske tonove STS.
     - Rezultat se normalizuje faktorom sqrt(13/6).
     - Funkcija vraća kompleksnu vremensku sekvencu dužine proporcionalne parametru 'step'.
+    - Sekvenca se računa jednom po vrijednosti 'step' i kešira; vraćeni niz je
+      read-only (za izmjene napraviti kopiju).
     """
     if not isinstance(step, (int, float)):
         raise TypeError(f"Step mora biti numerički tip, dobijeno: {type(step)}")
     if step <= 0:
         raise ValueError(f"Step mora biti pozitivan, dobijeno: {step}")
     
+    return _short_training_sequence(step)
+
+
+@lru_cache(maxsize=32)
+def _short_training_sequence(step):
+    """
+    Računa STS za zadani 'step' samo jednom; rezultat je keširan i read-only.
+    """
     # Definisanje pozitivnih frekvencijskih komponenti STS
     Positive = np.array([
         0,0,0,0,   -1-1j,0,0,0,   -1-1j,0,0,0,   1+1j,0,0,0,
@@ -47,14 +58,13 @@ def get_short_training_sequence(step=1):
     N = 64
     m = np.arange(-32, 32)
 
-    #Kreiranje praznog niza za vremensku sekvencu
+    #Vremenski trenuci uzoraka
     length = int(160 / step)
-    ShortTrainingSequence = np.zeros(length, dtype=complex)
+    t = np.arange(length) * step
 
-    #Generisanje Short Training Sequence korištenjem IDFT
-    for n in range(length):
-        t = n * step
-        E = np.exp(1j*2*np.pi*t*m/N)
-        ShortTrainingSequence[n] = np.dot(Total, E)
+    #Generisanje Short Training Sequence korištenjem IDFT (vektorizovano, vanjski proizvod t x m)
+    E = np.exp(1j*2*np.pi*t[:, None]*m/N)
+    ShortTrainingSequence = E @ Total
 
+    ShortTrainingSequence.setflags(write=False)
     return ShortTrainingSequence
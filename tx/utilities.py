@@ -57,8 +57,8 @@ def bit_sequence (NumberOf_OFDM_Symbols, BitsPerSymbol, sd=0):
         Broj OFDM simbola za koje se generišu bitovi.
     BitsPerSymbol : int
         Broj bitova po OFDM simbolu.
-    sd : int, opcionalno
-        Sjeme (seed) za generator nasumičnih brojeva (default je 0).
+    sd : int, np.random.Generator ili None, opcionalno
+        Sjeme (seed) ili generator nasumičnih brojeva (default je 0).
 
     Povratna vrijednost
     Source_Bits : numpy.ndarray
@@ -66,17 +66,18 @@ def bit_sequence (NumberOf_OFDM_Symbols, BitsPerSymbol, sd=0):
 
     Napomene
     - Ukupan broj bitova se računa kao 48 * BitsPerSymbol * NumberOf_OFDM_Symbols.
-    - 'np.random.seed(sd)' se koristi za reproduktivnost rezultata.
-    - Bitovi se generišu korištenjem uniformne distribucije i zaokružuju na cijele brojeve (0 ili 1).
+    - Koristi se 'np.random.default_rng(sd)': za isto cjelobrojno sjeme rezultat je
+      uvijek isti, a proslijeđeni Generator se koristi direktno (i napreduje), pa
+      se globalni RNG ne dira i funkcija je sigurna za paralelne niti.
+    - Bitovi se generišu kao uniformni cijeli brojevi 0 ili 1.
     """
-    #Fiksiranje sjemena
-    np.random.seed(sd)  
+    rng=np.random.default_rng(sd)
 
     #Izračunavanje ukupnog broja bitova
     NumberOfBits=(48*BitsPerSymbol)*NumberOf_OFDM_Symbols
 
     #Generisanje nasumičnih bita (0 ili 1)
-    Source_Bits=np.round(np.random.rand(NumberOfBits)).astype(int)
+    Source_Bits=rng.integers(0, 2, size=NumberOfBits, dtype=np.int8).astype(int)
     
     return Source_Bits
 